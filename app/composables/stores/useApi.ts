@@ -10,6 +10,7 @@ interface ApiNote {
 	content: string
 	created_at: string
 	updated_at?: string
+	version: number
 	action_items: ApiActionItem[]
 }
 
@@ -21,6 +22,48 @@ interface ApiActionItem {
 	updated_at?: string
 	completed_at?: string
 	completed: boolean
+	version: number
+}
+
+interface ApiChangeSet {
+	seq: number
+	reset: boolean
+	notes: ApiNote[]
+	action_items: ApiActionItem[]
+	deleted_note_ids: string[]
+	deleted_action_item_ids: string[]
+}
+
+interface ApiBulkActionItemResult {
+	op: BulkActionItemOperation['op']
+	id: string
+	item?: ApiActionItem
+}
+
+// One operation of POST /api/action-items/bulk
+export interface BulkActionItemOperation {
+	op: 'create' | 'update' | 'complete' | 'uncomplete' | 'delete'
+	id?: string
+	title?: string
+	noteId?: string
+	completed?: boolean
+	version?: number
+}
+
+export interface BulkActionItemResult {
+	op: BulkActionItemOperation['op']
+	id: string
+	item?: ActionItem
+}
+
+// Records changed since a sequence number (see GET /api/changes)
+export interface ChangeSet {
+	seq: number
+	reset: boolean
+	notes: Note[]
+	actionItems: ActionItem[]
+	deletedNoteIds: string[]
+	deletedActionItemIds: string[]
 }
 
 // Transform API response to frontend model
@@ -33,6 +76,7 @@ function transformNote(apiNote: ApiNote): Note {
 		content: apiNote.content,
 		createdAt: new Date(apiNote.created_at),
 		updatedAt: apiNote.updated_at ? new Date(apiNote.updated_at) : undefined,
+		version: apiNote.version,
 		actionItems: apiNote.action_items.map(transformActionItem)
 	}
 }
@@ -45,7 +89,8 @@ function transformActionItem(apiItem: ApiActionItem): ActionItem {
 		createdAt: apiItem.created_at ? new Date(apiItem.created_at) : undefined,
 		updatedAt: apiItem.updated_at ? new Date(apiItem.updated_at) : undefined,
 		completedAt: apiItem.completed_at ? new Date(apiItem.completed_at) : null,
-		completed: apiItem.completed
+		completed: apiItem.completed,
+		version: apiItem.version
 	}
 }
 
@@ -107,7 +152,8 @@ export const useNotesApi = () => {
 		if (noteData.attendees !== undefined) apiPayload.attendees = noteData.attendees
 		if (noteData.meetingStartTime !== undefined) apiPayload.meeting_start_time = new Date(noteData.meetingStartTime)?.toISOString()
 		if (noteData.content !== undefined) apiPayload.content = noteData.content
-		if (noteData.actionItems !== undefined) apiPayload.action_items = noteData.actionItems.map(ai => ({ title: ai.title }))
+		if (noteData.actionItems !== undefined) apiPayload.action_items = noteData.actionItems.map(ai => ({ id: ai.id, title: ai.title }))
+		if (noteData.version !== undefined) apiPayload.version = noteData.version
 
 		const response = await apiClient<ApiNote>(`/notes/${id}`, {
 			method: 'PUT',
@@ -199,6 +245,7 @@ export const useActionItemsApi = () => {
 
 		if (itemData.title !== undefined) apiPayload.title = itemData.title
 		if (itemData.completed !== undefined) apiPayload.completed = itemData.completed
+		if (itemData.version !== undefined) apiPayload.version = itemData.version
 
 		const response = await apiClient<ApiActionItem>(`/action-items/${id}`, {
 			method: 'PUT',
@@ -228,6 +275,29 @@ export const useActionItemsApi = () => {
 		})
 	}
 
+	// Apply several operations in one request; all succeed or none are applied
+	const bulkActionItems = async (operations: BulkActionItemOperation[]): Promise<BulkActionItemResult[]> => {
+		const response = await apiClient<{ results: ApiBulkActionItemResult[] }>('/action-items/bulk', {
+			method: 'POST',
+			body: {
+				operations: operations.map(operation => ({
+					op: operation.op,
+					id: operation.id,
+					title: operation.title,
+					note_id: operation.noteId,
+					completed: operation.completed,
+					version: operation.version
+				}))
+			}
+		})
+
+		return response.results.map(result => ({
+			op: result.op,
+			id: result.id,
+			item: result.item ? transformActionItem(result.item) : undefined
+		}))
+	}
+
 	return {
 		createActionItem,
 		getActionItem,
@@ -236,6 +306,29 @@ export const useActionItemsApi = () => {
 		updateActionItem,
 		completeActionItem,
 		uncompleteActionItem,
-		deleteActionItem
+		deleteActionItem,
+		bulkActionItems
+	}
+}
+
+// Change feed endpoints
+export const useChangesApi = () => {
+	const { apiClient } = useApi()
+
+	const getChanges = async (since?: number): Promise<ChangeSet> => {
+		const query = since !== undefined ? `?since=${since}` : ''
+		const response = await apiClient<ApiChangeSet>(`/changes${query}`)
+		return {
+			seq: response.seq,
+			reset: response.reset,
+			notes: response.notes.map(transformNote),
+			actionItems: response.action_items.map(transformActionItem),
+			deletedNoteIds: response.deleted_note_ids,
+			deletedActionItemIds: response.deleted_action_item_ids
+		}
+	}
+
+	return {
+		getChanges
 	}
 }
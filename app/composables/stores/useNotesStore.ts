@@ -1,11 +1,13 @@
 import type { Note } from '../../../model/Note';
-import { useNotesApi } from './useApi';
+import { useChangesApi, useNotesApi } from './useApi';
 
 // Reactive state (module-level for singleton behavior)
 const notes = ref<Note[]>([])
 const currentNote = ref<Note | null>(null)
 const loading = ref(false)
 const error = ref<string | null>(null)
+// Last change sequence merged into `notes` (null until the first sync)
+const lastSeq = ref<number | null>(null)
 
 // Notes store composable
 export const useNotesStore = () => {
@@ -17,6 +19,7 @@ export const useNotesStore = () => {
 		getNotes: apiGetNotes,
 		deleteNote: apiDeleteNote
 	} = useNotesApi()
+	const { getChanges: apiGetChanges } = useChangesApi()
 
 	// Actions
 	const search = async (query?: string): Promise<Note[]> => {
@@ -106,6 +109,37 @@ export const useNotesStore = () => {
 		}
 	}
 
+	// Merge only the notes changed since the last sync into the cache
+	const sync = async (): Promise<Note[]> => {
+		error.value = null
+
+		try {
+			const changes = await apiGetChanges(lastSeq.value ?? undefined)
+			lastSeq.value = changes.seq
+
+			if (changes.reset) {
+				return await search()
+			}
+
+			const changedIds = new Set([
+				...changes.notes.map(n => n.id),
+				...changes.deletedNoteIds
+			])
+			notes.value = [
+				...changes.notes,
+				...notes.value.filter(n => !changedIds.has(n.id))
+			].sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime())
+
+			if (currentNote.value && changedIds.has(currentNote.value.id)) {
+				currentNote.value = changes.notes.find(n => n.id === currentNote.value?.id) ?? null
+			}
+			return notes.value
+		} catch (err) {
+			error.value = err instanceof Error ? err.message : 'Failed to sync notes'
+			throw err
+		}
+	}
+
 	const clearError = () => {
 		error.value = null
 	}
@@ -119,6 +153,7 @@ export const useNotesStore = () => {
 
 		// Actions
 		search,
+		sync,
 		create,
 		update,
 		get,
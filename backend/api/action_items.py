@@ -1,8 +1,19 @@
-from typing import Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Query
-
-from ..models.action_item import ActionItem, ActionItemCreate, ActionItemUpdate
-from ..services.action_items_manager import get_action_items_manager
+from typing import Callable, Dict, Iterator, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from ..models.action_item import (
+    ActionItem,
+    ActionItemCreate,
+    ActionItemUpdate,
+    BulkActionItemRequest,
+    BulkActionItemResponse,
+)
+from ..services.action_items_manager import BulkOperationError, get_action_items_manager
+from ..services.executor import run_blocking
+from ..services.concurrency import VersionConflictError
+from ..services.response_cache import get_response_cache
+from .conditional import is_not_modified, make_etag, not_modified, set_validators
+from .responses import EncodedJSONResponse, encode_model, encode_models, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/action-items", tags=["action-items"])
@@ -12,34 +23,106 @@ router = APIRouter(prefix="/action-items", tags=["action-items"])
 async def create_action_item(item_data: ActionItemCreate) -> ActionItem:
     """Create a new action item."""
     manager = get_action_items_manager()
-    return manager.create_action_item(item_data)
+    return await run_blocking(manager.create_action_item, item_data)
+
+
+@router.post("/bulk", response_model=BulkActionItemResponse)
+async def bulk_action_items(bulk_data: BulkActionItemRequest) -> BulkActionItemResponse:
+    """
+    Apply several create/update/complete/uncomplete/delete operations at once.
+    
+    Operations are validated together and applied atomically with a single
+    write. If any is invalid nothing is applied, and the response (400, or
+    409 for stale versions) lists the failing operations by index.
+    """
+    manager = get_action_items_manager()
+    try:
+        results = await run_blocking(manager.apply_bulk_operations, bulk_data.operations)
+    except BulkOperationError as e:
+        raise HTTPException(
+            status_code=409 if e.conflict else 400,
+            detail={"message": str(e), "errors": e.errors},
+        )
+    
+    return BulkActionItemResponse(results=results)
+
+
+async def _cached_list_response(
+    request: Request,
+    cache_key: str,
+    etag: str,
+    last_modified: float,
+    load: Callable[[], List[ActionItem]],
+    stream: Callable[[], Iterator[ActionItem]]
+) -> Response:
+    """
+    Serve an action item list from the encoded-response cache or by loading it.
+    
+    With `Accept: application/x-ndjson` the items are streamed one per line
+    from `stream` instead.
+    """
+    if wants_ndjson(request):
+        etag = make_etag(etag, "ndjson")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    if wants_ndjson(request):
+        response = ndjson_response(encode_model(item) for item in stream())
+        set_validators(response, etag, last_modified)
+        return response
+    
+    cache = get_response_cache()
+    body = cache.get(cache_key, etag)
+    if body is None:
+        items = await run_blocking(load)
+        body = encode_models(items, ActionItem)
+        cache.put(cache_key, etag, body)
+    
+    response = EncodedJSONResponse(body)
+    response.headers["Vary"] = "Accept"
+    set_validators(response, etag, last_modified)
+    return response
 
 
 @router.get("", response_model=List[ActionItem])
 async def get_action_items(
+    request: Request,
     note_id: Optional[str] = Query(None, description="Filter by note ID"),
     incomplete_only: bool = Query(False, description="Only return incomplete items"),
     limit: Optional[int] = Query(None, description="Limit number of results"),
 ) -> List[ActionItem]:
     """
     Get all action items with optional filters.
+    
+    Supports conditional GETs via ETag/Last-Modified, and streaming as
+    newline-delimited JSON with `Accept: application/x-ndjson`.
     """
     manager = get_action_items_manager()
     
-    if note_id:
-        items = manager.get_action_items_by_note(note_id)
-    elif incomplete_only:
-        items = manager.get_incomplete_action_items(limit=limit)
-    else:
+    def load() -> List[ActionItem]:
+        if note_id:
+            return manager.get_action_items_by_note(note_id)
+        if incomplete_only:
+            return manager.get_incomplete_action_items(limit=limit)
         items = manager.get_all_action_items()
-        if limit:
-            items = items[:limit]
+        return items[:limit] if limit else items
     
-    return items
+    def stream() -> Iterator[ActionItem]:
+        if note_id:
+            return manager.iter_action_items(note_id=note_id)
+        if incomplete_only:
+            return manager.iter_action_items(incomplete_only=True, limit=limit)
+        return manager.iter_action_items(newest_first=True, limit=limit)
+    
+    token, last_modified = await run_blocking(manager.get_validator)
+    etag = make_etag("action-items", note_id, incomplete_only, limit, token)
+    cache_key = f"action-items:{note_id}:{incomplete_only}:{limit}"
+    return await _cached_list_response(request, cache_key, etag, last_modified, load, stream)
 
 
 @router.get("/incomplete", response_model=List[ActionItem])
 async def get_incomplete_action_items(
+    request: Request,
     limit: int = Query(5, description="Number of items to return"),
 ) -> List[ActionItem]:
     """
@@ -48,14 +131,25 @@ async def get_incomplete_action_items(
     Default returns 5 oldest incomplete items for the home page.
     """
     manager = get_action_items_manager()
-    return manager.get_incomplete_action_items(limit=limit)
+    
+    token, last_modified = await run_blocking(manager.get_validator)
+    etag = make_etag("action-items-incomplete", limit, token)
+    cache_key = f"action-items-incomplete:{limit}"
+    return await _cached_list_response(
+        request,
+        cache_key,
+        etag,
+        last_modified,
+        lambda: manager.get_incomplete_action_items(limit=limit),
+        lambda: manager.iter_action_items(incomplete_only=True, limit=limit),
+    )
 
 
 @router.get("/{item_id}", response_model=ActionItem)
 async def get_action_item(item_id: str) -> ActionItem:
     """Get a specific action item by ID."""
     manager = get_action_items_manager()
-    item = manager.get_action_item(item_id)
+    item = await run_blocking(manager.get_action_item, item_id)
     
     if not item:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -68,10 +162,14 @@ async def update_action_item(item_id: str, update_data: ActionItemUpdate) -> Act
     """
     Update an existing action item.
     
-    Only provided fields will be updated.
+    Only provided fields will be updated. If `version` is given and the item
+    has changed since that version, the update is rejected with 409.
     """
     manager = get_action_items_manager()
-    item = manager.update_action_item(item_id, update_data)
+    try:
+        item = await run_blocking(manager.update_action_item, item_id, update_data)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     if not item:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -83,7 +181,7 @@ async def update_action_item(item_id: str, update_data: ActionItemUpdate) -> Act
 async def complete_action_item(item_id: str) -> ActionItem:
     """Mark an action item as complete."""
     manager = get_action_items_manager()
-    item = manager.complete_action_item(item_id)
+    item = await run_blocking(manager.complete_action_item, item_id)
     
     if not item:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -95,7 +193,7 @@ async def complete_action_item(item_id: str) -> ActionItem:
 async def uncomplete_action_item(item_id: str) -> ActionItem:
     """Mark an action item as incomplete."""
     manager = get_action_items_manager()
-    item = manager.uncomplete_action_item(item_id)
+    item = await run_blocking(manager.uncomplete_action_item, item_id)
     
     if not item:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -107,7 +205,7 @@ async def uncomplete_action_item(item_id: str) -> ActionItem:
 async def delete_action_item(item_id: str) -> Dict[str, str]:
     """Delete an action item."""
     manager = get_action_items_manager()
-    deleted = manager.delete_action_item(item_id)
+    deleted = await run_blocking(manager.delete_action_item, item_id)
     
     if not deleted:
         raise HTTPException(status_code=404, detail="Action item not found")
@@ -0,0 +1,137 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from ..models.changes import ChangeSet
+from ..services.notes_manager import get_notes_manager
+from ..services.action_items_manager import get_action_items_manager
+from ..services.change_feed import collapse_changes, get_change_feed
+from ..services.executor import run_blocking
+from .notes import _populate_action_items
+
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_INTERVAL = 15.0
+
+
+def _build_change_set(since: Optional[int]) -> ChangeSet:
+    """Load the current state of every record changed since `since` (blocking)."""
+    feed = get_change_feed()
+    seq = feed.seq
+    
+    events = feed.changes_since(since) if since is not None else None
+    if events is None:
+        return ChangeSet(seq=seq, reset=True)
+    
+    notes_manager = get_notes_manager()
+    action_items_manager = get_action_items_manager()
+    change_set = ChangeSet(seq=max([seq] + [e["seq"] for e in events]))
+    
+    for (kind, record_id), op in collapse_changes(events).items():
+        if kind == "note":
+            note = notes_manager.get_note(record_id) if op != "deleted" else None
+            if note:
+                change_set.notes.append(_populate_action_items(note))
+            else:
+                change_set.deleted_note_ids.append(record_id)
+        elif kind == "action_item":
+            item = action_items_manager.get_action_item(record_id) if op != "deleted" else None
+            if item:
+                change_set.action_items.append(item)
+            else:
+                change_set.deleted_action_item_ids.append(record_id)
+    
+    return change_set
+
+
+def _load_event_record(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Load the current JSON form of the record an event refers to (blocking)."""
+    if event["op"] == "deleted":
+        return None
+    
+    if event["kind"] == "note":
+        note = get_notes_manager().get_note(event["id"])
+        return _populate_action_items(note).model_dump(mode="json") if note else None
+    
+    item = get_action_items_manager().get_action_item(event["id"])
+    return item.model_dump(mode="json") if item else None
+
+
+async def _format_event(event: Dict[str, Any]) -> str:
+    """Format a change as a Server-Sent Event with the record's current state."""
+    record = await run_blocking(_load_event_record, event)
+    data = json.dumps({**event, "record": record})
+    return f"id: {event['seq']}\nevent: change\ndata: {data}\n\n"
+
+
+@router.get("", response_model=ChangeSet)
+async def get_changes(
+    since: Optional[int] = Query(None, description="Last change sequence number seen"),
+) -> ChangeSet:
+    """
+    Get notes and action items created, updated or deleted since `since`.
+    
+    Without `since`, or if the server no longer has changes that far back,
+    `reset` is true and the client should refetch everything, then sync
+    from the returned `seq`.
+    """
+    return await run_blocking(_build_change_set, since)
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, description="Replay changes after this sequence number"),
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Stream changes as Server-Sent Events.
+    
+    Each `change` event carries the sequence number, record kind, ID,
+    operation and the record's current state. Reconnecting clients resume
+    from `Last-Event-ID`; a `reset` event means they must refetch everything.
+    """
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        feed = get_change_feed()
+        queue = feed.subscribe()
+        last_sent = since if since is not None else feed.seq
+        
+        try:
+            if since is not None:
+                backlog = feed.changes_since(since)
+                if backlog is None:
+                    last_sent = feed.seq
+                    yield f"event: reset\ndata: {json.dumps({'seq': last_sent})}\n\n"
+                else:
+                    for event in backlog:
+                        yield await _format_event(event)
+                        last_sent = event["seq"]
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                # Events recorded while replaying the backlog arrive twice
+                if event["seq"] <= last_sent:
+                    continue
+                yield await _format_event(event)
+                last_sent = event["seq"]
+        finally:
+            feed.unsubscribe(queue)
+    
+    # Uncompressed: the gzip middleware would hold events back until its buffer fills
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"},
+    )
@@ -0,0 +1,95 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from validator parts (IDs, versions, generations).
+    
+    Args:
+        *parts: Values that change whenever the representation changes
+    
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if header.strip() == "*":
+        return True
+    
+    candidates = [c.strip() for c in header.split(",")]
+    return any(
+        (c[2:] if c.startswith("W/") else c) == etag
+        for c in candidates
+    )
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[float] = None
+) -> bool:
+    """
+    Evaluate conditional GET headers against the current validators.
+    
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    
+    Args:
+        request: The incoming request
+        etag: Current ETag of the resource
+        last_modified: Current modification time as Unix timestamp (optional)
+    
+    Returns:
+        True if the client's cached copy is still valid
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= int(since.timestamp())
+    
+    return False
+
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: Optional[float] = None
+) -> None:
+    """
+    Attach ETag/Last-Modified headers to a response.
+    
+    `Cache-Control: no-cache` lets clients keep the body but makes them
+    revalidate on every use, which is what turns repeat views into 304s.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            datetime.fromtimestamp(int(last_modified), tz=timezone.utc),
+            usegmt=True,
+        )
+
+
+def not_modified(etag: str, last_modified: Optional[float] = None) -> Response:
+    """Build an empty 304 Not Modified response carrying the validators."""
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
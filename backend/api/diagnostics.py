@@ -0,0 +1,153 @@
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+
+from ..config import Config
+from ..services.executor import run_blocking
+from ..services.metrics import (
+    STAGE_GROUPS,
+    begin_request_stages,
+    end_request_stages,
+    get_metrics_registry,
+)
+from ..services.profiling import start_profile, stop_profile
+from ..services.tracing import get_tracer
+
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+TRACE_ID_HEADER = "X-Trace-Id"
+
+_slow_log_lock = threading.Lock()
+
+
+def _stage_breakdown(stages: Dict[str, List], duration: float) -> Dict[str, Any]:
+    """
+    Summarize a request's stage totals.
+    
+    Returns:
+        Per-stage totals plus time grouped into disk/parse/render/serialize,
+        with the remainder reported as "other"
+    """
+    detail = {
+        stage: {"ms": round(seconds * 1000, 3), "count": count}
+        for stage, (seconds, count) in sorted(stages.items())
+    }
+    
+    groups: Dict[str, float] = {"disk": 0.0, "parse": 0.0, "render": 0.0, "serialize": 0.0}
+    for stage, (seconds, _) in stages.items():
+        group = STAGE_GROUPS.get(stage, "other")
+        groups[group] = groups.get(group, 0.0) + seconds
+    groups["other"] = max(0.0, duration - sum(groups.values()))
+    
+    return {
+        "stages": detail,
+        "breakdown_ms": {group: round(seconds * 1000, 3) for group, seconds in groups.items()},
+    }
+
+
+def _append_slow_request(config: Config, entry: Dict[str, Any]) -> None:
+    """Append a slow-request record to the JSON-lines log (blocking)."""
+    line = json.dumps(entry) + "\n"
+    with _slow_log_lock:
+        config.slow_request_log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(config.slow_request_log_file, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _profile_filename(request: Request) -> str:
+    """Build a sortable, filesystem-safe name for a request's profile."""
+    path = re.sub(r"[^A-Za-z0-9]+", "-", request.url.path).strip("-") or "root"
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return f"{timestamp}-{request.method.lower()}-{path[:80]}.prof"
+
+
+def add_diagnostics_middleware(app: FastAPI, config: Config) -> None:
+    """
+    Install the request timing middleware.
+    
+    Depending on configuration it:
+    - records request latency by route template for /metrics
+    - profiles requests that carry an `X-Profile: 1` header and saves the
+      profile to the profiles directory (name returned in `X-Profile-File`)
+    - logs requests slower than the threshold, with their stage timings
+    - traces a sample of requests through the managers and file system
+      and exports the spans as JSON lines (trace ID in `X-Trace-Id`)
+    
+    Args:
+        app: Application to install the middleware on
+        config: Application configuration
+    """
+    slow_threshold = config.slow_request_threshold_ms / 1000
+    if not (
+        config.metrics_enabled
+        or config.profiling_enabled
+        or config.tracing_enabled
+        or slow_threshold > 0
+    ):
+        return
+    
+    request_duration = get_metrics_registry().request_duration
+    tracer = get_tracer() if config.tracing_enabled else None
+    
+    @app.middleware("http")
+    async def time_requests(request: Request, call_next):
+        profile_token = None
+        if config.profiling_enabled and request.headers.get(PROFILE_HEADER, "").lower() in ("1", "true"):
+            profile_token = start_profile()
+        stages_token = begin_request_stages()
+        trace_token = None
+        if tracer is not None:
+            trace_token = tracer.start_trace(request.method, path=request.url.path)
+        
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            duration = time.perf_counter() - start
+            stages = end_request_stages(stages_token)
+            profile = stop_profile(profile_token) if profile_token is not None else None
+            trace = tracer.end_trace(trace_token) if trace_token is not None else None
+            
+            # Label by route template (not raw path) to keep cardinality bounded
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            if config.metrics_enabled:
+                request_duration.observe(duration, request.method, route_path, str(status))
+        
+        if trace is not None:
+            trace.root.name = f"{request.method} {route_path}"
+            trace.root.set_attribute("status", status)
+            response.headers[TRACE_ID_HEADER] = trace.trace_id
+            await run_blocking(tracer.export, trace)
+        
+        profile_file: Optional[str] = None
+        if profile is not None:
+            profile_file = _profile_filename(request)
+            if await run_blocking(profile.dump, config.profiles_directory / profile_file):
+                response.headers[PROFILE_FILE_HEADER] = profile_file
+            else:
+                profile_file = None
+        
+        if slow_threshold > 0 and duration >= slow_threshold:
+            entry = {
+                "timestamp": datetime.now().isoformat(),
+                "method": request.method,
+                "path": request.url.path,
+                "route": route_path,
+                "status": status,
+                "duration_ms": round(duration * 1000, 3),
+                **_stage_breakdown(stages, duration),
+            }
+            if profile_file:
+                entry["profile"] = profile_file
+            await run_blocking(_append_slow_request, config, entry)
+        
+        return response
@@ -0,0 +1,143 @@
+import zipfile
+from datetime import datetime
+from typing import Iterator, List
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..services.action_items_manager import get_action_items_manager
+from ..services.archive import get_archive_store
+from ..services.notes_manager import get_notes_manager
+from .notes import _populate_action_items
+from .responses import encode_model
+
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Bytes read from disk, and roughly sent to the client, at a time
+CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = ("zip", "ndjson")
+
+
+class _ZipSink:
+    """
+    Write-only file object that collects a ZipFile's output between yields.
+    
+    It has no tell/seek, so ZipFile writes a streamable archive (sizes go in
+    data descriptors after each entry) instead of seeking back.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.pending = 0
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        """Take everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.pending = 0
+        return data
+
+
+def _zip_chunks() -> Iterator[bytes]:
+    """
+    Stream the raw markdown files and the action item shards as a zip (blocking).
+    
+    Files are copied in chunks, so memory use doesn't grow with the vault.
+    Archived notes are unpacked into the zip under their original paths.
+    """
+    archive_store = get_archive_store()
+    notes_manager = get_notes_manager()
+    config = notes_manager.config
+    notes_manager.flush_pending_writes()
+    
+    files = [
+        (path, f"notes/{path.relative_to(config.notes_base_directory).as_posix()}"
+         if path.is_relative_to(config.notes_base_directory) else f"notes/{path.name}")
+        for _, path in notes_manager.get_note_paths()
+    ]
+    files += [
+        (path, f"action_items/{path.name}")
+        for path in get_action_items_manager().get_storage_files()
+    ]
+    
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, arcname in files:
+            try:
+                source = open(path, "rb")
+            except FileNotFoundError:
+                content = archive_store.get(path)
+                if content is not None:
+                    archive.writestr(arcname, content)
+                # Otherwise deleted since the index snapshot was taken
+                continue
+            
+            with source, archive.open(arcname, "w") as entry:
+                while chunk := source.read(CHUNK_SIZE):
+                    entry.write(chunk)
+                    if sink.pending >= CHUNK_SIZE:
+                        yield sink.drain()
+            
+            if sink.pending >= CHUNK_SIZE:
+                yield sink.drain()
+    
+    yield sink.drain()
+
+
+def _ndjson_chunks() -> Iterator[bytes]:
+    """Stream every note, with its action items, as one JSON object per line (blocking)."""
+    notes_manager = get_notes_manager()
+    buffer = bytearray()
+    
+    for note_id in notes_manager.get_note_ids():
+        note = notes_manager.get_note(note_id)
+        if note is None:
+            continue
+        
+        buffer += encode_model(_populate_action_items(note))
+        buffer += b"\n"
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    
+    if buffer:
+        yield bytes(buffer)
+
+
+@router.get("")
+async def export_vault(
+    format: str = Query("zip", description="Export format: zip (raw markdown files) or ndjson"),
+) -> StreamingResponse:
+    """
+    Export the whole vault as a stream.
+    
+    - `zip`: the markdown files as stored on disk plus the action item shards
+    - `ndjson`: one JSON note per line, with its action items
+    
+    Notes are read from disk one at a time while the response is sent, so
+    memory use stays flat regardless of vault size.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    
+    filename = f"goodnotes-export-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    if format == "zip":
+        # Already compressed: keep the gzip middleware from compressing it again
+        headers["Content-Encoding"] = "identity"
+        return StreamingResponse(_zip_chunks(), media_type="application/zip", headers=headers)
+    
+    return StreamingResponse(_ndjson_chunks(), media_type="application/x-ndjson", headers=headers)
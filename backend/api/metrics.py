@@ -0,0 +1,96 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..services.notes_manager import get_notes_manager
+from ..services.action_items_manager import get_action_items_manager
+from ..services.executor import get_worker_pool, run_blocking
+from ..services.metrics import get_metrics_registry, render_metric
+from ..services.response_cache import get_response_cache
+from ..services.vaults import get_vault_registry
+
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _render_metrics() -> str:
+    """Render latency histograms plus storage, cache and pool gauges (blocking)."""
+    lines: List[str] = get_metrics_registry().render()
+    
+    notes_stats = get_notes_manager().stats()
+    lines += render_metric(
+        "goodnotes_notes_indexed", "gauge", "Notes in the in-memory index",
+        [({}, notes_stats["indexed_notes"])],
+    )
+    lines += render_metric(
+        "goodnotes_notes_pending_writes", "gauge", "Notes waiting in the write-behind buffer",
+        [({}, notes_stats["pending_writes"])],
+    )
+    lines += render_metric(
+        "goodnotes_notes_failed_flushes_total", "counter", "Buffered note writes that failed (and are retried)",
+        [({}, notes_stats["failed_flushes"])],
+    )
+    lines += render_metric(
+        "goodnotes_notes_archived", "gauge", "Notes stored in monthly archive packs",
+        [({}, notes_stats["archived_notes"])],
+    )
+    
+    items_stats = get_action_items_manager().stats()
+    lines += render_metric(
+        "goodnotes_action_items", "gauge", "Action items by completion state",
+        [
+            ({"state": "completed"}, items_stats["completed"]),
+            ({"state": "incomplete"}, items_stats["incomplete"]),
+        ],
+    )
+    
+    cache_stats = get_response_cache().stats()
+    lookups = cache_stats["hits"] + cache_stats["misses"]
+    lines += render_metric(
+        "goodnotes_response_cache_entries", "gauge", "Entries in the encoded response cache",
+        [({}, cache_stats["entries"])],
+    )
+    lines += render_metric(
+        "goodnotes_response_cache_lookups_total", "counter", "Response cache lookups by result",
+        [({"result": "hit"}, cache_stats["hits"]), ({"result": "miss"}, cache_stats["misses"])],
+    )
+    lines += render_metric(
+        "goodnotes_response_cache_hit_ratio", "gauge", "Fraction of response cache lookups that hit",
+        [({}, cache_stats["hits"] / lookups if lookups else 0)],
+    )
+    
+    vault_stats = get_vault_registry().stats()
+    lines += render_metric(
+        "goodnotes_vaults_loaded", "gauge", "Named vaults currently loaded",
+        [({}, vault_stats["loaded"])],
+    )
+    lines += render_metric(
+        "goodnotes_vaults_memory_bytes", "gauge", "Estimated memory held by loaded named vaults",
+        [({}, vault_stats["estimated_memory"])],
+    )
+    lines += render_metric(
+        "goodnotes_vaults_unloaded_total", "counter", "Named vaults unloaded (idle or over budget)",
+        [({}, vault_stats["unloaded"])],
+    )
+    
+    pool_stats = get_worker_pool().stats()
+    lines += render_metric(
+        "goodnotes_worker_pool_calls", "gauge", "Worker pool calls by state",
+        [({"state": "active"}, pool_stats["active"]), ({"state": "queued"}, pool_stats["queued"])],
+    )
+    lines += render_metric(
+        "goodnotes_worker_pool_completed_total", "counter", "Worker pool calls completed",
+        [({}, pool_stats["completed"])],
+    )
+    
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Expose metrics in Prometheus text format."""
+    body = await run_blocking(_render_metrics)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,16 +1,33 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from ..models.note import Note, NoteCreate, NoteUpdate
+from ..models.note import Note, NoteCreate, NoteImportRequest, NoteUpdate, RelatedNote
 from ..models.action_item import ActionItemCreate
 from ..services.notes_manager import get_notes_manager
 from ..services.action_items_manager import get_action_items_manager
+from ..services.executor import run_blocking
+from ..services.importer import import_notes
+from ..services.concurrency import VersionConflictError
+from ..services.response_cache import get_response_cache
+from ..services.similarity import get_similarity_index
+from ..services.unit_of_work import NoteUnitOfWork
+from ..services.tracing import traced
+from .conditional import is_not_modified, make_etag, not_modified, set_validators
+from .responses import (
+    EncodedJSONResponse,
+    encode_model,
+    join_json_array,
+    ndjson_response,
+    wants_ndjson,
+)
 
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
 
+@traced("api.notes._populate_action_items")
 def _populate_action_items(note: Note) -> Note:
     """Populate a note with its associated action items."""
     action_items_manager = get_action_items_manager()
@@ -20,22 +37,168 @@ def _populate_action_items(note: Note) -> Note:
     action_item_ids = notes_manager.get_action_item_ids(note.id)
     
     if action_item_ids:
-        action_items = action_items_manager.get_action_items_by_ids(action_item_ids)
+        action_items = action_items_manager.get_action_items_by_ids(action_item_ids, note_id=note.id)
     else:
         # Fallback: get action items by note_id
         action_items = action_items_manager.get_action_items_by_note(note.id)
     
-    # Create a new note with populated action items
-    return Note(
-        id=note.id,
-        title=note.title,
-        content=note.content,
-        attendees=note.attendees,
-        meeting_start_time=note.meeting_start_time,
-        created_at=note.created_at,
-        updated_at=note.updated_at,
-        action_items=action_items,
-    )
+    # Copy the note with populated action items (no re-validation)
+    return note.model_copy(update={"action_items": action_items})
+
+
+def _note_validators(note_id: str) -> Optional[Tuple[str, float]]:
+    """
+    Get the ETag and Last-Modified time for a note response.
+    
+    Uses the note's file signature (or buffered version) plus the generation
+    of its own action items, so it never reads or renders the note itself and
+    changes to other notes' action items leave it valid.
+    """
+    note_validator = get_notes_manager().get_note_validator(note_id)
+    if note_validator is None:
+        return None
+    
+    token, modified = note_validator
+    items_token, items_modified = get_action_items_manager().get_note_validator(note_id)
+    return make_etag("note", note_id, token, items_token), max(modified, items_modified)
+
+
+def _list_validators(*parts: Any) -> Tuple[str, float]:
+    """Get the ETag and Last-Modified time for a notes list response."""
+    notes_token, notes_modified = get_notes_manager().get_validator()
+    items_token, items_modified = get_action_items_manager().get_validator()
+    return make_etag("notes", *parts, notes_token, items_token), max(notes_modified, items_modified)
+
+
+@traced("api.notes._render_note")
+def _render_note(
+    note_id: str,
+    validators: Optional[Tuple[str, float]] = None
+) -> Optional[Tuple[datetime, bytes]]:
+    """
+    Get a note's encoded JSON (with action items), using the response cache.
+    
+    Args:
+        note_id: The note's unique identifier
+        validators: Validators already computed for the note, if any
+    
+    Returns:
+        Tuple of (created_at, encoded JSON) or None if the note doesn't exist
+    """
+    if validators is None:
+        validators = _note_validators(note_id)
+        if validators is None:
+            return None
+    
+    cache = get_response_cache()
+    cache_key = f"note:{note_id}"
+    etag = validators[0]
+    
+    rendered = cache.get(cache_key, etag)
+    if rendered is not None:
+        return rendered
+    
+    note = get_notes_manager().get_note(note_id)
+    if not note:
+        return None
+    
+    note = _populate_action_items(note)
+    rendered = (note.created_at, encode_model(note))
+    cache.put(cache_key, etag, rendered)
+    return rendered
+
+
+@traced("api.notes._render_note_list")
+def _render_note_list(date: Optional[datetime] = None) -> bytes:
+    """
+    Encode a note list by concatenating cached per-note fragments.
+    
+    Only notes that changed since they were last rendered are read and parsed.
+    """
+    note_ids = get_notes_manager().get_note_ids(date)
+    rendered = [r for r in (_render_note(note_id) for note_id in note_ids) if r]
+    
+    # Sort by created_at descending (newest first)
+    rendered.sort(key=lambda r: r[0], reverse=True)
+    return join_json_array(body for _, body in rendered)
+
+
+def warm_recent_notes() -> int:
+    """
+    Pre-render today's and yesterday's note lists into the response cache.
+    
+    Returns:
+        Number of notes rendered
+    """
+    cache = get_response_cache()
+    today = datetime.now()
+    count = 0
+    
+    for date in (today, today - timedelta(days=1)):
+        date_key = date.strftime("%Y-%m-%d")
+        etag, _ = _list_validators(date_key, "json")
+        cache.put(f"notes:{date_key}", etag, _render_note_list(date))
+        count += len(get_notes_manager().get_note_ids(date))
+    
+    return count
+
+
+@traced("api.notes._create_note")
+def _create_note(note_data: NoteCreate) -> Note:
+    """
+    Create a note and its action items in one unit of work (blocking).
+    
+    The note is written once, already linked to its action items, and the
+    returned note carries them, so nothing has to be read back.
+    """
+    uow = NoteUnitOfWork()
+    note = uow.create_note(note_data)
+    uow.commit()
+    return note
+
+
+@traced("api.notes._update_note")
+def _update_note(note_id: str, update_data: NoteUpdate) -> Optional[Note]:
+    """Update a note and reconcile its action items if provided (blocking)."""
+    notes_manager = get_notes_manager()
+    action_items_manager = get_action_items_manager()
+    
+    # Hold the note's lock so the version check covers the action item changes too
+    with notes_manager.note_lock(note_id):
+        existing_note = notes_manager.get_note(note_id)
+        if not existing_note:
+            return None
+        
+        if update_data.version is not None and update_data.version != existing_note.version:
+            raise VersionConflictError("Note", note_id, update_data.version, existing_note.version)
+        
+        # Apply only the differences to the note's action items (one write at most)
+        if update_data.action_items is not None:
+            action_items = action_items_manager.reconcile_note_action_items(
+                note_id,
+                update_data.action_items
+            )
+        else:
+            action_items = action_items_manager.get_action_items_by_note(note_id)
+        
+        note = notes_manager.update_note(note_id, update_data, action_items=action_items)
+        if not note:
+            return None
+    
+    return _populate_action_items(note)
+
+
+@traced("api.notes._delete_note")
+def _delete_note(note_id: str) -> bool:
+    """Delete a note and its associated action items (blocking)."""
+    notes_manager = get_notes_manager()
+    action_items_manager = get_action_items_manager()
+    
+    # Delete associated action items first
+    action_items_manager.delete_action_items_by_note(note_id)
+    
+    # Delete the note
+    return notes_manager.delete_note(note_id)
 
 
 @router.post("", response_model=Note)
@@ -46,83 +209,188 @@ async def create_note(note_data: NoteCreate) -> Note:
     The note will be saved as a markdown file in the notes directory,
     organized by creation date (YYYYMMDD subdirectory).
     """
-    notes_manager = get_notes_manager()
-    action_items_manager = get_action_items_manager()
+    return await run_blocking(_create_note, note_data)
+
+
+@router.post("/import")
+async def import_notes_endpoint(import_data: NoteImportRequest) -> Dict[str, Any]:
+    """
+    Bulk-import markdown files from a directory or archive on the server.
     
-    # First create the note to get its ID
-    note = notes_manager.create_note(note_data)
-    
-    # Create action items if provided
-    created_action_items = []
-    if note_data.action_items:
-        created_action_items = action_items_manager.create_action_items_batch(
-            note_data.action_items,
-            note_id=note.id
-        )
-    
-    # Update the note with action item IDs
-    if created_action_items:
-        note = notes_manager.update_note(
-            note.id,
-            NoteUpdate(),  # No field updates, just re-save with action items
-            action_items=created_action_items
-        )
+    Files are parsed in parallel and the index and action items are saved
+    once. With `dry_run` the planned notes are reported but nothing is written.
+    """
+    source = Path(import_data.path).expanduser()
+    if not source.exists():
+        raise HTTPException(status_code=404, detail=f"{import_data.path} not found")
     
-    return _populate_action_items(note)
+    try:
+        return await run_blocking(import_notes, source, import_data.dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/archive")
+async def archive_notes(
+    older_than_days: Optional[int] = Query(None, ge=1, description="Minimum age in days (default: configured archive_after_days)"),
+) -> Dict[str, int]:
+    """Pack old date directories into monthly compressed archives."""
+    notes_manager = get_notes_manager()
+    return await run_blocking(notes_manager.archive_old_notes, older_than_days)
+
+
+@router.post("/flush")
+async def flush_notes() -> Dict[str, int]:
+    """Write any buffered note changes to disk immediately."""
+    notes_manager = get_notes_manager()
+    flushed = await run_blocking(notes_manager.flush_pending_writes)
+    return {"flushed": flushed}
 
 
 @router.get("", response_model=List[Note])
 async def get_notes(
+    request: Request,
     date: Optional[str] = Query(None, description="Filter by date (YYYY-MM-DD)"),
 ) -> List[Note]:
     """
     Get all notes, optionally filtered by date.
-    """
-    notes_manager = get_notes_manager()
     
+    Supports conditional GETs via ETag/Last-Modified, and streaming as
+    newline-delimited JSON with `Accept: application/x-ndjson`.
+    """
+    filter_date = None
     if date:
         try:
             filter_date = datetime.strptime(date, "%Y-%m-%d")
-            notes = notes_manager.get_notes_by_date(filter_date)
         except ValueError:
             raise HTTPException(
                 status_code=400,
                 detail="Invalid date format. Use YYYY-MM-DD"
             )
-    else:
-        notes = notes_manager.get_all_notes()
     
-    return [_populate_action_items(note) for note in notes]
+    return await _get_note_list(filter_date, request)
+
+
+def _stream_notes(note_ids: List[str]) -> Iterator[bytes]:
+    """Yield each note's encoded JSON as it is rendered (blocking)."""
+    for note_id in note_ids:
+        rendered = _render_note(note_id)
+        if rendered:
+            yield rendered[1]
+
+
+async def _get_note_list(date: Optional[datetime], request: Request) -> Response:
+    """
+    Serve a (optionally date-filtered) note list, honoring conditional GETs.
+    
+    With `Accept: application/x-ndjson` the notes are streamed one per line
+    as they are rendered instead of as one JSON array.
+    """
+    date_key = date.strftime("%Y-%m-%d") if date else None
+    stream = wants_ndjson(request)
+    etag, last_modified = await run_blocking(_list_validators, date_key, "ndjson" if stream else "json")
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    if stream:
+        note_ids = await run_blocking(get_notes_manager().get_note_ids, date)
+        # IDs start with the creation timestamp: newest first without reading any note
+        note_ids.sort(reverse=True)
+        response = ndjson_response(_stream_notes(note_ids))
+        set_validators(response, etag, last_modified)
+        return response
+    
+    cache = get_response_cache()
+    cache_key = f"notes:{date_key or 'all'}"
+    body = cache.get(cache_key, etag)
+    if body is None:
+        body = await run_blocking(_render_note_list, date)
+        cache.put(cache_key, etag, body)
+    
+    response = EncodedJSONResponse(body)
+    response.headers["Vary"] = "Accept"
+    set_validators(response, etag, last_modified)
+    return response
 
 
 @router.get("/today", response_model=List[Note])
-async def get_todays_notes() -> List[Note]:
+async def get_todays_notes(request: Request) -> List[Note]:
     """Get notes created today."""
-    notes_manager = get_notes_manager()
     today = datetime.now()
-    notes = notes_manager.get_notes_by_date(today)
-    return [_populate_action_items(note) for note in notes]
+    return await _get_note_list(today, request)
 
 
 @router.get("/yesterday", response_model=List[Note])
-async def get_yesterdays_notes() -> List[Note]:
+async def get_yesterdays_notes(request: Request) -> List[Note]:
     """Get notes created yesterday."""
-    notes_manager = get_notes_manager()
     yesterday = datetime.now() - timedelta(days=1)
-    notes = notes_manager.get_notes_by_date(yesterday)
-    return [_populate_action_items(note) for note in notes]
+    return await _get_note_list(yesterday, request)
 
 
 @router.get("/{note_id}", response_model=Note)
-async def get_note(note_id: str) -> Note:
-    """Get a specific note by ID."""
-    notes_manager = get_notes_manager()
-    note = notes_manager.get_note(note_id)
+async def get_note(note_id: str, request: Request) -> Note:
+    """
+    Get a specific note by ID.
     
-    if not note:
+    Supports conditional GETs: a matching If-None-Match/If-Modified-Since
+    is answered with 304 without reading or rendering the note.
+    """
+    validators = await run_blocking(_note_validators, note_id)
+    if validators and is_not_modified(request, *validators):
+        return not_modified(*validators)
+    
+    rendered = await run_blocking(_render_note, note_id, validators)
+    
+    if not rendered:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    return _populate_action_items(note)
+    if validators is None:
+        # The note was created after the validators were first computed
+        validators = await run_blocking(_note_validators, note_id)
+    
+    response = EncodedJSONResponse(rendered[1])
+    if validators:
+        set_validators(response, *validators)
+    return response
+
+
+def _related_notes(note_id: str, k: int, previous_only: bool) -> Optional[List[RelatedNote]]:
+    """Get the notes most similar to a note, with their titles (blocking)."""
+    related = get_similarity_index().related(note_id, k, previous_only)
+    if related is None:
+        return None
+    
+    notes_manager = get_notes_manager()
+    result: List[RelatedNote] = []
+    for related_id, score in related:
+        note = notes_manager.get_note(related_id)
+        if note:
+            result.append(RelatedNote(
+                id=note.id,
+                title=note.title,
+                attendees=note.attendees,
+                created_at=note.created_at,
+                score=score,
+            ))
+    return result
+
+
+@router.get("/{note_id}/related", response_model=List[RelatedNote])
+async def get_related_notes(
+    note_id: str,
+    k: int = Query(5, ge=1, le=50, description="Maximum number of notes"),
+    previous: bool = Query(False, description="Only notes created before this one"),
+) -> List[RelatedNote]:
+    """
+    Get the notes most similar to a note, most similar first.
+    
+    Similarity is the cosine of the notes' TF-IDF vectors over title,
+    attendees and body, so earlier meetings of a series rank highest.
+    """
+    related = await run_blocking(_related_notes, note_id, k, previous)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return related
 
 
 @router.put("/{note_id}", response_model=Note)
@@ -130,43 +398,24 @@ async def update_note(note_id: str, update_data: NoteUpdate) -> Note:
     """
     Update an existing note.
     
-    Only provided fields will be updated.
+    Only provided fields will be updated. If `version` is given and the note
+    has changed since that version, the update is rejected with 409.
     """
-    notes_manager = get_notes_manager()
-    action_items_manager = get_action_items_manager()
-    
-    # Get existing action items
-    existing_action_items = action_items_manager.get_action_items_by_note(note_id)
-    
-    # Handle action items update
-    action_items = existing_action_items
-    if update_data.action_items is not None:
-        # Delete existing action items and create new ones
-        action_items_manager.delete_action_items_by_note(note_id)
-        action_items = action_items_manager.create_action_items_batch(
-            update_data.action_items,
-            note_id=note_id
-        )
-    
-    note = notes_manager.update_note(note_id, update_data, action_items=action_items)
+    try:
+        note = await run_blocking(_update_note, note_id, update_data)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
-    return _populate_action_items(note)
+    return note
 
 
 @router.delete("/{note_id}")
 async def delete_note(note_id: str) -> Dict[str, str]:
     """Delete a note and its associated action items."""
-    notes_manager = get_notes_manager()
-    action_items_manager = get_action_items_manager()
-    
-    # Delete associated action items first
-    action_items_manager.delete_action_items_by_note(note_id)
-    
-    # Delete the note
-    deleted = notes_manager.delete_note(note_id)
+    deleted = await run_blocking(_delete_note, note_id)
     
     if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
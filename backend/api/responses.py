@@ -0,0 +1,71 @@
+from functools import lru_cache
+from typing import Iterable, Iterator, List, TypeVar
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+from ..services.metrics import stage_timer
+
+
+M = TypeVar("M", bound=BaseModel)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class EncodedJSONResponse(Response):
+    """
+    JSON response whose body is already encoded.
+    
+    Bodies come from pydantic-core's serializer (`model_dump_json`), which
+    skips FastAPI's jsonable_encoder pass and lets encoded fragments be
+    cached and concatenated.
+    """
+    media_type = "application/json"
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """Encode a single model to JSON bytes."""
+    with stage_timer("serialize"):
+        return model.model_dump_json().encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_type: type) -> TypeAdapter:
+    """Build (once per model type) the adapter used to encode lists."""
+    return TypeAdapter(List[model_type])
+
+
+def encode_models(models: List[M], model_type: type) -> bytes:
+    """Encode a list of models to a JSON array in one serializer call."""
+    with stage_timer("serialize"):
+        return _list_adapter(model_type).dump_json(models)
+
+
+def join_json_array(fragments: Iterable[bytes]) -> bytes:
+    """Assemble a JSON array from already-encoded element fragments."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client asked for a newline-delimited JSON stream."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(records: Iterable[bytes]) -> StreamingResponse:
+    """
+    Stream already-encoded records as newline-delimited JSON.
+    
+    Each record is sent as soon as it's produced. The body is left
+    uncompressed: the gzip middleware would hold records back until its
+    buffer fills.
+    """
+    def lines() -> Iterator[bytes]:
+        for record in records:
+            yield record + b"\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Encoding": "identity", "Vary": "Accept"},
+    )
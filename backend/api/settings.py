@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from ..models.settings import Settings, SettingsUpdate
 from ..services.settings_manager import get_settings_manager
+from ..services.executor import run_blocking
 
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -11,7 +12,7 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 async def get_settings() -> Settings:
     """Get current application settings."""
     manager = get_settings_manager()
-    return manager.get_settings()
+    return await run_blocking(manager.get_settings)
 
 
 @router.put("", response_model=Settings)
@@ -22,5 +23,5 @@ async def update_settings(update_data: SettingsUpdate) -> Settings:
     Only provided fields will be updated.
     """
     manager = get_settings_manager()
-    return manager.update_settings(update_data)
+    return await run_blocking(manager.update_settings, update_data)
 
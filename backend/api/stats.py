@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Query
+
+from ..models.stats import VaultStats
+from ..services.aggregates import get_aggregates
+from ..services.executor import run_blocking
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("", response_model=VaultStats)
+async def get_stats(
+    days: int = Query(30, ge=1, le=366, description="Days (ending today) of notes per day"),
+    weeks: int = Query(12, ge=1, le=104, description="ISO weeks (ending this week) of notes per week"),
+    top: int = Query(10, ge=1, le=100, description="Number of top attendees"),
+) -> VaultStats:
+    """
+    Get dashboard statistics: notes per day and week, top attendees, and
+    open vs. completed action items with the median time to complete.
+    
+    Served from aggregates kept up to date on every change, so the notes
+    and action items aren't scanned per request.
+    """
+    aggregates = get_aggregates()
+    stats = await run_blocking(aggregates.snapshot, days, weeks, top)
+    return VaultStats(**stats)
+
+
+@router.post("/rebuild", response_model=VaultStats)
+async def rebuild_stats() -> VaultStats:
+    """Recompute the statistics from every note and action item."""
+    aggregates = get_aggregates()
+    await run_blocking(aggregates.rebuild)
+    stats = await run_blocking(aggregates.snapshot)
+    return VaultStats(**stats)
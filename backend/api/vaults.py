@@ -0,0 +1,116 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config import Config
+from ..models.vault import VaultCreate, VaultInfo
+from ..services.executor import run_blocking
+from ..services.vaults import VaultClosingError, VaultNotFoundError, get_vault_registry, use_vault
+
+
+router = APIRouter(prefix="/vaults", tags=["vaults"])
+
+VAULT_HEADER = "x-vault"
+
+
+@router.get("", response_model=List[VaultInfo])
+async def list_vaults() -> List[VaultInfo]:
+    """List the default vault and all named vaults."""
+    vaults = await run_blocking(get_vault_registry().list_vaults)
+    return [VaultInfo(**vault) for vault in vaults]
+
+
+@router.post("", response_model=VaultInfo, status_code=201)
+async def create_vault(vault_data: VaultCreate) -> VaultInfo:
+    """Create an empty named vault."""
+    registry = get_vault_registry()
+    try:
+        await run_blocking(registry.create, vault_data.name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return VaultInfo(
+        name=vault_data.name,
+        notes_directory=str(registry.directory / vault_data.name / "notes"),
+        loaded=False,
+    )
+
+
+class VaultMiddleware:
+    """
+    Runs each API request against the vault it selects.
+    
+    A vault is selected with an `X-Vault` header or an `/api/vaults/<name>/`
+    path prefix, which is stripped before routing, so every endpoint serves
+    every vault. Requests without either use the default vault.
+    """
+    
+    def __init__(self, app: ASGIApp, api_prefix: str):
+        self.app = app
+        self.api_prefix = api_prefix
+        self.path_prefix = f"{api_prefix}/vaults/"
+    
+    def _select(self, scope: Scope) -> Optional[str]:
+        """Get the requested vault name, rewriting a path prefix away."""
+        path: str = scope["path"]
+        if path.startswith(self.path_prefix):
+            name, _, rest = path[len(self.path_prefix):].partition("/")
+            if name and rest:
+                scope["path"] = f"{self.api_prefix}/{rest}"
+                scope["raw_path"] = scope["path"].encode("utf-8")
+                return name
+        
+        for key, value in scope["headers"]:
+            if key == VAULT_HEADER.encode("latin-1"):
+                return value.decode("latin-1").strip() or None
+        return None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.api_prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        name = self._select(scope)
+        registry = get_vault_registry()
+        try:
+            try:
+                vault = registry.acquire(name, wait=False)
+            except VaultClosingError:
+                # Being unloaded: wait for its saves off the event loop, then reload
+                vault = await run_blocking(registry.acquire, name)
+        except ValueError as e:
+            await JSONResponse({"detail": str(e)}, status_code=400)(scope, receive, send)
+            return
+        except VaultNotFoundError as e:
+            await JSONResponse({"detail": str(e)}, status_code=404)(scope, receive, send)
+            return
+        
+        async def send_with_vary(message) -> None:
+            # The same URL serves different vaults depending on the header
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"vary", b"X-Vault")]
+            await send(message)
+        
+        try:
+            with use_vault(vault):
+                await self.app(scope, receive, send_with_vary)
+        finally:
+            registry.release(vault)
+        
+        # Checked when a load exceeded the vault count, otherwise at most every
+        # few seconds; the idle-unload task covers quiet periods
+        if name is not None and registry.needs_unload_check():
+            await run_blocking(registry.unload_excess)
+
+
+def add_vault_middleware(app: FastAPI, config: Config) -> None:
+    """
+    Install per-request vault selection.
+    
+    Args:
+        app: Application to install the middleware on
+        config: Application configuration
+    """
+    app.add_middleware(VaultMiddleware, api_prefix=config.api_prefix)
@@ -0,0 +1 @@
+# Service-layer benchmarks and synthetic vault generator
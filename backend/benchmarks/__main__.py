@@ -0,0 +1,53 @@
+"""
+Run the service-layer micro-benchmarks.
+
+Usage:
+    python -m backend.benchmarks
+    python -m backend.benchmarks --scales 1000,10000,100000 --output bench.json
+    python -m backend.benchmarks --compare previous.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from .micro import compare, results_document, run_scale
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Good Notes service layer")
+    parser.add_argument("--scales", default="1000,10000", help="Comma-separated vault sizes (notes)")
+    parser.add_argument("--days", type=int, default=None, help="Date directories per vault (default: ~8 notes/day)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic vault")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write JSON results")
+    parser.add_argument("--compare", default=None, help="Previous results file to compare against")
+    parser.add_argument("--workdir", default=None, help="Keep generated vaults in this directory")
+    
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    
+    results = []
+    with tempfile.TemporaryDirectory(prefix="goodnotes-bench-") as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        for scale in scales:
+            root = workdir / f"vault-{scale}"
+            if root.exists() and any(root.iterdir()):
+                print(f"{root} is not empty", file=sys.stderr)
+                return 1
+            results.extend(run_scale(root, scale, days=args.days, seed=args.seed))
+    
+    document = results_document(results, args.seed)
+    Path(args.output).write_text(json.dumps(document, indent=2), encoding="utf-8")
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        compare(document["results"], baseline["results"])
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
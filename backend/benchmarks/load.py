@@ -0,0 +1,353 @@
+"""
+HTTP load test for the Good Notes API.
+
+Seeds a synthetic vault, starts the real app (`create_app()`) under uvicorn
+on localhost in a separate process, and drives it with a weighted mix of
+realistic workloads from a pool of client threads.
+
+Usage:
+    python -m backend.benchmarks.load
+    python -m backend.benchmarks.load --notes 10000 --concurrency 32 --duration 60
+    python -m backend.benchmarks.load --mix dashboard=1,note_open=4,autosave=2
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .micro import environment_info
+from .vault import VaultSummary, generate_vault
+
+
+# Preset mixes: scenario name -> relative weight
+MIXES: Dict[str, Dict[str, int]] = {
+    "mixed": {"dashboard": 2, "note_list": 1, "note_open": 4, "autosave": 2, "toggle": 1},
+    "read-heavy": {"dashboard": 3, "note_list": 2, "note_open": 6},
+    "editing": {"note_open": 2, "autosave": 6, "toggle": 2},
+}
+
+
+class Client:
+    """Keep-alive HTTP client that records per-endpoint latencies."""
+    
+    def __init__(self, host: str, port: int, stats: "Stats"):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self._connection = http.client.HTTPConnection(host, port, timeout=30)
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        label: str,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Send a request and record its latency under `label`.
+        
+        Returns:
+            Decoded JSON body for successful responses, otherwise None
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        start = time.perf_counter()
+        try:
+            self._connection.request(method, path, body=payload, headers=headers)
+            response = self._connection.getresponse()
+            data = response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            # Reconnect so the next request starts from a clean connection
+            self._connection.close()
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            data, ok = b"", False
+        
+        self.stats.record(label, (time.perf_counter() - start) * 1000, ok)
+        if ok and data:
+            return json.loads(data)
+        return None
+    
+    def close(self) -> None:
+        self._connection.close()
+
+
+class Stats:
+    """Thread-safe latency and error collection per endpoint."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+    
+    def record(self, label: str, latency_ms: float, ok: bool) -> None:
+        with self._lock:
+            self._latencies[label].append(latency_ms)
+            if not ok:
+                self._errors[label] += 1
+    
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the collected samples.
+        
+        Args:
+            duration: Wall-clock length of the run in seconds
+        
+        Returns:
+            Per-endpoint (and "total") request count, throughput, error rate
+            and p50/p95/p99 latency in milliseconds
+        """
+        with self._lock:
+            latencies = {label: sorted(values) for label, values in self._latencies.items()}
+            errors = dict(self._errors)
+        
+        latencies["total"] = sorted(v for values in latencies.values() for v in values)
+        errors["total"] = sum(errors.values())
+        
+        summary = {}
+        for label, values in latencies.items():
+            if not values:
+                continue
+            summary[label] = {
+                "requests": len(values),
+                "rps": round(len(values) / duration, 2),
+                "error_rate": round(errors.get(label, 0) / len(values), 4),
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "p99_ms": round(_percentile(values, 99), 2),
+                "mean_ms": round(statistics.fmean(values), 2),
+            }
+        return summary
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+# --- Scenarios ---------------------------------------------------------------
+
+def dashboard(client: Client, rng: random.Random, vault: VaultSummary) -> None:
+    """Home page: today's and yesterday's notes plus open action items."""
+    client.request("GET", "/api/notes/today", "GET /api/notes/today")
+    client.request("GET", "/api/notes/yesterday", "GET /api/notes/yesterday")
+    client.request("GET", "/api/action-items/incomplete?limit=10", "GET /api/action-items/incomplete")
+
+
+def note_list(client: Client, rng: random.Random, vault: VaultSummary) -> None:
+    """Notes page: the full note list."""
+    client.request("GET", "/api/notes", "GET /api/notes")
+
+
+def note_open(client: Client, rng: random.Random, vault: VaultSummary) -> None:
+    """Open a single note."""
+    note_id = rng.choice(vault.note_ids)
+    client.request("GET", f"/api/notes/{note_id}", "GET /api/notes/{id}")
+
+
+def autosave(client: Client, rng: random.Random, vault: VaultSummary) -> None:
+    """Editor autosave: a few PUTs of growing content to the same note."""
+    note_id = rng.choice(vault.note_ids)
+    text = "Autosaved draft"
+    for _ in range(rng.randint(1, 3)):
+        text += f" {rng.randint(0, 10**6)}"
+        client.request("PUT", f"/api/notes/{note_id}", "PUT /api/notes/{id}", body={"content": f"<p>{text}</p>"})
+
+
+def toggle(client: Client, rng: random.Random, vault: VaultSummary) -> None:
+    """Tick or untick an action item."""
+    if not vault.action_item_ids:
+        return
+    item_id = rng.choice(vault.action_item_ids)
+    action = rng.choice(["complete", "uncomplete"])
+    client.request("POST", f"/api/action-items/{item_id}/{action}", f"POST /api/action-items/{{id}}/{action}")
+
+
+SCENARIOS: Dict[str, Callable[[Client, random.Random, VaultSummary], None]] = {
+    "dashboard": dashboard,
+    "note_list": note_list,
+    "note_open": note_open,
+    "autosave": autosave,
+    "toggle": toggle,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse a preset name or `scenario=weight,...` into scenario weights."""
+    if mix in MIXES:
+        return MIXES[mix]
+    
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+# --- Server ------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(root: Path, port: int, workers: int = 1) -> subprocess.Popen:
+    """Start uvicorn serving `create_app()` against the vault in `root`."""
+    env = {
+        **os.environ,
+        "GOODNOTES_NOTES_BASE_DIRECTORY": str(root / "notes"),
+        "GOODNOTES_NOTES_INDEX_FILE": str(root / "notes_index.yaml"),
+        "GOODNOTES_ACTION_ITEMS_FILE": str(root / "action_items.yaml"),
+        "GOODNOTES_SETTINGS_FILE": str(root / "settings.yaml"),
+    }
+    project_dir = Path(__file__).resolve().parents[2]
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.main:create_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=project_dir,
+        env=env,
+    )
+
+
+def wait_until_ready(port: int, timeout: float = 120) -> float:
+    """
+    Poll /ready until the app has finished warming up.
+    
+    Returns:
+        Seconds from the first poll until the app reported ready
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/ready")
+            if connection.getresponse().status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Server on port {port} not ready after {timeout}s")
+
+
+# --- Driver ------------------------------------------------------------------
+
+def run_load(
+    port: int,
+    vault: VaultSummary,
+    weights: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> Tuple[Stats, float]:
+    """
+    Drive the server with `concurrency` clients for `duration` seconds.
+    
+    Returns:
+        Tuple of (collected stats, actual wall-clock duration)
+    """
+    stats = Stats()
+    names = list(weights)
+    scenario_weights = [weights[name] for name in names]
+    deadline = time.perf_counter() + duration
+    
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        client = Client("127.0.0.1", port, stats)
+        try:
+            while time.perf_counter() < deadline:
+                scenario = rng.choices(names, weights=scenario_weights)[0]
+                SCENARIOS[scenario](client, rng, vault)
+        finally:
+            client.close()
+    
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - start
+
+
+def print_report(summary: Dict[str, Dict[str, float]]) -> None:
+    """Print the per-endpoint summary as a table."""
+    header = f"{'endpoint':<44} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for label in sorted(summary, key=lambda l: (l == "total", l)):
+        row = summary[label]
+        print(
+            f"{label:<44} {row['requests']:>7} {row['rps']:>8.1f} {row['error_rate'] * 100:>5.1f}% "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the Good Notes API")
+    parser.add_argument("--notes", type=int, default=2000, help="Notes in the seeded vault")
+    parser.add_argument("--days", type=int, default=None, help="Date directories in the vault")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the vault and the clients")
+    parser.add_argument("--mix", default="mixed", help=f"Preset ({', '.join(MIXES)}) or scenario=weight,...")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", default=None, help="Also write the report as JSON")
+    
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+    
+    with tempfile.TemporaryDirectory(prefix="goodnotes-load-") as tmp:
+        root = Path(tmp)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        vault = generate_vault(root, args.notes, days=args.days, seed=args.seed, base_date=today)
+        print(f"Seeded {vault.notes} notes and {vault.action_items} action items", file=sys.stderr)
+        
+        port = _free_port()
+        server = start_server(root, port, args.workers)
+        try:
+            ready_after = wait_until_ready(port)
+            print(f"Server ready after {ready_after:.2f}s; running {args.mix} for {args.duration:.0f}s", file=sys.stderr)
+            stats, elapsed = run_load(port, vault, weights, args.concurrency, args.duration, args.seed)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    
+    summary = stats.summary(elapsed)
+    print_report(summary)
+    
+    if args.output:
+        report = {
+            "environment": environment_info(),
+            "config": {**vars(args), "weights": weights},
+            "ready_after_s": round(ready_after, 3),
+            "duration_s": round(elapsed, 3),
+            "endpoints": summary,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .vault import VaultSummary, generate_vault
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark at one vault size (times are per operation)."""
+    name: str
+    scale: int
+    rounds: int
+    ops: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+
+
+def measure(
+    name: str,
+    scale: int,
+    func: Callable[[], Any],
+    ops: int = 1,
+    rounds: int = 5,
+) -> BenchmarkResult:
+    """
+    Time a callable over several rounds.
+    
+    Args:
+        name: Benchmark name
+        scale: Vault size the benchmark ran against
+        func: Callable performing `ops` operations per call
+        ops: Number of operations each call performs
+        rounds: Number of timed calls
+    
+    Returns:
+        Per-operation timing summary
+    """
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000 / ops)
+    
+    samples.sort()
+    p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+    return BenchmarkResult(
+        name=name,
+        scale=scale,
+        rounds=rounds,
+        ops=ops,
+        min_ms=round(samples[0], 4),
+        median_ms=round(statistics.median(samples), 4),
+        mean_ms=round(statistics.fmean(samples), 4),
+        p95_ms=round(samples[p95_index], 4),
+    )
+
+
+def use_vault(root: Path, write_buffer_window: float = 0) -> None:
+    """
+    Point the app configuration at a vault directory.
+    
+    Managers read the configuration when constructed, so create them after
+    calling this.
+    """
+    from ..config import get_config
+    
+    os.environ["GOODNOTES_NOTES_BASE_DIRECTORY"] = str(root / "notes")
+    os.environ["GOODNOTES_NOTES_INDEX_FILE"] = str(root / "notes_index.yaml")
+    os.environ["GOODNOTES_ACTION_ITEMS_FILE"] = str(root / "action_items.yaml")
+    os.environ["GOODNOTES_SETTINGS_FILE"] = str(root / "settings.yaml")
+    os.environ["GOODNOTES_NOTE_WRITE_BUFFER_WINDOW"] = str(write_buffer_window)
+    get_config.cache_clear()
+
+
+def run_scale(
+    root: Path,
+    scale: int,
+    days: Optional[int] = None,
+    seed: int = 42,
+    sample: int = 200,
+) -> List[BenchmarkResult]:
+    """
+    Generate a vault of the given size and run every benchmark against it.
+    
+    Args:
+        root: Empty directory for the vault
+        scale: Number of notes
+        days: Number of date directories (defaults to about eight notes per day)
+        seed: Random seed for the vault and the sampled IDs
+        sample: Number of records sampled for per-record lookups
+    
+    Returns:
+        Results for this scale
+    """
+    from ..models.note import NoteCreate
+    from ..services import markdown_converter as md
+    from ..services.action_items_manager import ActionItemsManager
+    from ..services.notes_manager import NotesManager
+    
+    results: List[BenchmarkResult] = []
+    # Whole-vault operations get fewer rounds on large vaults
+    heavy_rounds = 5 if scale <= 10_000 else 2
+    
+    start = time.perf_counter()
+    vault: VaultSummary = generate_vault(root, scale, days=days, seed=seed)
+    print(
+        f"[{scale}] generated {vault.notes} notes over {vault.days} days "
+        f"with {vault.action_items} action items in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+    
+    use_vault(root)
+    rng = random.Random(seed)
+    note_ids = rng.sample(vault.note_ids, min(sample, len(vault.note_ids)))
+    dates = rng.sample(vault.dates, min(20, len(vault.dates)))
+    
+    def record(result: BenchmarkResult) -> None:
+        results.append(result)
+        print(f"[{scale}] {result.name:<52} median {result.median_ms:>10.4f} ms/op", file=sys.stderr)
+    
+    # --- NotesManager ---------------------------------------------------
+    record(measure("notes.load_index", scale, lambda: NotesManager().warm_up(), rounds=heavy_rounds))
+    
+    notes_manager = NotesManager()
+    notes_manager.warm_up()
+    
+    def get_notes() -> None:
+        for note_id in note_ids:
+            notes_manager.get_note(note_id)
+    
+    def get_notes_by_date() -> None:
+        for date in dates:
+            notes_manager.get_notes_by_date(date)
+    
+    def rebuild_index() -> None:
+        with notes_manager._lock.write():
+            notes_manager._rebuild_index()
+    
+    record(measure("notes.get_note", scale, get_notes, ops=len(note_ids)))
+    record(measure("notes.get_all_notes", scale, notes_manager.get_all_notes, rounds=heavy_rounds))
+    record(measure("notes.get_notes_by_date", scale, get_notes_by_date, ops=len(dates)))
+    record(measure("notes._rebuild_index", scale, rebuild_index, rounds=heavy_rounds))
+    
+    # --- markdown_converter round trip ----------------------------------
+    notes = [note for note in (notes_manager.get_note(note_id) for note_id in note_ids) if note]
+    
+    def round_trip() -> None:
+        for note in notes:
+            text = md.note_to_markdown(
+                id=note.id,
+                title=note.title,
+                content=note.content,
+                created_at=note.created_at,
+                updated_at=note.updated_at,
+                attendees=note.attendees,
+                meeting_start_time=note.meeting_start_time,
+                version=note.version,
+            )
+            md.markdown_to_note(text)
+    
+    record(measure("markdown.round_trip", scale, round_trip, ops=len(notes)))
+    
+    # --- ActionItemsManager ---------------------------------------------
+    record(measure("action_items.load", scale, lambda: ActionItemsManager().warm_up(), rounds=heavy_rounds))
+    
+    items_manager = ActionItemsManager()
+    items_manager.warm_up()
+    all_items = items_manager.get_all_action_items()
+    item_ids = [item.id for item in rng.sample(all_items, min(sample, len(all_items)))]
+    id_lists = [notes_manager.get_action_item_ids(note_id) for note_id in note_ids]
+    
+    def get_items() -> None:
+        for item_id in item_ids:
+            items_manager.get_action_item(item_id)
+    
+    def get_items_by_ids() -> None:
+        for ids in id_lists:
+            items_manager.get_action_items_by_ids(ids)
+    
+    def get_items_by_note() -> None:
+        for note_id in note_ids:
+            items_manager.get_action_items_by_note(note_id)
+    
+    record(measure("action_items.get_action_item", scale, get_items, ops=max(1, len(item_ids))))
+    record(measure("action_items.get_action_items_by_ids", scale, get_items_by_ids, ops=len(id_lists)))
+    record(measure("action_items.get_action_items_by_note", scale, get_items_by_note, ops=len(note_ids)))
+    record(measure("action_items.get_all_action_items", scale, items_manager.get_all_action_items, rounds=heavy_rounds))
+    record(measure("action_items.get_incomplete_action_items", scale, items_manager.get_incomplete_action_items, rounds=heavy_rounds))
+    record(measure(
+        "action_items.get_incomplete_action_items[limit=10]",
+        scale,
+        lambda: items_manager.get_incomplete_action_items(limit=10),
+        rounds=heavy_rounds,
+    ))
+    
+    # --- Writes last, since they change the vault -------------------------
+    counter = iter(range(10**9))
+    creates = 20 if scale <= 10_000 else 5
+    
+    def create_notes() -> None:
+        for _ in range(creates):
+            notes_manager.create_note(NoteCreate(
+                title=f"Benchmark note {next(counter)}",
+                content="Created by the benchmark suite.",
+                attendees=["Alex Chen"],
+            ))
+    
+    record(measure("notes.create_note", scale, create_notes, ops=creates, rounds=heavy_rounds))
+    
+    notes_manager.shutdown()
+    return results
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine and commit the benchmarks ran on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]]) -> None:
+    """Print median changes relative to a baseline results file."""
+    previous = {(r["name"], r["scale"]): r for r in baseline}
+    
+    print(f"{'benchmark':<52} {'scale':>7} {'baseline':>11} {'current':>11} {'change':>8}")
+    for result in results:
+        before = previous.get((result["name"], result["scale"]))
+        if not before or not before["median_ms"]:
+            continue
+        change = (result["median_ms"] / before["median_ms"] - 1) * 100
+        print(
+            f"{result['name']:<52} {result['scale']:>7} "
+            f"{before['median_ms']:>11.4f} {result['median_ms']:>11.4f} {change:>+7.1f}%"
+        )
+
+
+def results_document(results: List[BenchmarkResult], seed: int) -> Dict[str, Any]:
+    """Build the JSON document written for a benchmark run."""
+    return {
+        "environment": environment_info(),
+        "seed": seed,
+        "results": [asdict(result) for result in results],
+    }
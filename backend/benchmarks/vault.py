@@ -0,0 +1,193 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..services import file_naming as naming
+from ..services import file_system as fs
+from ..services import markdown_converter as md
+
+
+# Fixed so that a given seed always produces the same vault
+BASE_DATE = datetime(2025, 1, 1)
+
+TOPICS = [
+    "Platform", "Billing", "Onboarding", "Search", "Mobile", "Payments",
+    "Infra", "Design", "Hiring", "Security", "Analytics", "Support",
+    "Roadmap", "Pricing", "Growth", "Data", "Release", "Partnerships",
+]
+
+MEETING_KINDS = [
+    "Sync", "Standup", "Retro", "Planning", "1:1", "Review", "Kickoff",
+    "Postmortem", "Brainstorm", "Check-in", "Demo", "Office Hours",
+]
+
+PEOPLE = [
+    "Alex Chen", "Priya Patel", "Sam Okafor", "Maria Garcia", "Jordan Lee",
+    "Fatima Khan", "Noah Williams", "Yuki Tanaka", "Lena Novak", "Omar Haddad",
+    "Chris Murphy", "Ana Souza", "Ivan Petrov", "Grace Kim", "Tom Becker",
+    "Zoe Martin", "Ravi Iyer", "Ella Brown", "Diego Ruiz", "Hana Sato",
+]
+
+WORDS = (
+    "we agreed to revisit the timeline after the next release and keep the "
+    "current scope for now the team raised concerns about latency in the "
+    "import path and asked for a follow up with numbers customers want "
+    "better export options and clearer error messages the migration is "
+    "mostly done but a few edge cases remain around time zones we should "
+    "document the decision and share it with the wider group budget is "
+    "fine for this quarter but hiring is behind plan the dashboard needs "
+    "a simpler default view and fewer filters on the first screen"
+).split()
+
+ACTIONS = [
+    "Follow up with", "Send notes to", "Draft proposal for", "Review PR from",
+    "Schedule a call with", "Update the doc for", "Share numbers with",
+    "Write up decision for", "Check the estimate with", "Unblock",
+]
+
+
+@dataclass
+class VaultSummary:
+    """Shape of a generated vault."""
+    notes: int
+    days: int
+    action_items: int
+    note_ids: List[str]
+    action_item_ids: List[str]
+    dates: List[datetime]
+
+
+def _sentence(rng: random.Random) -> str:
+    """Generate a plain-text sentence from the word pool."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def _body(rng: random.Random) -> str:
+    """Generate a realistic markdown note body (paragraphs, lists, headings)."""
+    parts: List[str] = []
+    for _ in range(rng.randint(1, 4)):
+        parts.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))))
+        
+        if rng.random() < 0.5:
+            parts.append("\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(2, 6))))
+        
+        if rng.random() < 0.25:
+            parts.append(f"### {rng.choice(TOPICS)} details")
+    
+    return "\n\n".join(parts)
+
+
+def generate_vault(
+    root: Path,
+    notes: int,
+    days: Optional[int] = None,
+    seed: int = 42,
+    max_action_items: int = 4,
+    completed_ratio: float = 0.6,
+    base_date: datetime = BASE_DATE,
+) -> VaultSummary:
+    """
+    Write a deterministic synthetic vault using the app's storage layout.
+    
+    Creates `root/notes/YYYYMMDD/*.md`, `root/notes_index.yaml` and
+    `root/action_items.yaml`, exactly as NotesManager and ActionItemsManager
+    would, so the managers can load it directly.
+    
+    Args:
+        root: Directory to create the vault in
+        notes: Number of notes (N)
+        days: Number of date directories to spread them over (M); defaults
+            to about eight notes per day
+        seed: Random seed; the same seed always produces the same vault
+        max_action_items: Maximum action items per note
+        completed_ratio: Fraction of action items that are completed
+        base_date: Most recent date directory; older ones count back from it
+    
+    Returns:
+        Summary of the generated vault
+    """
+    import yaml
+    
+    rng = random.Random(seed)
+    days = days or max(1, notes // 8)
+    notes_dir = root / "notes"
+    
+    index: Dict[str, str] = {}
+    items: List[Dict[str, Any]] = []
+    used_paths = set()
+    dates = [base_date - timedelta(days=d) for d in range(days)]
+    
+    for n in range(notes):
+        day = dates[n % days]
+        created_at = day + timedelta(hours=rng.randint(8, 18), minutes=rng.randint(0, 59), seconds=n % 60)
+        title = f"{rng.choice(TOPICS)} {rng.choice(MEETING_KINDS)}"
+        meeting_start_time = created_at if rng.random() < 0.7 else None
+        
+        # Disambiguate titles that would map to the same file
+        path = notes_dir / naming.generate_date_directory(created_at) / naming.generate_note_filename(title, meeting_start_time)
+        suffix = 2
+        base_title = title
+        while path in used_paths:
+            title = f"{base_title} {suffix}"
+            path = notes_dir / naming.generate_date_directory(created_at) / naming.generate_note_filename(title, meeting_start_time)
+            suffix += 1
+        used_paths.add(path)
+        
+        note_id = f"{naming.generate_note_id(title, created_at)}-{n}"
+        updated_at = created_at + timedelta(minutes=rng.randint(1, 120)) if rng.random() < 0.5 else None
+        attendees = rng.sample(PEOPLE, rng.randint(0, 6)) or None
+        
+        action_item_ids: List[str] = []
+        for _ in range(rng.randint(0, max_action_items)):
+            item_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            item_created = created_at + timedelta(minutes=rng.randint(0, 60))
+            completed = rng.random() < completed_ratio
+            completed_at = item_created + timedelta(hours=rng.randint(1, 240)) if completed else None
+            items.append({
+                "id": item_id,
+                "title": f"{rng.choice(ACTIONS)} {rng.choice(PEOPLE)}",
+                "note_id": note_id,
+                "created_at": item_created.isoformat(),
+                "updated_at": completed_at.isoformat() if completed_at else None,
+                "completed_at": completed_at.isoformat() if completed_at else None,
+                "completed": completed,
+                "version": 1,
+            })
+            action_item_ids.append(item_id)
+        
+        content = md.note_to_markdown(
+            id=note_id,
+            title=title,
+            content=_body(rng),
+            created_at=created_at,
+            updated_at=updated_at,
+            attendees=attendees,
+            meeting_start_time=meeting_start_time,
+            action_item_ids=action_item_ids,
+        )
+        fs.write_file(path, content)
+        index[note_id] = str(path)
+    
+    # Prefer the C dumper when available; this only affects generation speed
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    fs.write_file(
+        root / "notes_index.yaml",
+        yaml.dump({"notes": index, "updated_at": BASE_DATE.isoformat()}, Dumper=dumper, default_flow_style=False),
+    )
+    fs.write_file(
+        root / "action_items.yaml",
+        yaml.dump({"items": items, "updated_at": BASE_DATE.isoformat()}, Dumper=dumper, default_flow_style=False, sort_keys=False),
+    )
+    
+    return VaultSummary(
+        notes=notes,
+        days=days,
+        action_items=len(items),
+        note_ids=list(index),
+        action_item_ids=[item["id"] for item in items],
+        dates=dates,
+    )
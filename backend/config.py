@@ -16,9 +16,68 @@ class Config(BaseSettings):
     # Storage paths
     notes_base_directory: Path = Path.home() / "Documents" / "GoodNotes" / "notes"
     notes_index_file: Path = Path.home() / "Documents" / "GoodNotes" / "notes_index.yaml"
+    # Action items are stored as monthly shards in a directory named after
+    # this file (action_items/); an existing single file is migrated on load
     action_items_file: Path = Path.home() / "Documents" / "GoodNotes" / "action_items.yaml"
     settings_file: Path = Path.home() / "Documents" / "GoodNotes" / "settings.yaml"
     
+    # Date directories older than this many days are packed into monthly
+    # compressed archives (0 disables archiving); edited notes are unpacked
+    archive_after_days: int = 0
+    archive_directory: Path = Path.home() / "Documents" / "GoodNotes" / "archive"
+    
+    # Write-behind buffer for note saves (seconds; 0 writes through immediately)
+    note_write_buffer_window: float = 1.0
+    
+    # Several worker processes serve the same vault: writes take file locks in
+    # the coordination directory and workers reload state others changed
+    # (disables the note write-behind buffer)
+    multi_worker: bool = False
+    coordination_directory: Path = Path.home() / "Documents" / "GoodNotes" / ".coordination"
+    
+    # Named vaults (vaults_directory/<name>/), selected per request with an
+    # X-Vault header or an /api/vaults/<name>/ path prefix; at most
+    # max_loaded_vaults stay loaded within the memory budget, idle ones are unloaded
+    vaults_directory: Path = Path.home() / "Documents" / "GoodNotes" / "vaults"
+    max_loaded_vaults: int = 8
+    vault_memory_budget_mb: int = 512
+    vault_idle_seconds: float = 900
+    
+    # Thread pool for blocking file I/O and markdown conversion
+    worker_pool_size: int = 8
+    
+    # Pre-encoded response bodies kept in memory (0 disables the cache)
+    response_cache_entries: int = 4096
+    # Responses at least this large (bytes) are gzip-compressed
+    gzip_minimum_size: int = 4096
+    
+    # Number of recent changes kept for delta sync (/api/changes)
+    change_feed_size: int = 10000
+    
+    # Worker processes used to parse files during a bulk import (0 = CPU count)
+    import_workers: int = 0
+    
+    # Load the index, action items and settings and pre-render recent notes at startup
+    warmup_enabled: bool = True
+    
+    # Request/stage latency histograms and the Prometheus /metrics endpoint
+    metrics_enabled: bool = True
+    
+    # Per-request profiling: when enabled, requests sent with an `X-Profile: 1`
+    # header are profiled with cProfile and saved to the profiles directory
+    profiling_enabled: bool = False
+    profiles_directory: Path = Path.home() / "Documents" / "GoodNotes" / "profiles"
+    
+    # Requests slower than this (ms) are logged with their stage timings (0 disables)
+    slow_request_threshold_ms: float = 500
+    slow_request_log_file: Path = Path.home() / "Documents" / "GoodNotes" / "slow_requests.jsonl"
+    
+    # Span tracing of requests through the managers and file system, exported
+    # as JSON lines; trace_sample_rate is the fraction of requests traced
+    tracing_enabled: bool = False
+    trace_sample_rate: float = 1.0
+    trace_file: Path = Path.home() / "Documents" / "GoodNotes" / "traces.jsonl"
+    
     # Elasticsearch settings
     elasticsearch_url: str = "http://localhost:9200"
     elasticsearch_enabled: bool = False
@@ -0,0 +1,65 @@
+"""
+Bulk-import a folder or archive of markdown files into the notes vault.
+
+Usage:
+    python -m backend.import_notes ~/Downloads/old-notes
+    python -m backend.import_notes export.zip --dry-run
+    python -m backend.import_notes export.tar.gz --workers 4 --json report.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .config import get_config
+from .services.importer import import_notes
+
+
+def _print_progress(phase: str, done: int, total: int) -> None:
+    """Overwrite a single progress line on stderr."""
+    end = "\n" if done == total else ""
+    print(f"\r{phase:<6} {done}/{total}", end=end, file=sys.stderr, flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import markdown files as Good Notes notes")
+    parser.add_argument("source", help="Directory, .zip or .tar(.gz) archive")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be imported without writing")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--json", default=None, help="Also write the full report to this file")
+    
+    args = parser.parse_args()
+    source = Path(args.source).expanduser()
+    if not source.exists():
+        print(f"{source} not found", file=sys.stderr)
+        return 1
+    
+    get_config().ensure_directories()
+    try:
+        report = import_notes(source, dry_run=args.dry_run, workers=args.workers, progress=_print_progress)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    
+    verb = "Would import" if report["dry_run"] else "Imported"
+    print(
+        f"{verb} {len(report['notes'])} of {report['files']} files "
+        f"with {report['action_items']} action items in {report['duration_ms']:.0f} ms"
+    )
+    for error in report["errors"]:
+        print(f"  skipped {error['file']}: {error['error']}")
+    if args.dry_run:
+        for note in report["notes"][:20]:
+            print(f"  {note['file']} -> {note['path']}")
+        if len(report["notes"]) > 20:
+            print(f"  ... and {len(report['notes']) - 20} more")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
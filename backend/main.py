@@ -5,12 +5,33 @@ A desktop note-taking application backend that stores notes as markdown files
 and action items in a JSON file.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from .config import get_config
-from .api import notes, action_items, settings
+from .api import notes, action_items, settings, changes, export, metrics, stats, vaults
+from .api.diagnostics import add_diagnostics_middleware
+from .api.vaults import add_vault_middleware
+from .services.notes_manager import get_notes_manager
+from .services.action_items_manager import get_action_items_manager
+from .services.aggregates import get_aggregates
+from .services.similarity import get_similarity_index
+from .services.settings_manager import get_settings_manager
+from .services.executor import get_worker_pool, run_blocking, shutdown_worker_pool
+from .services.vaults import get_vault_registry
+from .services.warmup import WarmupTracker
+from .services import markdown_converter
+
+
+async def unload_idle_vaults(interval: float) -> None:
+    """Periodically unload named vaults that have been idle too long."""
+    while True:
+        await asyncio.sleep(interval)
+        await run_blocking(get_vault_registry().unload_excess)
 
 
 @asynccontextmanager
@@ -21,13 +42,48 @@ async def lifespan(app: FastAPI):
     config.ensure_directories()
     
     print(f"Good Notes API starting...")
-    print(f"Notes directory: {config.notes_base_directory}")
-    print(f"Action items file: {config.action_items_file}")
+    vault_config = get_vault_registry().default.config
+    print(f"Notes directory: {vault_config.notes_base_directory}")
+    print(f"Action items: {vault_config.action_items_file.with_suffix('')}")
+    
+    # Warm up storage and caches in the background so the first request
+    # doesn't pay for loading the index and action items
+    warmup = WarmupTracker()
+    app.state.warmup = warmup
+    warmup_task = None
+    if config.warmup_enabled:
+        warmup.add("notes_index", get_notes_manager().warm_up)
+        warmup.add("action_items", get_action_items_manager().warm_up)
+        warmup.add("settings", get_settings_manager().warm_up)
+        warmup.add("markdown", markdown_converter.preload)
+        warmup.add("stats", get_aggregates().warm_up, depends_on=["notes_index", "action_items"])
+        warmup.add("similarity", get_similarity_index().warm_up, depends_on=["notes_index"])
+        warmup.add(
+            "recent_notes",
+            notes.warm_recent_notes,
+            depends_on=["notes_index", "action_items"],
+        )
+        warmup_task = asyncio.create_task(warmup.run())
+    
+    # Pack old date directories in the background; reads keep working meanwhile
+    archive_task = None
+    if config.archive_after_days > 0:
+        archive_task = asyncio.create_task(run_blocking(get_notes_manager().archive_old_notes))
+    
+    # Named vaults are unloaded once idle, whether or not others are in use
+    vaults_task = asyncio.create_task(unload_idle_vaults(max(1.0, config.vault_idle_seconds / 4)))
     
     yield
     
-    # Shutdown
+    # Shutdown: write out any buffered note saves
     print("Good Notes API shutting down...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    if archive_task is not None and not archive_task.done():
+        archive_task.cancel()
+    vaults_task.cancel()
+    get_vault_registry().close_all()
+    shutdown_worker_pool()
 
 
 def create_app() -> FastAPI:
@@ -50,10 +106,25 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Compress large bodies (full note lists, action items)
+    app.add_middleware(GZipMiddleware, minimum_size=config.gzip_minimum_size)
+    
+    # Per-request vault selection (X-Vault header or /api/vaults/<name>/ prefix)
+    add_vault_middleware(app, config)
+    
+    # Request latency metrics, opt-in profiling and the slow-request log
+    add_diagnostics_middleware(app, config)
+    if config.metrics_enabled:
+        app.include_router(metrics.router)
+    
     # Include API routers
     app.include_router(notes.router, prefix=config.api_prefix)
     app.include_router(action_items.router, prefix=config.api_prefix)
     app.include_router(settings.router, prefix=config.api_prefix)
+    app.include_router(changes.router, prefix=config.api_prefix)
+    app.include_router(export.router, prefix=config.api_prefix)
+    app.include_router(stats.router, prefix=config.api_prefix)
+    app.include_router(vaults.router, prefix=config.api_prefix)
     
     @app.get("/")
     async def root():
@@ -67,7 +138,20 @@ def create_app() -> FastAPI:
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
-        return {"status": "healthy"}
+        return {
+            "status": "healthy",
+            "worker_pool": get_worker_pool().stats(),
+        }
+    
+    @app.get("/ready")
+    async def readiness_check():
+        """Readiness endpoint: 200 once startup warm-up has finished, 503 before."""
+        warmup = getattr(app.state, "warmup", None)
+        if warmup is None:
+            return JSONResponse({"ready": False, "components": {}}, status_code=503)
+        
+        report = warmup.report()
+        return JSONResponse(report, status_code=200 if report["ready"] else 503)
     
     return app
 
@@ -1,16 +1,24 @@
 # Pydantic models package
-from .note import Note, NoteCreate, NoteUpdate
+from .note import Note, NoteCreate, NoteUpdate, RelatedNote
 from .action_item import ActionItem, ActionItemCreate, ActionItemUpdate
 from .settings import Settings, SettingsUpdate
+from .changes import ChangeSet
+from .vault import VaultCreate, VaultInfo
+from .stats import VaultStats
 
 __all__ = [
     "Note",
     "NoteCreate", 
     "NoteUpdate",
+    "RelatedNote",
     "ActionItem",
     "ActionItemCreate",
     "ActionItemUpdate",
     "Settings",
     "SettingsUpdate",
+    "ChangeSet",
+    "VaultCreate",
+    "VaultInfo",
+    "VaultStats",
 ]
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -13,10 +13,17 @@ class ActionItemCreate(ActionItemBase):
     note_id: Optional[str] = Field(default=None, description="ID of the associated note")
 
 
+class NoteActionItem(ActionItemBase):
+    """Action item as sent with a note update; matched to existing items by ID, then title."""
+    id: Optional[str] = Field(default=None, description="ID of an existing action item of the note")
+    completed: Optional[bool] = Field(default=None, description="Whether the action item is completed (unchanged if omitted)")
+
+
 class ActionItemUpdate(BaseModel):
     """Model for updating an existing action item."""
     title: Optional[str] = Field(default=None, min_length=1, description="Action item title/description")
     completed: Optional[bool] = Field(default=None, description="Whether the action item is completed")
+    version: Optional[int] = Field(default=None, description="Version the update is based on; rejected if stale")
 
 
 class ActionItem(ActionItemBase):
@@ -27,7 +34,35 @@ class ActionItem(ActionItemBase):
     updated_at: Optional[datetime] = Field(default=None, description="Timestamp when action item was last updated")
     completed_at: Optional[datetime] = Field(default=None, description="Timestamp when action item was completed")
     completed: bool = Field(default=False, description="Whether the action item is completed")
+    version: int = Field(default=1, description="Incremented on every update for optimistic concurrency")
 
     class Config:
         from_attributes = True
 
+
+class BulkActionItemOperation(BaseModel):
+    """One operation of a bulk action item request."""
+    op: Literal["create", "update", "complete", "uncomplete", "delete"] = Field(..., description="Operation to apply")
+    id: Optional[str] = Field(default=None, description="Target action item ID (required for all but create)")
+    title: Optional[str] = Field(default=None, min_length=1, description="Title (required for create; optional for update)")
+    note_id: Optional[str] = Field(default=None, description="ID of the associated note (create only)")
+    completed: Optional[bool] = Field(default=None, description="Completion state (update only)")
+    version: Optional[int] = Field(default=None, description="Version the operation is based on; rejected if stale")
+
+
+class BulkActionItemRequest(BaseModel):
+    """Operations applied together: all succeed or none are applied."""
+    operations: List[BulkActionItemOperation] = Field(..., min_length=1, description="Operations, applied in order")
+
+
+class BulkActionItemResult(BaseModel):
+    """Outcome of one bulk operation."""
+    op: str = Field(..., description="Operation that was applied")
+    id: str = Field(..., description="ID of the affected action item")
+    item: Optional[ActionItem] = Field(default=None, description="Resulting action item (None for delete)")
+
+
+class BulkActionItemResponse(BaseModel):
+    """Results of a bulk request, one per operation in request order."""
+    results: List[BulkActionItemResult] = Field(default_factory=list, description="Per-operation results")
+
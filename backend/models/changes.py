@@ -0,0 +1,14 @@
+from typing import List
+from pydantic import BaseModel, Field
+from .note import Note
+from .action_item import ActionItem
+
+
+class ChangeSet(BaseModel):
+    """Records created, updated or deleted since a change sequence number."""
+    seq: int = Field(..., description="Sequence number to pass as `since` on the next sync")
+    reset: bool = Field(default=False, description="True if the client must refetch everything")
+    notes: List[Note] = Field(default_factory=list, description="Notes created or updated")
+    action_items: List[ActionItem] = Field(default_factory=list, description="Action items created or updated")
+    deleted_note_ids: List[str] = Field(default_factory=list, description="IDs of deleted notes")
+    deleted_action_item_ids: List[str] = Field(default_factory=list, description="IDs of deleted action items")
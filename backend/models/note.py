@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
-from .action_item import ActionItem, ActionItemCreate
+from .action_item import ActionItem, ActionItemCreate, NoteActionItem
 
 
 class NoteBase(BaseModel):
@@ -23,7 +23,14 @@ class NoteUpdate(BaseModel):
     attendees: Optional[List[str]] = Field(default=None, description="List of attendees")
     meeting_start_time: Optional[datetime] = Field(default=None, description="Meeting start time")
     content: Optional[str] = Field(default=None, description="Note content in markdown format")
-    action_items: Optional[List[ActionItemCreate]] = Field(default=None, description="Action items")
+    action_items: Optional[List[NoteActionItem]] = Field(default=None, description="Action items; replaces the note's action items, keeping matching ones")
+    version: Optional[int] = Field(default=None, description="Version the update is based on; rejected if stale")
+
+
+class NoteImportRequest(BaseModel):
+    """Request to import a folder or archive of markdown files."""
+    path: str = Field(..., min_length=1, description="Directory, .zip or .tar(.gz) archive on the server")
+    dry_run: bool = Field(default=False, description="Parse and plan the import without writing anything")
 
 
 class Note(NoteBase):
@@ -31,7 +38,17 @@ class Note(NoteBase):
     id: str = Field(..., description="Unique note identifier")
     created_at: datetime = Field(..., description="Timestamp when note was created")
     updated_at: Optional[datetime] = Field(default=None, description="Timestamp when note was last updated")
+    version: int = Field(default=1, description="Incremented on every update for optimistic concurrency")
     action_items: List[ActionItem] = Field(default_factory=list, description="Action items associated with the note")
 
     class Config:
         from_attributes = True
+
+
+class RelatedNote(BaseModel):
+    """A note similar to another one."""
+    id: str = Field(..., description="Unique note identifier")
+    title: str = Field(..., description="Note title")
+    attendees: Optional[List[str]] = Field(default=None, description="List of attendees")
+    created_at: datetime = Field(..., description="Timestamp when note was created")
+    score: float = Field(..., description="Cosine similarity of the notes' TF-IDF vectors (0-1)")
@@ -0,0 +1,41 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class DayCount(BaseModel):
+    """Notes created on one day."""
+    date: str = Field(..., description="Day (YYYY-MM-DD)")
+    count: int = Field(..., description="Notes created that day")
+
+
+class WeekCount(BaseModel):
+    """Notes created in one ISO week."""
+    week: str = Field(..., description="ISO week (YYYY-Www)")
+    start: str = Field(..., description="Monday of the week (YYYY-MM-DD)")
+    count: int = Field(..., description="Notes created that week")
+
+
+class AttendeeCount(BaseModel):
+    """An attendee and how many notes list them."""
+    name: str = Field(..., description="Attendee name")
+    notes: int = Field(..., description="Notes listing the attendee")
+
+
+class ActionItemStats(BaseModel):
+    """Action item counts and completion time."""
+    total: int = Field(..., description="All action items")
+    open: int = Field(..., description="Incomplete action items")
+    completed: int = Field(..., description="Completed action items")
+    median_hours_to_complete: Optional[float] = Field(
+        default=None,
+        description="Median time from creation to completion, in hours"
+    )
+
+
+class VaultStats(BaseModel):
+    """Dashboard statistics of a vault."""
+    notes: int = Field(..., description="All notes")
+    notes_per_day: List[DayCount] = Field(default_factory=list, description="Notes per day, oldest first")
+    notes_per_week: List[WeekCount] = Field(default_factory=list, description="Notes per ISO week, oldest first")
+    top_attendees: List[AttendeeCount] = Field(default_factory=list, description="Attendees in the most notes")
+    action_items: ActionItemStats
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class VaultCreate(BaseModel):
+    """Model for creating a named vault."""
+    name: str = Field(..., description="Vault name (letters, digits, '-' and '_')")
+
+
+class VaultInfo(BaseModel):
+    """A vault and its load state."""
+    name: str = Field(..., description="Vault name ('default' for the settings notes directory)")
+    notes_directory: str = Field(..., description="Directory holding the vault's markdown files")
+    loaded: bool = Field(..., description="Whether the vault is loaded in memory")
+    estimated_memory: int = Field(default=0, description="Approximate bytes held while loaded")
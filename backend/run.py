@@ -7,29 +7,110 @@ Usage:
     
 Or with custom host/port:
     python backend/run.py --host 0.0.0.0 --port 8080
+
+To see where startup time goes (and fail if it exceeds a budget):
+    python backend/run.py --profile-startup --import-budget-ms 400
 """
 
 import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, Tuple
+
 import uvicorn
 
 from config import get_config
 
 
+def measure_imports() -> Tuple[float, Dict[str, float]]:
+    """
+    Import the app in a fresh interpreter and collect `-X importtime` data.
+    
+    Returns:
+        Tuple of (total import time in ms, self time in ms per package)
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=project_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    
+    by_package: Dict[str, float] = defaultdict(float)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        # Break our own modules down further than third-party packages
+        parts = module.split(".")
+        package = ".".join(parts[:3]) if parts[0] == "backend" else parts[0]
+        by_package[package] += int(self_us) / 1000
+        if module == "backend.main":
+            total_us = int(cumulative_us)
+    
+    return total_us / 1000, dict(by_package)
+
+
+def profile_startup(budget_ms: float = 0, top: int = 20) -> int:
+    """
+    Print an import-time breakdown of the backend.
+    
+    Args:
+        budget_ms: Fail if importing the app takes longer than this (0 = no budget)
+        top: Number of packages to list
+    
+    Returns:
+        Process exit code (1 if the budget was exceeded)
+    """
+    total_ms, by_package = measure_imports()
+    
+    print(f"{'package':<40} {'ms':>9} {'share':>7}")
+    for package, ms in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        share = ms / total_ms * 100 if total_ms else 0
+        print(f"{package:<40} {ms:>9.1f} {share:>6.1f}%")
+    print(f"{'total (import backend.main)':<40} {total_ms:>9.1f}")
+    
+    if budget_ms and total_ms > budget_ms:
+        print(f"Startup import time {total_ms:.1f} ms exceeds budget of {budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run the Good Notes API server")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import-time breakdown of the app and exit",
+    )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=0,
+        help="With --profile-startup, exit non-zero if importing the app takes longer",
+    )
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        sys.exit(profile_startup(args.import_budget_ms))
+    
     # Ensure directories exist
     config = get_config()
     config.ensure_directories()
     
     print(f"Starting Good Notes API server...")
     print(f"Notes directory: {config.notes_base_directory}")
-    print(f"Action items file: {config.action_items_file}")
+    print(f"Action items: {config.action_items_file.with_suffix('')}")
     print(f"API URL: http://{args.host}:{args.port}")
     print()
     
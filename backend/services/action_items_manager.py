@@ -1,63 +1,498 @@
+import re
+import threading
+import time
 import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-import yaml
-
-from ..config import get_config
-from ..models.action_item import ActionItem, ActionItemCreate, ActionItemUpdate
+from ..config import Config, get_config
+from ..models.action_item import (
+    ActionItem,
+    ActionItemCreate,
+    ActionItemUpdate,
+    BulkActionItemOperation,
+    BulkActionItemResult,
+    NoteActionItem,
+)
 from . import file_system as fs
+from .aggregates import get_aggregates
+from .concurrency import ReadWriteLock, VersionConflictError
+from .change_feed import get_change_feed
+from .coordination import get_coordinator, shared_write
+from .metrics import stage_timer
+from .tracing import traced
+from .vaults import current_vault
+
+
+# Rough in-memory cost of one stored item dict
+ITEM_BYTES = 1000
+
+# Shard holding every incomplete item, and the file listing shard sizes
+HOT_SHARD = "incomplete"
+MANIFEST_FILE = "manifest.yaml"
+
+# Note IDs start with their creation timestamp (YYYYMMDD-HHMMSS)
+NOTE_ID_PATTERN = re.compile(r"^(\d{6})\d{2}-\d{6}")
+
+
+def _note_month(note_id: str) -> Optional[str]:
+    """Month shard a note was created in, which its action items can't predate."""
+    match = NOTE_ID_PATTERN.match(note_id)
+    return match.group(1) if match else None
+
+
+class BulkOperationError(Exception):
+    """Raised when any operation of a bulk request is invalid; none are applied."""
+    
+    def __init__(self, errors: List[Dict[str, Any]], conflict: bool = False):
+        self.errors = errors
+        # True if any operation was rejected because of a stale version
+        self.conflict = conflict
+        super().__init__(f"{len(errors)} of the bulk operations failed; nothing was applied")
+
+
+@dataclass
+class _StagedChanges:
+    """Upserts and deletes applied in memory but not yet saved."""
+    upserts: List[ActionItem]
+    # Stored state each touched item had before (None if it didn't exist)
+    previous: Dict[str, Optional[Dict[str, Any]]]
+    deleted: List[str]
 
 
 class ActionItemsManager:
     """
-    Service for managing action items with YAML file storage.
+    Service for managing action items with sharded YAML file storage.
+    
+    Items are stored in YAML shards in a directory next to the configured
+    action items file (`action_items.yaml` -> `action_items/`):
+    - `incomplete.yaml`: the hot shard, every incomplete item
+    - `YYYYMM.yaml`: completed items, by the month they were created
+    - `manifest.yaml`: item count of every shard
+    
+    An item's shard follows from its own fields, so an item is always in
+    the hot shard or in its creation month's shard. Shards are loaded on
+    first use: incomplete items and recent months serve most requests, and
+    old completed months are only read when a query needs them. A change
+    rewrites only the shards it touched (plus the small manifest). A legacy
+    single-file `action_items.yaml` is split into shards on first load.
     
-    All action items are stored in a single YAML file for simplicity,
-    efficient querying (filtering, sorting), and human readability.
+    Reads share a reader/writer lock so they never block each other, while
+    mutations take it exclusively. Each item carries a version, and updates
+    based on a stale version raise VersionConflictError.
+    
+    With several workers (`multi_worker`), mutations hold the shared
+    action items lock and reads drop the loaded shards when another
+    worker's change bumped the shared generation.
     """
     
-    def __init__(self):
-        self.config = get_config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or get_config()
         self.storage_file = self.config.action_items_file
+        self.shard_directory = self.storage_file.with_suffix("")
+        # Every loaded item by ID, and the loaded shards' items by shard name
         self._items: Dict[str, Dict[str, Any]] = {}
+        self._shards: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Item count of every shard on disk, and shards changed since the last save
+        self._shard_counts: Dict[str, int] = {}
+        self._dirty_shards: Set[str] = set()
         self._loaded = False
+        self._lock = ReadWriteLock()
+        # Bumped on every mutation (for validators)
+        self._generation = 0
+        self._save_lock = threading.Lock()
+        # Per-process epoch so HTTP validators never repeat across restarts
+        self._epoch = f"{time.time_ns():x}"
+        self._last_modified = time.time()
+        # Per-note validators: generation and time of the last change to each
+        # note's items, and the generation/time of the last load for the rest
+        self._note_changes: Dict[str, Tuple[int, float]] = {}
+        self._loaded_generation = 0
+        self._loaded_at = self._last_modified
+        # Cross-process coordination and the shared generation last loaded
+        self._coordinator = get_coordinator()
+        self._seen_generation = 0
+        self._change_feed = get_change_feed()
+        self._aggregates = get_aggregates()
     
     def _ensure_loaded(self) -> None:
-        """Load action items from disk if not already loaded."""
-        if not self._loaded:
-            self._load_from_disk()
-            self._loaded = True
+        """Load the manifest and hot shard if not loaded or changed by another worker."""
+        if self._loaded and not self._coordinator.is_stale("action_items", self._seen_generation):
+            return
+        
+        with self._lock.write():
+            generation = self._coordinator.generation("action_items")
+            if not self._loaded or generation != self._seen_generation:
+                self._seen_generation = generation
+                self._load_from_disk()
+                self._loaded = True
+                self._mark_changed()
+                self._note_changes.clear()
+                self._loaded_generation = self._generation
+                self._loaded_at = self._last_modified
+    
+    @contextmanager
+    def _shared_write(self) -> Iterator[None]:
+        """
+        Hold the cross-process action items lock around a mutation.
+        
+        Items changed by another worker are reloaded first; if the mutation
+        changed anything, the shared generation is bumped afterwards.
+        """
+        with self._coordinator.exclusive("action_items"):
+            self._ensure_loaded()
+            generation = self._generation
+            try:
+                yield
+            finally:
+                if self._generation != generation:
+                    self._seen_generation = self._coordinator.bump("action_items")
+    
+    def warm_up(self) -> int:
+        """
+        Load the hot shard of incomplete items ahead of the first request.
+        
+        Returns:
+            Number of loaded action items
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            return len(self._items)
+    
+    @staticmethod
+    def _shard_name(data: Dict[str, Any]) -> str:
+        """Shard a stored item belongs in: the hot shard, or its creation month."""
+        if not data.get("completed", False):
+            return HOT_SHARD
+        created_at = data.get("created_at")
+        if isinstance(created_at, datetime):
+            return created_at.strftime("%Y%m")
+        if isinstance(created_at, str) and len(created_at) >= 7:
+            return created_at[:4] + created_at[5:7]
+        return "undated"
+    
+    def _shard_path(self, name: str) -> Path:
+        return self.shard_directory / f"{name}.yaml"
     
+    @traced()
     def _load_from_disk(self) -> None:
-        """Load action items from the YAML file."""
+        """
+        Drop loaded items and read the manifest and hot shard (write lock held).
+        
+        Splits a legacy single-file store into shards the first time.
+        """
+        import yaml
+        
         self._items.clear()
+        self._shards.clear()
+        self._shard_counts.clear()
+        self._dirty_shards.clear()
+        
+        manifest_path = self.shard_directory / MANIFEST_FILE
+        if fs.file_exists(manifest_path):
+            try:
+                data = yaml.safe_load(fs.read_file(manifest_path))
+                self._shard_counts.update(data.get("shards") or {})
+            except Exception:
+                # Recount from the shard files below
+                pass
+        
+        if not self._shard_counts and fs.directory_exists(self.shard_directory):
+            # Manifest missing or unreadable: count by loading every shard
+            for path in sorted(self.shard_directory.glob("*.yaml")):
+                if path.name != MANIFEST_FILE:
+                    self._shard_counts[path.stem] = 0
+                    self._load_shard(path.stem)
+            self._dirty_shards.add(HOT_SHARD)
+        
+        # Still there if a previous migration was interrupted
+        if fs.file_exists(self.storage_file):
+            self._migrate_legacy_file()
+        
+        self._load_shard(HOT_SHARD)
+    
+    def _read_shard(self, path: Path) -> List[Dict[str, Any]]:
+        """Read the items of a YAML file (a shard or the legacy file)."""
+        import yaml
+        
+        try:
+            content = fs.read_file(path)
+            with stage_timer("yaml_load"):
+                data = yaml.safe_load(content)
+        except FileNotFoundError:
+            return []
+        except Exception:
+            # Treat an unreadable file as empty
+            return []
         
-        if not fs.file_exists(self.storage_file):
+        if isinstance(data, dict) and isinstance(data.get("items"), list):
+            return [item for item in data["items"] if isinstance(item, dict) and "id" in item]
+        return []
+    
+    @traced()
+    def _load_shard(self, name: str) -> None:
+        """Load one shard into memory if it isn't loaded (write lock held)."""
+        if name in self._shards:
+            return
+        
+        shard: Dict[str, Dict[str, Any]] = {}
+        self._shards[name] = shard
+        if name not in self._shard_counts:
+            # Not on disk yet
             return
+            
+        for data in self._read_shard(self._shard_path(name)):
+            item_id = data["id"]
+            existing = self._items.get(item_id)
+            if existing is not None:
+                # Left in two shards by an interrupted move: keep the newer copy
+                if existing.get("version", 1) >= data.get("version", 1):
+                    self._dirty_shards.add(name)
+                    continue
+                other = self._shard_name(existing)
+                self._shards.get(other, {}).pop(item_id, None)
+                self._dirty_shards.add(other)
+            shard[item_id] = data
+            self._items[item_id] = data
+        self._shard_counts[name] = len(shard)
+    
+    def _migrate_legacy_file(self) -> None:
+        """Split the single-file store into shards and save them (write lock held)."""
+        for name in list(self._shard_counts):
+            self._load_shard(name)
+        for data in self._read_shard(self.storage_file):
+            self._put(data)
+        self._write_dirty_shards()
+        self.storage_file.rename(self.storage_file.with_suffix(".yaml.migrated"))
+        self._aggregates.invalidate()
+    
+    def _ensure_shards(self, names: Iterable[str]) -> None:
+        """Load the given shards if they aren't loaded yet."""
+        self._ensure_loaded()
+        with self._lock.read():
+            missing = [name for name in names if name not in self._shards]
+        if missing:
+            with self._lock.write():
+                for name in missing:
+                    self._load_shard(name)
+    
+    def _unloaded_month_shards(self) -> List[str]:
+        """Month shards on disk but not in memory, newest first."""
+        with self._lock.read():
+            return sorted(
+                (name for name in self._shard_counts if name not in self._shards),
+                reverse=True,
+            )
+    
+    def _ensure_all_loaded(self) -> None:
+        """Load every shard (for queries over all items)."""
+        self._ensure_loaded()
+        self._ensure_shards(self._unloaded_month_shards())
+    
+    def _ensure_items(self, item_ids: Iterable[str], note_id: Optional[str] = None) -> None:
+        """
+        Load shards, newest month first, until the given items are in memory.
         
+        Args:
+            item_ids: Items to look up (IDs that don't exist load every candidate shard)
+            note_id: Owning note, if known; its items are never older than the note
+        """
+        self._ensure_loaded()
+        with self._lock.read():
+            missing = {item_id for item_id in item_ids if item_id not in self._items}
+        if not missing:
+            return
+        
+        since = _note_month(note_id) if note_id else None
+        for name in self._unloaded_month_shards():
+            if since is not None and name < since:
+                break
+            self._ensure_shards([name])
+            with self._lock.read():
+                missing = {item_id for item_id in missing if item_id not in self._items}
+            if not missing:
+                return
+    
+    def _ensure_note_loaded(self, note_id: str) -> None:
+        """Load every shard that can hold items of a note."""
+        self._ensure_loaded()
+        since = _note_month(note_id)
+        self._ensure_shards([
+            name for name in self._unloaded_month_shards()
+            if since is None or name >= since
+        ])
+    
+    def _put(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Store an item in its shard, moving it if its shard changed (write lock held).
+        
+        Every stored change goes through `_put` or `_remove`, which also
+        update the vault's aggregates.
+        
+        Returns:
+            The item's previous stored state, or None if it is new
+        """
+        item_id = data["id"]
+        shard = self._shard_name(data)
+        # The item can only be in the hot shard or its month's shard
+        self._load_shard(HOT_SHARD)
+        self._load_shard(self._shard_name({**data, "completed": True}))
+        
+        previous = self._items.get(item_id)
+        if previous is not None:
+            previous_shard = self._shard_name(previous)
+            self._shards[previous_shard].pop(item_id, None)
+            self._dirty_shards.add(previous_shard)
+        
+        self._shards[shard][item_id] = data
+        self._items[item_id] = data
+        self._dirty_shards.add(shard)
+        self._aggregates.item_changed(previous, data)
+        self._note_items_changed(previous, data)
+        return previous
+    
+    def _remove(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a loaded item from its shard (write lock held)."""
+        data = self._items.pop(item_id, None)
+        if data is not None:
+            shard = self._shard_name(data)
+            self._shards[shard].pop(item_id, None)
+            self._dirty_shards.add(shard)
+            self._aggregates.item_changed(data, None)
+            self._note_items_changed(data)
+        return data
+    
+    def _note_items_changed(self, *items: Optional[Dict[str, Any]]) -> None:
+        """Record a change to the items of the items' notes (write lock held)."""
+        # Every change is followed by `_mark_changed`; record the generation
+        # it will reach, so it is above anything recorded or loaded before
+        change = (self._generation + 1, time.time())
+        for data in items:
+            if data is not None and data.get("note_id"):
+                self._note_changes[data["note_id"]] = change
+    
+    def _mark_changed(self) -> None:
+        """Record a mutation of the items (write lock held)."""
+        self._generation += 1
+        self._last_modified = time.time()
+    
+    def get_validator(self) -> Tuple[str, float]:
+        """
+        Get a cheap validator for the action items collection.
+        
+        Returns:
+            Tuple of (change token, last modification time as Unix timestamp)
+        """
+        if self._coordinator.enabled:
+            return self._coordinator.validator("action_items")
+        with self._lock.read():
+            return f"{self._epoch}-{self._generation}", self._last_modified
+    
+    def get_note_validator(self, note_id: str) -> Tuple[str, float]:
+        """
+        Get a cheap validator for the action items of one note.
+        
+        Changes to other notes' items leave it unchanged. With several
+        workers, other workers' changes are only visible collection-wide,
+        so this is the collection validator.
+        
+        Args:
+            note_id: The note's unique identifier
+        
+        Returns:
+            Tuple of (change token, last modification time as Unix timestamp)
+        """
+        if self._coordinator.enabled:
+            return self.get_validator()
+        self._ensure_loaded()
+        with self._lock.read():
+            generation, modified = self._note_changes.get(
+                note_id, (self._loaded_generation, self._loaded_at)
+            )
+            return f"{self._epoch}-{generation}", modified
+    
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by the loaded items (loads nothing)."""
+        with self._lock.read():
+            return len(self._items) * ITEM_BYTES
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get action item counts without loading old shards.
+        
+        Returns:
+            Total, completed and incomplete item counts, and shards loaded and on disk
+        """
+        self._ensure_loaded()
+        
+        with self._lock.read():
+            counts = dict(self._shard_counts)
+            counts.update({name: len(shard) for name, shard in self._shards.items()})
+            loaded = len(self._shards)
+        incomplete = counts.get(HOT_SHARD, 0)
+        total = sum(counts.values())
+        return {
+            "total": total,
+            "completed": total - incomplete,
+            "incomplete": incomplete,
+            "shards": len([name for name, count in counts.items() if count]),
+            "shards_loaded": loaded,
+        }
+    
+    def get_storage_files(self) -> List[Path]:
+        """Get the shard files and manifest currently on disk."""
+        if not fs.directory_exists(self.shard_directory):
+            return []
+        return sorted(self.shard_directory.glob("*.yaml"))
+    
+    def _write_dirty_shards(self) -> None:
+        """Write changed shards and the manifest (write lock held)."""
+        import yaml
+        
+        dirty, self._dirty_shards = self._dirty_shards, set()
+        written: List[str] = []
         try:
-            content = fs.read_file(self.storage_file)
-            data = yaml.safe_load(content)
+            # Sorted, so a moved item lands in its month shard before it leaves the hot one
+            for name in sorted(dirty):
+                items = list(self._shards.get(name, {}).values())
+                if items:
+                    data = {"items": items, "updated_at": datetime.now().isoformat()}
+                    with stage_timer("yaml_dump"):
+                        content = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+                    fs.write_file(self._shard_path(name), content)
+                    self._shard_counts[name] = len(items)
+                else:
+                    fs.delete_file(self._shard_path(name))
+                    self._shard_counts.pop(name, None)
+                written.append(name)
             
-            if isinstance(data, dict) and "items" in data:
-                for item_data in data["items"]:
-                    if "id" in item_data:
-                        self._items[item_data["id"]] = item_data
+            manifest = {
+                "shards": dict(sorted(self._shard_counts.items())),
+                "updated_at": datetime.now().isoformat(),
+            }
+            fs.write_file(
+                self.shard_directory / MANIFEST_FILE,
+                yaml.dump(manifest, default_flow_style=False, sort_keys=False),
+            )
         except Exception:
-            # Start with empty items if file can't be read
-            pass
+            self._dirty_shards |= dirty
+            raise
     
+    @traced()
     def _save_to_disk(self) -> None:
-        """Save all action items to the YAML file."""
-        data = {
-            "items": list(self._items.values()),
-            "updated_at": datetime.now().isoformat(),
-        }
+        """
+        Save the shards changed since the last save.
         
-        content = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
-        fs.write_file(self.storage_file, content)
+        Shards are small, so they are written under the write lock; the save
+        lock keeps concurrent savers from interleaving.
+        """
+        with self._save_lock:
+            with self._lock.write():
+                if self._dirty_shards:
+                    self._write_dirty_shards()
     
     def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Serialize an action item for storage."""
@@ -94,8 +529,11 @@ class ActionItemsManager:
             updated_at=updated_at,
             completed_at=completed_at,
             completed=data.get("completed", False),
+            version=data.get("version", 1),
         )
     
+    @traced()
+    @shared_write
     def create_action_item(self, item_data: ActionItemCreate) -> ActionItem:
         """
         Create a new action item.
@@ -119,48 +557,315 @@ class ActionItemsManager:
             completed=False,
         )
         
-        self._items[item_id] = self._serialize_item(item.model_dump())
-        self._save_to_disk()
+        with self._lock.write():
+            self._put(self._serialize_item(item.model_dump()))
+            self._mark_changed()
         
+        self._save_to_disk()
+        self._change_feed.record("action_item", item_id, "created")
         return item
     
-    def create_action_items_batch(
-        self, 
+    def new_action_items(
+        self,
         items_data: List[ActionItemCreate],
         note_id: Optional[str] = None
     ) -> List[ActionItem]:
         """
-        Create multiple action items at once.
+        Build action items with freshly allocated IDs without storing them.
         
         Args:
             items_data: List of action item creation data
             note_id: Optional note ID to associate with all items
             
         Returns:
-            List of created action items
+            List of new, unsaved action items
         """
-        self._ensure_loaded()
-        
         now = datetime.now()
-        created_items: List[ActionItem] = []
-        
-        for item_data in items_data:
-            item_id = str(uuid.uuid4())
-            
-            item = ActionItem(
-                id=item_id,
+        return [
+            ActionItem(
+                id=str(uuid.uuid4()),
                 title=item_data.title,
                 note_id=note_id or item_data.note_id,
                 created_at=now,
                 completed=False,
             )
+            for item_data in items_data
+        ]
+    
+    def _stage_changes(
+        self,
+        upserts: Iterable[ActionItem],
+        deletes: Iterable[str]
+    ) -> _StagedChanges:
+        """
+        Apply upserts and deletes in memory, remembering what they replaced.
+        
+        Must be called with the write lock held; `_persist_changes` saves them.
+        """
+        staged = _StagedChanges(upserts=list(upserts), previous={}, deleted=[])
+        for item in staged.upserts:
+            previous = self._put(self._serialize_item(item.model_dump()))
+            staged.previous.setdefault(item.id, previous)
+        for item_id in deletes:
+            if item_id in self._items and item_id not in staged.previous:
+                staged.previous[item_id] = self._remove(item_id)
+                staged.deleted.append(item_id)
+        if staged.previous:
+            self._mark_changed()
+        return staged
+    
+    def _persist_changes(self, staged: _StagedChanges) -> None:
+        """
+        Save staged changes with a single write and publish them.
+        
+        If the write fails, the in-memory items are restored to their previous
+        state and the error is re-raised, so the change is all-or-nothing.
+        """
+        if not staged.previous:
+            return
+        
+        try:
+            self._save_to_disk()
+        except Exception:
+            with self._lock.write():
+                for item_id, data in staged.previous.items():
+                    if data is None:
+                        self._remove(item_id)
+                    else:
+                        self._put(data)
+                self._mark_changed()
+            raise
+        
+        feed = self._change_feed
+        for item in staged.upserts:
+            op = "created" if staged.previous[item.id] is None else "updated"
+            feed.record("action_item", item.id, op)
+        for item_id in staged.deleted:
+            feed.record("action_item", item_id, "deleted")
+    
+    @traced()
+    @shared_write
+    def apply_changes(
+        self,
+        upserts: Iterable[ActionItem] = (),
+        deletes: Iterable[str] = ()
+    ) -> None:
+        """
+        Store and delete several action items with a single write to disk.
+        
+        The change is all-or-nothing: if the write fails, the in-memory items
+        are restored and the error is re-raised.
+        
+        Args:
+            upserts: Action items to create or replace
+            deletes: IDs of action items to delete (unknown IDs are ignored)
+        """
+        deletes = list(deletes)
+        self._ensure_items(deletes)
+        
+        with self._lock.write():
+            staged = self._stage_changes(upserts, deletes)
+        self._persist_changes(staged)
+    
+    @traced()
+    @shared_write
+    def reconcile_note_action_items(
+        self,
+        note_id: str,
+        items_data: List[NoteActionItem]
+    ) -> List[ActionItem]:
+        """
+        Make a note's action items match a submitted list with minimal changes.
+        
+        Each submitted item is matched to an existing item of the note by ID,
+        or else by title. Matched items keep their ID, timestamps and
+        completion state, and are only updated if their title or completion
+        changed; unmatched submissions are created and unmatched existing items
+        deleted. All changes are saved with one write, and none if nothing
+        changed.
+        
+        Args:
+            note_id: The note's unique identifier
+            items_data: The note's action items, in order
+            
+        Returns:
+            The note's action items, in submitted order
+        """
+        self._ensure_note_loaded(note_id)
+        now = datetime.now()
+        
+        with self._lock.write():
+            existing = sorted(
+                (data for data in self._items.values() if data.get("note_id") == note_id),
+                key=lambda data: str(data.get("created_at", "")),
+            )
+            unmatched = {data["id"]: data for data in existing}
+        
+            # Match by ID first so a title match can't claim an item sent by ID
+            matches: List[Optional[Dict[str, Any]]] = [
+                unmatched.pop(item.id, None) if item.id else None
+                for item in items_data
+            ]
+            for index, item in enumerate(items_data):
+                if matches[index] is None:
+                    for item_id, data in unmatched.items():
+                        if data.get("title") == item.title:
+                            matches[index] = unmatched.pop(item_id)
+                            break
+        
+            result: List[ActionItem] = []
+            upserts: List[ActionItem] = []
+            for item, data in zip(items_data, matches):
+                if data is None:
+                    new_item = ActionItem(
+                        id=str(uuid.uuid4()),
+                        title=item.title,
+                        note_id=note_id,
+                        created_at=now,
+                        completed=bool(item.completed),
+                        completed_at=now if item.completed else None,
+                    )
+                    upserts.append(new_item)
+                    result.append(new_item)
+                    continue
+                
+                current = self._deserialize_item(data)
+                changes: Dict[str, Any] = {}
+                if item.title != current.title:
+                    changes["title"] = item.title
+                if item.completed is not None and item.completed != current.completed:
+                    changes["completed"] = item.completed
+                    changes["completed_at"] = now if item.completed else None
+                if changes:
+                    current = current.model_copy(
+                        update={**changes, "updated_at": now, "version": current.version + 1}
+                    )
+                    upserts.append(current)
+                result.append(current)
             
-            self._items[item_id] = self._serialize_item(item.model_dump())
-            created_items.append(item)
+            staged = self._stage_changes(upserts, list(unmatched))
         
-        self._save_to_disk()
+        self._persist_changes(staged)
+        return result
+    
+    @traced()
+    @shared_write
+    def apply_bulk_operations(
+        self,
+        operations: List[BulkActionItemOperation]
+    ) -> List[BulkActionItemResult]:
+        """
+        Validate and apply a list of operations atomically, with one write.
+        
+        Operations run in order against the state left by the earlier ones, so
+        an item may for example be completed and then deleted. If any operation
+        is invalid nothing is applied.
+        
+        Args:
+            operations: Create/update/complete/uncomplete/delete operations
+            
+        Returns:
+            One result per operation, in order
+            
+        Raises:
+            BulkOperationError: If any operation is invalid or based on a stale version
+        """
+        self._ensure_items(operation.id for operation in operations if operation.id)
+        now = datetime.now()
+        results: List[BulkActionItemResult] = []
+        errors: List[Dict[str, Any]] = []
+        conflict = False
+        
+        with self._lock.write():
+            # Working state of touched items (None once deleted)
+            working: Dict[str, Optional[ActionItem]] = {}
+            
+            def current(item_id: str) -> Optional[ActionItem]:
+                if item_id in working:
+                    return working[item_id]
+                data = self._items.get(item_id)
+                return self._deserialize_item(data) if data else None
+            
+            for index, operation in enumerate(operations):
+                if operation.op == "create":
+                    if not operation.title:
+                        errors.append({"index": index, "error": "title is required"})
+                        continue
+                    item = ActionItem(
+                        id=str(uuid.uuid4()),
+                        title=operation.title,
+                        note_id=operation.note_id,
+                        created_at=now,
+                        completed=False,
+                    )
+                    working[item.id] = item
+                    results.append(BulkActionItemResult(op=operation.op, id=item.id, item=item))
+                    continue
+                
+                item = current(operation.id) if operation.id else None
+                if item is None:
+                    message = "id is required" if not operation.id else "action item not found"
+                    errors.append({"index": index, "id": operation.id, "error": message})
+                    continue
+                
+                if operation.version is not None and operation.version != item.version:
+                    conflict = True
+                    errors.append({
+                        "index": index,
+                        "id": item.id,
+                        "error": str(VersionConflictError("Action item", item.id, operation.version, item.version)),
+                    })
+                    continue
+                
+                if operation.op == "delete":
+                    working[item.id] = None
+                    results.append(BulkActionItemResult(op=operation.op, id=item.id))
+                    continue
+                
+                changes: Dict[str, Any] = {"updated_at": now, "version": item.version + 1}
+                completed = {"complete": True, "uncomplete": False}.get(operation.op, operation.completed)
+                if operation.op == "update" and operation.title is not None:
+                    changes["title"] = operation.title
+                if completed is not None:
+                    changes["completed"] = completed
+                    changes["completed_at"] = now if completed else None
+                
+                item = item.model_copy(update=changes)
+                working[item.id] = item
+                results.append(BulkActionItemResult(op=operation.op, id=item.id, item=item))
+            
+            if errors:
+                raise BulkOperationError(errors, conflict=conflict)
+            
+            staged = self._stage_changes(
+                [item for item in working.values() if item is not None],
+                [item_id for item_id, item in working.items() if item is None],
+            )
+        
+        self._persist_changes(staged)
+        return results
+    
+    @traced()
+    def create_action_items_batch(
+        self, 
+        items_data: List[ActionItemCreate],
+        note_id: Optional[str] = None
+    ) -> List[ActionItem]:
+        """
+        Create multiple action items at once.
+        
+        Args:
+            items_data: List of action item creation data
+            note_id: Optional note ID to associate with all items
+            
+        Returns:
+            List of created action items
+        """
+        created_items = self.new_action_items(items_data, note_id=note_id)
+        self.apply_changes(upserts=created_items)
         return created_items
     
+    @traced()
     def get_action_item(self, item_id: str) -> Optional[ActionItem]:
         """
         Get an action item by ID.
@@ -171,14 +876,16 @@ class ActionItemsManager:
         Returns:
             The action item if found, None otherwise
         """
-        self._ensure_loaded()
+        self._ensure_items([item_id])
         
-        item_data = self._items.get(item_id)
-        if not item_data:
-            return None
+        with self._lock.read():
+            item_data = self._items.get(item_id)
+            if not item_data:
+                return None
         
-        return self._deserialize_item(item_data)
+            return self._deserialize_item(item_data)
     
+    @traced()
     def get_all_action_items(self) -> List[ActionItem]:
         """
         Get all action items.
@@ -186,12 +893,14 @@ class ActionItemsManager:
         Returns:
             List of all action items, sorted by created_at descending
         """
-        self._ensure_loaded()
+        self._ensure_all_loaded()
         
-        items = [self._deserialize_item(data) for data in self._items.values()]
+        with self._lock.read(), stage_timer("model_build"):
+            items = [self._deserialize_item(data) for data in self._items.values()]
         items.sort(key=lambda i: i.created_at, reverse=True)
         return items
     
+    @traced()
     def get_action_items_by_note(self, note_id: str) -> List[ActionItem]:
         """
         Get all action items for a specific note.
@@ -202,20 +911,72 @@ class ActionItemsManager:
         Returns:
             List of action items associated with the note
         """
-        self._ensure_loaded()
+        self._ensure_note_loaded(note_id)
         
-        items = [
-            self._deserialize_item(data)
-            for data in self._items.values()
-            if data.get("note_id") == note_id
-        ]
+        with self._lock.read(), stage_timer("model_build"):
+            items = [
+                self._deserialize_item(data)
+                for data in self._items.values()
+                if data.get("note_id") == note_id
+            ]
         items.sort(key=lambda i: i.created_at)
         return items
     
+    def iter_action_items(
+        self,
+        note_id: Optional[str] = None,
+        incomplete_only: bool = False,
+        newest_first: bool = False,
+        limit: Optional[int] = None
+    ) -> Iterator[ActionItem]:
+        """
+        Yield action items one at a time, for streaming responses.
+        
+        Only references to the stored items are taken up front (to filter and
+        sort them); each item is built when it is reached. Incomplete items
+        come from the hot shard alone, and a note's from the months since it
+        was created.
+        
+        Args:
+            note_id: Only items of this note
+            incomplete_only: Only incomplete items
+            newest_first: Sort by created_at descending instead of ascending
+            limit: Optional limit on number of items
+        
+        Yields:
+            Matching action items in created_at order
+        """
+        if incomplete_only:
+            self._ensure_loaded()
+        elif note_id is not None:
+            self._ensure_note_loaded(note_id)
+        else:
+            self._ensure_all_loaded()
+        
+        with self._lock.read():
+            candidates = self._shards.get(HOT_SHARD, {}) if incomplete_only else self._items
+            selected = [
+                data
+                for data in candidates.values()
+                if note_id is None or data.get("note_id") == note_id
+            ]
+        
+        # Stored timestamps are ISO strings, which sort chronologically
+        selected.sort(key=lambda data: str(data.get("created_at", "")), reverse=newest_first)
+        if limit:
+            selected = selected[:limit]
+        
+        for data in selected:
+            # Updates replace stored items rather than modifying them
+            yield self._deserialize_item(data)
+    
+    @traced()
     def get_incomplete_action_items(self, limit: Optional[int] = None) -> List[ActionItem]:
         """
         Get incomplete action items, ordered by oldest first.
         
+        Only the hot shard is read; completed items are never loaded.
+        
         Args:
             limit: Optional limit on number of items to return
             
@@ -224,11 +985,11 @@ class ActionItemsManager:
         """
         self._ensure_loaded()
         
-        items = [
-            self._deserialize_item(data)
-            for data in self._items.values()
-            if not data.get("completed", False)
-        ]
+        with self._lock.read(), stage_timer("model_build"):
+            items = [
+                self._deserialize_item(data)
+                for data in self._shards.get(HOT_SHARD, {}).values()
+            ]
         
         # Sort by created_at ascending (oldest first)
         items.sort(key=lambda i: i.created_at)
@@ -238,6 +999,8 @@ class ActionItemsManager:
         
         return items
     
+    @traced()
+    @shared_write
     def update_action_item(
         self, 
         item_id: str, 
@@ -252,31 +1015,47 @@ class ActionItemsManager:
             
         Returns:
             The updated action item if found, None otherwise
+            
+        Raises:
+            VersionConflictError: If update_data.version is set and stale
         """
-        self._ensure_loaded()
+        self._ensure_items([item_id])
         
-        if item_id not in self._items:
-            return None
+        with self._lock.write():
+            if item_id not in self._items:
+                return None
         
-        existing = self._items[item_id]
-        now = datetime.now()
+            # Replaced rather than modified, since completion may move it to another shard
+            existing = dict(self._items[item_id])
+            current_version = existing.get("version", 1)
+            if update_data.version is not None and update_data.version != current_version:
+                raise VersionConflictError("Action item", item_id, update_data.version, current_version)
         
-        # Update fields
-        if update_data.title is not None:
-            existing["title"] = update_data.title
+            now = datetime.now()
         
-        if update_data.completed is not None:
-            existing["completed"] = update_data.completed
-            if update_data.completed:
-                existing["completed_at"] = now.isoformat()
-            else:
-                existing["completed_at"] = None
+            # Update fields
+            if update_data.title is not None:
+                existing["title"] = update_data.title
         
-        existing["updated_at"] = now.isoformat()
+            if update_data.completed is not None:
+                existing["completed"] = update_data.completed
+                if update_data.completed:
+                    existing["completed_at"] = now.isoformat()
+                else:
+                    existing["completed_at"] = None
+            
+            existing["updated_at"] = now.isoformat()
+            existing["version"] = current_version + 1
+            self._put(existing)
+            self._mark_changed()
+            
+            item = self._deserialize_item(existing)
         
         self._save_to_disk()
-        return self._deserialize_item(existing)
+        self._change_feed.record("action_item", item_id, "updated")
+        return item
     
+    @traced()
     def complete_action_item(self, item_id: str) -> Optional[ActionItem]:
         """
         Mark an action item as complete.
@@ -292,6 +1071,7 @@ class ActionItemsManager:
             ActionItemUpdate(completed=True)
         )
     
+    @traced()
     def uncomplete_action_item(self, item_id: str) -> Optional[ActionItem]:
         """
         Mark an action item as incomplete.
@@ -307,6 +1087,8 @@ class ActionItemsManager:
             ActionItemUpdate(completed=False)
         )
     
+    @traced()
+    @shared_write
     def delete_action_item(self, item_id: str) -> bool:
         """
         Delete an action item.
@@ -317,15 +1099,21 @@ class ActionItemsManager:
         Returns:
             True if item was deleted, False if not found
         """
-        self._ensure_loaded()
+        self._ensure_items([item_id])
+        
+        with self._lock.write():
+            if item_id not in self._items:
+                return False
         
-        if item_id not in self._items:
-            return False
+            self._remove(item_id)
+            self._mark_changed()
         
-        del self._items[item_id]
         self._save_to_disk()
+        self._change_feed.record("action_item", item_id, "deleted")
         return True
     
+    @traced()
+    @shared_write
     def delete_action_items_by_note(self, note_id: str) -> int:
         """
         Delete all action items associated with a note.
@@ -336,50 +1124,56 @@ class ActionItemsManager:
         Returns:
             Number of items deleted
         """
-        self._ensure_loaded()
+        self._ensure_note_loaded(note_id)
         
-        to_delete = [
-            item_id
-            for item_id, data in self._items.items()
-            if data.get("note_id") == note_id
-        ]
+        with self._lock.write():
+            to_delete = [
+                item_id
+                for item_id, data in self._items.items()
+                if data.get("note_id") == note_id
+            ]
         
-        for item_id in to_delete:
-            del self._items[item_id]
+            for item_id in to_delete:
+                self._remove(item_id)
+            
+            if to_delete:
+                self._mark_changed()
         
         if to_delete:
             self._save_to_disk()
+            for item_id in to_delete:
+                self._change_feed.record("action_item", item_id, "deleted")
         
         return len(to_delete)
     
-    def get_action_items_by_ids(self, item_ids: List[str]) -> List[ActionItem]:
+    @traced()
+    def get_action_items_by_ids(
+        self,
+        item_ids: List[str],
+        note_id: Optional[str] = None
+    ) -> List[ActionItem]:
         """
         Get action items by a list of IDs.
         
         Args:
             item_ids: List of action item IDs
+            note_id: The items' note, if known (limits the shards searched)
             
         Returns:
             List of found action items (in order of IDs)
         """
-        self._ensure_loaded()
+        self._ensure_items(item_ids, note_id)
         
         items: List[ActionItem] = []
-        for item_id in item_ids:
-            item_data = self._items.get(item_id)
-            if item_data:
-                items.append(self._deserialize_item(item_data))
+        with self._lock.read():
+            for item_id in item_ids:
+                item_data = self._items.get(item_id)
+                if item_data:
+                    items.append(self._deserialize_item(item_data))
         
         return items
 
 
-# Singleton instance
-_action_items_manager: Optional[ActionItemsManager] = None
-
-
 def get_action_items_manager() -> ActionItemsManager:
-    """Get the singleton ActionItemsManager instance."""
-    global _action_items_manager
-    if _action_items_manager is None:
-        _action_items_manager = ActionItemsManager()
-    return _action_items_manager
+    """Get the ActionItemsManager of the current vault."""
+    return current_vault().service("action_items_manager", ActionItemsManager)
@@ -0,0 +1,353 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import Config
+from . import file_system as fs
+from .derived_state import DerivedState
+from .metrics import stage_timer
+from .vaults import current_vault
+
+
+# Rough in-memory cost of one note's entry (ID, day and attendees)
+NOTE_ENTRY_BYTES = 200
+
+FILE_VERSION = 1
+
+
+def _day(created_at: Any) -> str:
+    """Day (YYYY-MM-DD) of a datetime or stored ISO timestamp."""
+    if isinstance(created_at, datetime):
+        return created_at.date().isoformat()
+    return str(created_at)[:10]
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Unix timestamp of a datetime or stored ISO timestamp."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp() if isinstance(value, datetime) else None
+
+
+def _attendee_names(attendees: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Distinct, non-empty attendee names of a note, in order."""
+    return tuple(dict.fromkeys(name.strip() for name in attendees or () if name and name.strip()))
+
+
+def _item_state(data: Optional[Dict[str, Any]]) -> Optional[Tuple[bool, Optional[int]]]:
+    """
+    What a stored action item contributes to the aggregates.
+    
+    Returns:
+        (completed, minutes from creation to completion), or None for no item
+    """
+    if data is None:
+        return None
+    if not data.get("completed", False):
+        return (False, None)
+    
+    created = _timestamp(data.get("created_at"))
+    completed = _timestamp(data.get("completed_at"))
+    if created is None or completed is None:
+        return (True, None)
+    return (True, max(0, int((completed - created) // 60)))
+
+
+def _adjust(counter: Counter, key: Any, delta: int) -> None:
+    """Add to a count, dropping keys that reach zero."""
+    count = counter[key] + delta
+    if count > 0:
+        counter[key] = count
+    else:
+        del counter[key]
+
+
+class Aggregates(DerivedState):
+    """
+    Dashboard statistics of a vault, kept up to date as records change.
+    
+    Tracks notes per day, how many notes each attendee was in, open and
+    completed action items and the time each completed item took. Note and
+    action item mutations report the before/after state of the record they
+    changed, so every update costs O(1) (O(attendees) for notes) instead of
+    a scan of the vault.
+    
+    Saved to `stats.yaml` (see DerivedState); full rebuilds count with
+    vectorized NumPy passes.
+    """
+    
+    storage_name = "stats.yaml"
+    
+    def __init__(self, config: Config):
+        super().__init__(config)
+        # Day and attendees of every note, so deletes and edits can be undone
+        self._notes: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self._notes_per_day: Counter = Counter()
+        self._attendees: Counter = Counter()
+        self._open_items = 0
+        self._completed_items = 0
+        # Completed items by whole minutes from creation to completion
+        self._completion_minutes: Counter = Counter()
+    
+    def _load(self, path: Path) -> bool:
+        import yaml
+        
+        with stage_timer("yaml_load"):
+            data = yaml.safe_load(fs.read_file(path))
+        if data.get("version") != FILE_VERSION:
+            return False
+            
+        self._notes = {
+            note_id: (entry[0], tuple(entry[1:]))
+            for note_id, entry in (data.get("notes") or {}).items()
+        }
+        self._notes_per_day = Counter(data.get("notes_per_day") or {})
+        self._attendees = Counter(data.get("attendees") or {})
+        self._open_items = int(data.get("open_items", 0))
+        self._completed_items = int(data.get("completed_items", 0))
+        self._completion_minutes = Counter(data.get("completion_minutes") or {})
+        return True
+    
+    def _save_payload(self) -> Dict[str, Any]:
+        return {
+            "version": FILE_VERSION,
+            "notes": {
+                note_id: [day, *attendees]
+                for note_id, (day, attendees) in self._notes.items()
+            },
+            "notes_per_day": dict(self._notes_per_day),
+            "attendees": dict(self._attendees),
+            "open_items": self._open_items,
+            "completed_items": self._completed_items,
+            "completion_minutes": dict(self._completion_minutes),
+            "updated_at": datetime.now().isoformat(),
+        }
+        
+    def _write(self, path: Path, payload: Dict[str, Any]) -> None:
+        import yaml
+        
+        with stage_timer("yaml_dump"):
+            content = yaml.dump(payload, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        fs.write_file(path, content)
+    
+    def note_saved(
+        self,
+        note_id: str,
+        created_at: datetime,
+        attendees: Optional[Iterable[str]]
+    ) -> None:
+        """
+        Record a created or updated note.
+        
+        Args:
+            note_id: The note's unique identifier
+            created_at: When the note was created
+            attendees: The note's attendees
+        """
+        entry = (_day(created_at), _attendee_names(attendees))
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._notes.get(note_id)
+            if previous == entry:
+                return
+            
+            if not self._stale:
+                self._notes[note_id] = entry
+                self._apply_note(previous, -1)
+                self._apply_note(entry, 1)
+            self._mark_changed()
+    
+    def note_deleted(self, note_id: str) -> None:
+        """Record a deleted note."""
+        with self._lock:
+            self._ensure_loaded()
+            if not self._stale:
+                previous = self._notes.pop(note_id, None)
+                if previous is None:
+                    return
+                self._apply_note(previous, -1)
+            self._mark_changed()
+    
+    def _apply_note(self, entry: Optional[Tuple[str, Tuple[str, ...]]], delta: int) -> None:
+        if entry is None:
+            return
+        day, attendees = entry
+        _adjust(self._notes_per_day, day, delta)
+        for name in attendees:
+            _adjust(self._attendees, name, delta)
+    
+    def item_changed(
+        self,
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Record a created, updated or deleted action item.
+        
+        Args:
+            previous: The item's stored state before the change (None if created)
+            current: The item's stored state after the change (None if deleted)
+        """
+        before, after = _item_state(previous), _item_state(current)
+        if before == after:
+            return
+        
+        with self._lock:
+            self._ensure_loaded()
+            if not self._stale:
+                self._apply_item(before, -1)
+                self._apply_item(after, 1)
+            self._mark_changed()
+    
+    def _apply_item(self, state: Optional[Tuple[bool, Optional[int]]], delta: int) -> None:
+        if state is None:
+            return
+        completed, minutes = state
+        if not completed:
+            self._open_items += delta
+            return
+        self._completed_items += delta
+        if minutes is not None:
+            _adjust(self._completion_minutes, minutes, delta)
+    
+    def _collect(self) -> Tuple[Dict[str, Tuple[str, Tuple[str, ...]]], Tuple[Any, ...]]:
+        from .action_items_manager import get_action_items_manager
+        from .notes_manager import get_notes_manager
+        
+        notes_manager = get_notes_manager()
+        notes: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        for note_id in notes_manager.get_note_ids():
+            note = notes_manager.get_note(note_id)
+            if note is not None:
+                notes[note_id] = (_day(note.created_at), _attendee_names(note.attendees))
+        items = list(get_action_items_manager().iter_action_items())
+        
+        with stage_timer("stats_rebuild"):
+            return notes, self._compute(notes, items)
+            
+    def _install(self, state: Tuple[Dict[str, Tuple[str, Tuple[str, ...]]], Tuple[Any, ...]]) -> None:
+        self._notes, (
+            self._notes_per_day,
+            self._attendees,
+            self._open_items,
+            self._completed_items,
+            self._completion_minutes,
+        ) = state
+    
+    @staticmethod
+    def _compute(
+        notes: Dict[str, Tuple[str, Tuple[str, ...]]],
+        items: List[Any]
+    ) -> Tuple[Counter, Counter, int, int, Counter]:
+        """Count notes per day and attendee and summarize action items with NumPy."""
+        import numpy as np
+        
+        def counts(values: List[Any]) -> Counter:
+            if not values:
+                return Counter()
+            keys, totals = np.unique(np.array(values), return_counts=True)
+            return Counter(dict(zip(keys.tolist(), totals.tolist())))
+        
+        notes_per_day = counts([day for day, _ in notes.values()])
+        attendees = counts([name for _, names in notes.values() for name in names])
+        
+        completed = np.fromiter((item.completed for item in items), dtype=bool, count=len(items))
+        timed = [item for item in items if item.completed and item.completed_at]
+        created = np.fromiter((item.created_at.timestamp() for item in timed), dtype=np.float64, count=len(timed))
+        finished = np.fromiter((item.completed_at.timestamp() for item in timed), dtype=np.float64, count=len(timed))
+        minutes = np.maximum((finished - created) // 60, 0).astype(np.int64)
+        
+        completed_count = int(completed.sum())
+        return (
+            notes_per_day,
+            attendees,
+            len(items) - completed_count,
+            completed_count,
+            counts(minutes.tolist()),
+        )
+    
+    def snapshot(self, days: int = 30, weeks: int = 12, top: int = 10) -> Dict[str, Any]:
+        """
+        Get the dashboard statistics, rebuilding first if needed (blocking).
+        
+        Args:
+            days: Number of days (ending today) to count notes for
+            weeks: Number of ISO weeks (ending this week) to count notes for
+            top: Number of attendees to list
+        
+        Returns:
+            Note counts per day and week, top attendees and action item counts
+            with the median time to complete
+        """
+        self.refresh()
+        
+        today = date.today()
+        with self._lock:
+            per_day = [
+                {"date": day.isoformat(), "count": self._notes_per_day.get(day.isoformat(), 0)}
+                for day in (today - timedelta(days=offset) for offset in range(days - 1, -1, -1))
+            ]
+            
+            this_week = today - timedelta(days=today.weekday())
+            per_week = []
+            for offset in range(weeks - 1, -1, -1):
+                start = this_week - timedelta(weeks=offset)
+                year, week, _ = start.isocalendar()
+                count = sum(
+                    self._notes_per_day.get((start + timedelta(days=n)).isoformat(), 0)
+                    for n in range(7)
+                )
+                per_week.append({"week": f"{year}-W{week:02d}", "start": start.isoformat(), "count": count})
+            
+            # Alphabetical among equal counts, so the order is stable
+            attendees = sorted(self._attendees.items(), key=lambda entry: (-entry[1], entry[0]))[:top]
+            
+            stats = {
+                "notes": len(self._notes),
+                "notes_per_day": per_day,
+                "notes_per_week": per_week,
+                "top_attendees": [{"name": name, "notes": count} for name, count in attendees],
+                "action_items": {
+                    "total": self._open_items + self._completed_items,
+                    "open": self._open_items,
+                    "completed": self._completed_items,
+                    "median_hours_to_complete": self._median_hours(),
+                },
+            }
+        return stats
+    
+    def _median_hours(self) -> Optional[float]:
+        """Median completion time of the completed items, in hours (lock held)."""
+        if not self._completion_minutes:
+            return None
+        
+        import numpy as np
+        
+        minutes = np.array(sorted(self._completion_minutes), dtype=np.int64)
+        cumulative = np.cumsum([self._completion_minutes[m] for m in minutes.tolist()])
+        total = int(cumulative[-1])
+        # Values at the two middle ranks (the same rank if the count is odd)
+        lower, upper = minutes[np.searchsorted(cumulative, [(total + 1) // 2, total // 2 + 1])]
+        return round(float(lower + upper) / 2 / 60, 2)
+    
+    def warm_up(self) -> int:
+        """
+        Load the saved aggregates, or rebuild them if there are none.
+        
+        Returns:
+            Number of counted notes
+        """
+        self.refresh()
+        with self._lock:
+            return len(self._notes)
+    
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by the per-note entries (loads nothing)."""
+        with self._lock:
+            return len(self._notes) * NOTE_ENTRY_BYTES
+    
+
+def get_aggregates() -> Aggregates:
+    """Get the Aggregates of the current vault."""
+    return current_vault().service("aggregates", Aggregates)
@@ -0,0 +1,318 @@
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import file_system as fs
+from .coordination import get_coordinator
+from .vaults import current_vault
+
+
+# Pack layout: magic, zlib-compressed entries back to back, JSON offset table,
+# then a fixed footer holding the table's offset
+PACK_MAGIC = b"GNPACK1\n"
+PACK_FOOTER = struct.Struct("<Q8s")
+PACK_FOOTER_MAGIC = b"GNPKEND\n"
+
+
+class PackEntry(NamedTuple):
+    """Location and metadata of one archived note file."""
+    offset: int
+    length: int
+    # Uncompressed size and modification time of the original file
+    size: int
+    mtime_ns: int
+    note_id: str
+
+
+class ArchiveStore:
+    """
+    Cold storage for old notes: one compressed pack per month.
+    
+    A pack holds every archived note file of its month, each compressed on
+    its own, followed by an offset table, so a single note is read with one
+    seek and one decompress. Files are keyed by their path relative to the
+    notes directory; callers keep using the original paths.
+    
+    Packs are immutable on disk: adding or removing files rewrites the month's
+    pack to a temporary file and swaps it in, copying untouched entries
+    without recompressing them. With several workers, rewrites hold the
+    shared archive lock and the offset tables are re-read once another
+    worker has changed a pack.
+    """
+    
+    def __init__(self, directory: Path, notes_directory: Path):
+        self.directory = directory
+        self.notes_directory = notes_directory
+        # relative path -> (month, entry)
+        self._entries: Dict[str, Tuple[str, PackEntry]] = {}
+        # month -> (inode, mtime_ns) of the pack file the entries came from
+        self._pack_ids: Dict[str, Tuple[int, int]] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._coordinator = get_coordinator()
+        self._seen_generation = 0
+    
+    def _pack_path(self, month: str) -> Path:
+        return self.directory / f"{month}.pack"
+    
+    def _key(self, path: Path) -> Optional[str]:
+        """Archive key for a note path, or None if it isn't under the notes directory."""
+        try:
+            return path.relative_to(self.notes_directory).as_posix()
+        except ValueError:
+            return None
+    
+    def _ensure_loaded(self) -> None:
+        """Read the offset tables of all packs (again if another worker changed them)."""
+        if self._loaded and not self._coordinator.is_stale("archive", self._seen_generation):
+            return
+        
+        with self._lock:
+            generation = self._coordinator.generation("archive")
+            if self._loaded and generation == self._seen_generation:
+                return
+            self._seen_generation = generation
+            entries: Dict[str, Tuple[str, PackEntry]] = {}
+            pack_ids: Dict[str, Tuple[int, int]] = {}
+            if self.directory.exists():
+                for pack_path in sorted(self.directory.glob("*.pack")):
+                    month = pack_path.stem
+                    try:
+                        table, pack_ids[month] = self._read_table(pack_path)
+                    except FileNotFoundError:
+                        # Removed by another worker since listing
+                        continue
+                    for key, entry in table.items():
+                        entries[key] = (month, entry)
+            self._entries, self._pack_ids = entries, pack_ids
+            self._loaded = True
+    
+    @staticmethod
+    def _read_table(pack_path: Path) -> Tuple[Dict[str, PackEntry], Tuple[int, int]]:
+        """Read a pack's offset table from its footer, with the file's identity."""
+        with open(pack_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            f.seek(-PACK_FOOTER.size, os.SEEK_END)
+            table_offset, magic = PACK_FOOTER.unpack(f.read(PACK_FOOTER.size))
+            if magic != PACK_FOOTER_MAGIC:
+                raise ValueError(f"{pack_path} is not a valid pack")
+            end = f.tell() - PACK_FOOTER.size
+            f.seek(table_offset)
+            table = json.loads(f.read(end - table_offset))
+        entries = {key: PackEntry(*values) for key, values in table.items()}
+        return entries, (stat.st_ino, stat.st_mtime_ns)
+    
+    def _write_pack(self, month: str, blobs: Dict[str, Tuple[bytes, int, int, str]]) -> Dict[str, PackEntry]:
+        """
+        Write a month's pack from compressed blobs, replacing any existing one.
+        
+        Args:
+            month: Pack month (YYYYMM)
+            blobs: Key -> (compressed data, size, mtime_ns, note ID)
+        
+        Returns:
+            The new offset table (empty if the pack was removed)
+        """
+        pack_path = self._pack_path(month)
+        if not blobs:
+            fs.delete_file(pack_path)
+            return {}
+        
+        table: Dict[str, PackEntry] = {}
+        tmp_path = pack_path.with_suffix(".pack.tmp")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(PACK_MAGIC)
+            for key, (data, size, mtime_ns, note_id) in sorted(blobs.items()):
+                table[key] = PackEntry(f.tell(), len(data), size, mtime_ns, note_id)
+                f.write(data)
+            table_offset = f.tell()
+            f.write(json.dumps({key: list(entry) for key, entry in table.items()}).encode("utf-8"))
+            f.write(PACK_FOOTER.pack(table_offset, PACK_FOOTER_MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, pack_path)
+        return table
+    
+    def _month_blobs(self, month: str) -> Dict[str, Tuple[bytes, int, int, str]]:
+        """Load the compressed entries of a month's pack (lock held)."""
+        entries = {key: entry for key, (m, entry) in self._entries.items() if m == month}
+        if not entries:
+            return {}
+        
+        blobs = {}
+        with open(self._pack_path(month), "rb") as f:
+            for key, entry in entries.items():
+                f.seek(entry.offset)
+                blobs[key] = (f.read(entry.length), entry.size, entry.mtime_ns, entry.note_id)
+        return blobs
+    
+    def _replace_month(self, month: str, blobs: Dict[str, Tuple[bytes, int, int, str]]) -> None:
+        """Rewrite a month's pack and update the in-memory table (lock held)."""
+        table = self._write_pack(month, blobs)
+        for key in [key for key, (m, _) in self._entries.items() if m == month]:
+            del self._entries[key]
+        for key, entry in table.items():
+            self._entries[key] = (month, entry)
+        if table:
+            stat = self._pack_path(month).stat()
+            self._pack_ids[month] = (stat.st_ino, stat.st_mtime_ns)
+        else:
+            self._pack_ids.pop(month, None)
+    
+    def contains(self, path: Path) -> bool:
+        """Whether a note file is archived."""
+        self._ensure_loaded()
+        key = self._key(path)
+        return key is not None and key in self._entries
+    
+    def get(self, path: Path) -> Optional[bytes]:
+        """
+        Read an archived note file.
+        
+        Args:
+            path: The note's original file path
+        
+        Returns:
+            The file's content, or None if it isn't archived
+        """
+        key = self._key(path)
+        
+        for _ in range(2):
+            self._ensure_loaded()
+            # Open the pack under the lock so the handle matches the entry even
+            # if the pack is rewritten while it's being read
+            with self._lock:
+                found = self._entries.get(key) if key is not None else None
+                if found is None:
+                    return None
+                month, entry = found
+                pack_id = self._pack_ids.get(month)
+                try:
+                    f = open(self._pack_path(month), "rb")
+                except FileNotFoundError:
+                    f = None
+        
+            if f is not None:
+                with f:
+                    stat = os.fstat(f.fileno())
+                    if (stat.st_ino, stat.st_mtime_ns) == pack_id:
+                        f.seek(entry.offset)
+                        return zlib.decompress(f.read(entry.length))
+            
+            # Another worker rewrote the pack after its table was read
+            with self._lock:
+                self._loaded = False
+        
+        return None
+    
+    def signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        """Get the original (mtime_ns, size) of an archived file, if archived."""
+        self._ensure_loaded()
+        key = self._key(path)
+        found = self._entries.get(key) if key is not None else None
+        if found is None:
+            return None
+        return found[1].mtime_ns, found[1].size
+    
+    def note_paths(self, date_directory: Optional[str] = None) -> List[Tuple[str, Path]]:
+        """
+        List archived notes as (note ID, original path) pairs.
+        
+        Args:
+            date_directory: Only notes from this YYYYMMDD directory
+        """
+        self._ensure_loaded()
+        with self._lock:
+            items = list(self._entries.items())
+        
+        return [
+            (entry.note_id, self.notes_directory / key)
+            for key, (_, entry) in items
+            if date_directory is None or key.split("/", 1)[0] == date_directory
+        ]
+    
+    def add(self, files: Iterable[Tuple[str, Path]]) -> int:
+        """
+        Compress note files into their months' packs.
+        
+        Files are grouped by the month of their YYYYMMDD directory. The plain
+        files are left in place; the caller deletes them once this returns.
+        
+        Args:
+            files: (note ID, path) pairs
+        
+        Returns:
+            Number of files archived
+        """
+        self._ensure_loaded()
+        
+        by_month: Dict[str, List[Tuple[str, str, Path]]] = {}
+        for note_id, path in files:
+            key = self._key(path)
+            if key is None:
+                continue
+            by_month.setdefault(key[:6], []).append((key, note_id, path))
+        
+        added = 0
+        with self._coordinator.exclusive("archive"), self._lock:
+            self._ensure_loaded()
+            for month, month_files in sorted(by_month.items()):
+                blobs = self._month_blobs(month)
+                for key, note_id, path in month_files:
+                    try:
+                        content = path.read_bytes()
+                        mtime_ns, size = fs.get_file_signature(path)
+                    except FileNotFoundError:
+                        continue
+                    blobs[key] = (zlib.compress(content, 9), size, mtime_ns, note_id)
+                    added += 1
+                self._replace_month(month, blobs)
+            if by_month:
+                self._seen_generation = self._coordinator.bump("archive")
+        
+        return added
+    
+    def remove(self, path: Path) -> bool:
+        """
+        Drop a file from its pack (it has been restored as a plain file or deleted).
+        
+        Returns:
+            True if the file was archived
+        """
+        key = self._key(path)
+        
+        with self._coordinator.exclusive("archive"), self._lock:
+            self._ensure_loaded()
+            found = self._entries.get(key) if key is not None else None
+            if found is None:
+                return False
+            
+            month = found[0]
+            blobs = self._month_blobs(month)
+            blobs.pop(key, None)
+            self._replace_month(month, blobs)
+            self._seen_generation = self._coordinator.bump("archive")
+        
+        return True
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the number of packs and archived files."""
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                "packs": len({month for month, _ in self._entries.values()}),
+                "files": len(self._entries),
+            }
+
+
+def get_archive_store() -> ArchiveStore:
+    """Get the ArchiveStore of the current vault."""
+    return current_vault().service(
+        "archive_store",
+        lambda config: ArchiveStore(config.archive_directory, config.notes_base_directory)
+    )
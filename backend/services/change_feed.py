@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .vaults import current_vault
+
+
+class ChangeFeed:
+    """
+    Monotonic log of record changes made by the managers.
+    
+    Every create, update and delete of a note or action item gets a sequence
+    number. Clients remember the last sequence they saw and ask for changes
+    since then, so syncing costs O(changes) instead of a full refetch.
+    
+    Sequences start from the process start time in milliseconds, so they keep
+    increasing across restarts. Only the most recent changes are retained;
+    a client whose position is no longer covered must do a full refetch.
+    """
+    
+    def __init__(self, max_entries: int):
+        self._lock = threading.Lock()
+        self._seq = time.time_ns() // 1_000_000
+        self._log: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        # Async subscribers (SSE streams) as (event loop, queue) pairs
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+    
+    @property
+    def seq(self) -> int:
+        """The sequence number of the most recent change."""
+        with self._lock:
+            return self._seq
+    
+    def record(self, kind: str, record_id: str, op: str) -> int:
+        """
+        Record a change and notify subscribers.
+        
+        Args:
+            kind: Record type ("note" or "action_item")
+            record_id: ID of the changed record
+            op: Operation ("created", "updated" or "deleted")
+        
+        Returns:
+            The sequence number assigned to the change
+        """
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "kind": kind, "id": record_id, "op": op}
+            self._log.append(event)
+            subscribers = list(self._subscribers)
+        
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop has closed
+                pass
+        
+        return event["seq"]
+    
+    def changes_since(self, since: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the changes made after a sequence number.
+        
+        Args:
+            since: Last sequence number the client has seen
+        
+        Returns:
+            Changes in sequence order, or None if the log no longer covers
+            that position (or it is from the future) and a full refetch is needed
+        """
+        with self._lock:
+            oldest = self._log[0]["seq"] if self._log else self._seq + 1
+            if since < oldest - 1 or since > self._seq:
+                return None
+            return [event for event in self._log if event["seq"] > since]
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Register a queue on the running event loop to receive new changes."""
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering changes to a queue."""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+
+def collapse_changes(events: List[Dict[str, Any]]) -> Dict[Tuple[str, str], str]:
+    """
+    Reduce a change list to the latest operation per record.
+    
+    Args:
+        events: Changes in sequence order
+    
+    Returns:
+        Mapping of (kind, record ID) -> last operation
+    """
+    latest: Dict[Tuple[str, str], str] = {}
+    for event in events:
+        latest[(event["kind"], event["id"])] = event["op"]
+    return latest
+
+
+def get_change_feed() -> ChangeFeed:
+    """Get the ChangeFeed of the current vault."""
+    return current_vault().service("change_feed", lambda config: ChangeFeed(config.change_feed_size))
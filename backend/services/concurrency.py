@@ -0,0 +1,146 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class VersionConflictError(Exception):
+    """Raised when a save is based on a stale version of a record."""
+    
+    def __init__(self, kind: str, record_id: str, expected: int, actual: int):
+        self.kind = kind
+        self.record_id = record_id
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"{kind} {record_id} was modified by another request "
+            f"(expected version {expected}, current version {actual})"
+        )
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader/writer lock.
+    
+    Any number of threads may hold the read side at once; the write side is
+    exclusive. Both sides are reentrant, and a thread holding the write side
+    may also take the read side. Upgrading from read to write is not allowed.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+    
+    def _read_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+    
+    def acquire_read(self) -> None:
+        """Acquire the shared (read) side of the lock."""
+        me = threading.get_ident()
+        depth = self._read_depth()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if depth == 0:
+                # New readers wait for queued writers so writers can't starve
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+    
+    def release_read(self) -> None:
+        """Release the shared (read) side of the lock."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth -= 1
+                return
+            depth = self._read_depth() - 1
+            self._local.depth = depth
+            if depth == 0:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+    
+    def acquire_write(self) -> None:
+        """Acquire the exclusive (write) side of the lock."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if self._read_depth():
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self) -> None:
+        """Release the exclusive (write) side of the lock."""
+        with self._cond:
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Context manager holding the read side of the lock."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Context manager holding the write side of the lock."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class KeyedLocks:
+    """
+    Registry of reentrant locks keyed by record ID.
+    
+    Locks are created on first use and discarded once no thread holds or
+    waits for them, so the registry stays as small as the set of records
+    currently being written.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [lock, number of holders/waiters]
+        self._locks: Dict[str, List] = {}
+    
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Context manager holding the lock for a single key."""
+        with self._lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = [threading.RLock(), 0]
+                self._locks[key] = entry
+            entry[1] += 1
+        
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
@@ -0,0 +1,204 @@
+import functools
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .vaults import current_vault
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+# Shared stores, each with its own lock file and generation slot
+STORES = ("notes", "notes_index", "action_items", "settings", "archive")
+
+# Generations file: epoch, then (generation, last modified) per store
+_HEADER = struct.Struct("<Q")
+_SLOT = struct.Struct("<Qd")
+
+
+def _lock_fd(fd: int) -> None:
+    """Block until the process holds an exclusive advisory lock on the file."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class _StoreLock:
+    """Reentrant lock held across threads of this process and other processes."""
+    
+    def __init__(self, path: Path):
+        self._path = path
+        self._fd: Optional[int] = None
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+    
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            if self._fd is None:
+                self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(self._fd)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+    
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_fd(self._fd)
+        self._thread_lock.release()
+
+
+class Coordinator:
+    """
+    Keeps worker processes that share one vault coherent.
+    
+    Each store (notes, the note index, action items, settings, archive packs)
+    has an advisory lock file that writers hold while they refresh, change
+    and save it, and a generation counter in a small memory-mapped file that
+    they bump afterwards. Readers compare the mapped counter with the one
+    they last saw before using cached state: a few bytes read from shared
+    memory per call, and a reload of just that store when it moved.
+    
+    When disabled (a single worker, the default) locks are no-ops and
+    generations never change, so the managers behave as before.
+    """
+    
+    def __init__(self, directory: Path, enabled: bool):
+        self.directory = directory
+        self.enabled = enabled
+        self._locks: Dict[str, _StoreLock] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._epoch = 0
+        if enabled:
+            self._open()
+    
+    def _open(self) -> None:
+        """Create (first process) or map the generations file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name in STORES:
+            self._locks[name] = _StoreLock(self.directory / f"{name}.lock")
+        
+        size = _HEADER.size + _SLOT.size * len(STORES)
+        path = self.directory / "generations"
+        init_lock = _StoreLock(self.directory / "generations.lock")
+        init_lock.acquire()
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < size:
+                    os.ftruncate(fd, size)
+                self._map = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            self._epoch = _HEADER.unpack_from(self._map, 0)[0]
+            if self._epoch == 0:
+                self._epoch = time.time_ns()
+                _HEADER.pack_into(self._map, 0, self._epoch)
+        finally:
+            init_lock.release()
+    
+    def _offset(self, store: str) -> int:
+        return _HEADER.size + _SLOT.size * STORES.index(store)
+    
+    def generation(self, store: str) -> int:
+        """Get a store's current shared generation (0 when disabled)."""
+        if self._map is None:
+            return 0
+        return _SLOT.unpack_from(self._map, self._offset(store))[0]
+    
+    def is_stale(self, store: str, seen: int) -> bool:
+        """Whether another process changed a store since generation `seen`."""
+        return self._map is not None and self.generation(store) != seen
+    
+    def validator(self, store: str) -> Tuple[str, float]:
+        """
+        Get a store's validator, identical in every worker.
+        
+        Returns:
+            Tuple of (change token, last modification time as Unix timestamp)
+        """
+        generation, modified = _SLOT.unpack_from(self._map, self._offset(store))
+        return f"{self._epoch:x}-{generation}", modified or time.time()
+    
+    @contextmanager
+    def exclusive(self, *stores: str) -> Iterator[None]:
+        """
+        Hold the stores' cross-process write locks (no-op when disabled).
+        
+        Locks are reentrant and always taken in a fixed order.
+        """
+        if self._map is None:
+            yield
+            return
+        
+        held: List[_StoreLock] = []
+        try:
+            for name in sorted(set(stores), key=STORES.index):
+                self._locks[name].acquire()
+                held.append(self._locks[name])
+            yield
+        finally:
+            for lock in reversed(held):
+                lock.release()
+    
+    def bump(self, store: str) -> int:
+        """
+        Record a change to a store; call while holding its lock.
+        
+        Returns:
+            The new generation (0 when disabled)
+        """
+        if self._map is None:
+            return 0
+        offset = self._offset(store)
+        generation = _SLOT.unpack_from(self._map, offset)[0] + 1
+        _SLOT.pack_into(self._map, offset, generation, time.time())
+        return generation
+
+
+def shared_write(method: F) -> F:
+    """
+    Decorator running a manager method as one cross-process write.
+    
+    The manager's `_shared_write()` context manager holds its store's lock,
+    reloads state another worker changed and publishes the change afterwards.
+    """
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with self._shared_write():
+            return method(self, *args, **kwargs)
+    
+    return wrapper  # type: ignore[return-value]
+
+
+def get_coordinator() -> Coordinator:
+    """Get the Coordinator of the current vault."""
+    return current_vault().service(
+        "coordinator",
+        lambda config: Coordinator(config.coordination_directory, config.multi_worker)
+    )
@@ -0,0 +1,165 @@
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from ..config import Config
+from . import file_system as fs
+from .coordination import get_coordinator
+from .tracing import traced
+
+
+# Seconds after a change before the saved file is rewritten
+SAVE_DELAY = 5.0
+
+# Full rebuilds retried when records change while they are being read
+REBUILD_ATTEMPTS = 3
+
+
+class DerivedState(ABC):
+    """
+    Base for in-memory state derived from a vault's notes and action items.
+    
+    Subclasses keep their state up to date from the managers' mutation
+    hooks, calling `_mark_changed` (with `_lock` held) for every applied
+    change, and implement the abstract methods that save and recompute it
+    (`_load`, `_save_payload`, `_write`, `_collect` and `_install`).
+    
+    The state is saved next to the note index a few seconds after a change.
+    The file is removed when the first change after a save arrives, so after
+    a crash it is missing rather than stale, and the next use rebuilds.
+    
+    With several workers (`multi_worker`), each worker's copy only sees its
+    own changes, so nothing is saved and use rebuilds whenever the shared
+    note or action item generation moved since the last rebuild.
+    """
+    
+    # File name of the saved state, next to the note index
+    storage_name = ""
+    
+    def __init__(self, config: Config):
+        self.config = config
+        self.storage_file = config.notes_index_file.with_name(self.storage_name)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._loaded = False
+        # True until a rebuild when the saved file was missing or invalid
+        self._stale = True
+        # Bumped by every applied change (rebuilds retry when it moves)
+        self._changes = 0
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._coordinator = get_coordinator()
+        self._persist = not self._coordinator.enabled
+        # Shared note and action item generations the last rebuild saw
+        self._seen_generations: Optional[Tuple[int, int]] = None
+    
+    @abstractmethod
+    def _load(self, path: Path) -> bool:
+        """Read the saved file (lock held); False if it is unusable."""
+    
+    @abstractmethod
+    def _save_payload(self) -> Any:
+        """Snapshot of the state to save (lock held)."""
+    
+    @abstractmethod
+    def _write(self, path: Path, payload: Any) -> None:
+        """Write a snapshot to the file."""
+    
+    @abstractmethod
+    def _collect(self) -> Any:
+        """Recompute the state from the managers (no lock held)."""
+    
+    @abstractmethod
+    def _install(self, state: Any) -> None:
+        """Replace the state with a recomputed one (lock held)."""
+    
+    def _ensure_loaded(self) -> None:
+        """Load the saved state on first use (lock held)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self._persist or not fs.file_exists(self.storage_file):
+            return
+        
+        try:
+            self._stale = not self._load(self.storage_file)
+        except Exception:
+            # Rebuilt on next use
+            self._stale = True
+    
+    def _mark_changed(self) -> None:
+        """Record an applied change and schedule a save (lock held)."""
+        self._changes += 1
+        if not self._persist or self._dirty:
+            return
+        
+        self._dirty = True
+        # The saved file no longer matches; never leave it behind after a crash
+        fs.delete_file(self.storage_file)
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def invalidate(self) -> None:
+        """Have the next use rebuild the state (after bulk changes to the files)."""
+        with self._lock:
+            self._loaded = True
+            self._stale = True
+            self._mark_changed()
+    
+    def _generations(self) -> Tuple[int, int]:
+        return (
+            self._coordinator.generation("notes"),
+            self._coordinator.generation("action_items"),
+        )
+    
+    def refresh(self) -> None:
+        """Rebuild the state if it is missing or out of date (blocking)."""
+        with self._lock:
+            self._ensure_loaded()
+            stale = self._stale
+        if stale or (self._coordinator.enabled and self._seen_generations != self._generations()):
+            self.rebuild()
+    
+    @traced()
+    def rebuild(self) -> None:
+        """Recompute the state from every note and action item (blocking)."""
+        for _ in range(REBUILD_ATTEMPTS):
+            with self._lock:
+                changes = self._changes
+            generations = self._generations()
+            state = self._collect()
+            
+            with self._lock:
+                self._loaded = True
+                self._install(state)
+                # Changed while reading: the next use rebuilds again
+                self._stale = self._changes != changes
+                self._seen_generations = generations
+                if not self._stale:
+                    self._dirty = False
+                    self._mark_changed()
+                    return
+    
+    @traced()
+    def flush(self) -> None:
+        """Save the state if it changed since the last save."""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty or self._stale:
+                    return
+                self._dirty = False
+                changes = self._changes
+                payload = self._save_payload()
+            
+            self._write(self.storage_file, payload)
+            
+            with self._lock:
+                if self._changes != changes:
+                    # Changed while writing: the file is already out of date
+                    fs.delete_file(self.storage_file)
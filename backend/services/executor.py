@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ..config import get_config
+from .profiling import current_profile
+
+
+T = TypeVar("T")
+
+
+class WorkerPool:
+    """
+    Bounded thread pool for blocking service-layer work.
+    
+    The managers do synchronous disk I/O and markdown conversion. Route
+    handlers await `run` so that work happens off the event loop and
+    concurrent requests actually run concurrently.
+    """
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="goodnotes-worker",
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+    
+    def _run_tracked(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a submitted call on a worker thread, keeping queue counters."""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            profile = current_profile()
+            if profile is not None:
+                return profile.run(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+    
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the pool and await its result.
+        
+        The caller's context variables (request stage timings, profiling)
+        are carried over to the worker thread.
+        
+        Args:
+            func: Blocking callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+        
+        Returns:
+            The callable's return value
+        """
+        with self._lock:
+            self._queued += 1
+        
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._run_tracked, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get current pool utilisation.
+        
+        Returns:
+            Worker count, active calls, queue depth and completed calls
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+            }
+    
+    def shutdown(self) -> None:
+        """Wait for running calls and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+# Singleton instance
+_worker_pool: Optional[WorkerPool] = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the singleton WorkerPool instance."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool(get_config().worker_pool_size)
+    return _worker_pool
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared worker pool."""
+    return await get_worker_pool().run(func, *args, **kwargs)
+
+
+def shutdown_worker_pool() -> None:
+    """Shut down the shared worker pool if it was started."""
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
@@ -1,6 +1,5 @@
 from datetime import datetime
 from typing import Optional
-from slugify import slugify
 
 
 def generate_note_filename(title: str, meeting_start_time: Optional[datetime] = None) -> str:
@@ -16,6 +15,8 @@ def generate_note_filename(title: str, meeting_start_time: Optional[datetime] =
     Returns:
         Generated filename with .md extension
     """
+    from slugify import slugify
+    
     # Slugify the title
     slug = slugify(title, max_length=50, word_boundary=True)
     
@@ -61,6 +62,8 @@ def generate_note_id(title: str, created_at: datetime) -> str:
     Returns:
         Unique note identifier
     """
+    from slugify import slugify
+    
     slug = slugify(title, max_length=30, word_boundary=True)
     if not slug:
         slug = "untitled"
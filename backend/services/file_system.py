@@ -1,6 +1,10 @@
 import os
+import threading
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Tuple
+
+from .metrics import stage_timer
+from .tracing import span
 
 
 def read_file(path: Path) -> str:
@@ -16,21 +20,32 @@ def read_file(path: Path) -> str:
     Raises:
         FileNotFoundError: If file doesn't exist
     """
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    with span("fs.read_file", path=str(path)), stage_timer("fs_read"):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
 
 
 def write_file(path: Path, content: str) -> None:
     """
     Write content to a file, creating parent directories if needed.
     
+    The content is written to a temporary file that then replaces the target,
+    so concurrent readers see either the old or the new file, never a partial one.
+    
     Args:
         path: Path to the file
         content: Content to write
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    with span("fs.write_file", path=str(path), chars=len(content)), stage_timer("fs_write"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
 
 def delete_file(path: Path) -> bool:
@@ -43,11 +58,12 @@ def delete_file(path: Path) -> bool:
     Returns:
         True if file was deleted, False if it didn't exist
     """
-    try:
-        path.unlink()
-        return True
-    except FileNotFoundError:
-        return False
+    with span("fs.delete_file", path=str(path)):
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
 
 
 def file_exists(path: Path) -> bool:
@@ -134,8 +150,9 @@ def rename_file(old_path: Path, new_path: Path) -> None:
         old_path: Current path
         new_path: New path
     """
-    new_path.parent.mkdir(parents=True, exist_ok=True)
-    old_path.rename(new_path)
+    with span("fs.rename_file", path=str(old_path), new_path=str(new_path)):
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        old_path.rename(new_path)
 
 
 def get_file_modification_time(path: Path) -> float:
@@ -150,3 +167,20 @@ def get_file_modification_time(path: Path) -> float:
     """
     return path.stat().st_mtime
 
+
+
+def get_file_signature(path: Path) -> Tuple[int, int]:
+    """
+    Get a cheap change signature for a file without reading it.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        Tuple of (modification time in nanoseconds, size in bytes)
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
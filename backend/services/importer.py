@@ -0,0 +1,397 @@
+import os
+import re
+import tarfile
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..models.action_item import ActionItem
+from . import file_system as fs
+from . import markdown_converter as md
+from . import file_naming as naming
+from .archive import get_archive_store
+from .notes_manager import get_notes_manager
+from .action_items_manager import get_action_items_manager
+from .aggregates import get_aggregates
+from .similarity import get_similarity_index
+from .tracing import traced
+
+
+# File types picked up from a directory or archive
+IMPORT_EXTENSIONS = (".md", ".markdown", ".txt")
+
+# Below this many files, parsing inline beats starting worker processes
+PROCESS_POOL_THRESHOLD = 64
+
+# Markdown task list entries ("- [ ] foo", "* [x] bar") become action items
+TASK_PATTERN = re.compile(r"^\s*[-*+]\s+\[([ xX])\]\s+(.+?)\s*$")
+
+# (phase, done, total) with phase "parse" or "write"
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class ImportSource:
+    """A file to import: a path on disk, or a member of an archive on disk."""
+    name: str
+    path: Optional[str] = None
+    # Archive holding the file; tar members are read at offset/size of the
+    # (decompressed) stream, zip members by name
+    archive: Optional[str] = None
+    offset: int = 0
+    size: int = 0
+    mtime: float = 0.0
+
+
+@dataclass
+class ParsedNote:
+    """A source file normalized into note fields (built in a worker process)."""
+    source: str
+    title: str = ""
+    created_at: Optional[datetime] = None
+    meeting_start_time: Optional[datetime] = None
+    attendees: Optional[List[str]] = None
+    body: str = ""
+    # (title, completed) pairs extracted from task lists
+    tasks: List[Tuple[str, bool]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """Coerce a frontmatter date/time value to a naive local datetime."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, dt_time())
+    
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _title_from_name(name: str) -> str:
+    """Derive a title from a file name ("weekly_sync-notes.md" -> "weekly sync notes")."""
+    stem = Path(name).stem
+    return re.sub(r"[-_]+", " ", stem).strip() or "Untitled"
+
+
+# Archives opened by this process while parsing, by path (see _read_member)
+_open_archives: Dict[str, Any] = {}
+
+
+def _read_member(source: ImportSource) -> bytes:
+    """
+    Read an archive member, keeping the archive open for the next ones.
+    
+    Workers get members in archive order, so reads from a compressed tar
+    only ever seek forward.
+    """
+    archive = _open_archives.get(source.archive)
+    if archive is None:
+        if zipfile.is_zipfile(source.archive):
+            archive = zipfile.ZipFile(source.archive)
+        else:
+            archive = tarfile.open(source.archive)
+        _open_archives[source.archive] = archive
+    
+    if isinstance(archive, zipfile.ZipFile):
+        return archive.read(source.name)
+    archive.fileobj.seek(source.offset)
+    return archive.fileobj.read(source.size)
+
+
+def _close_archives() -> None:
+    """Close the archives opened by `_read_member` in this process."""
+    while _open_archives:
+        _, archive = _open_archives.popitem()
+        archive.close()
+
+
+def parse_source(source: ImportSource) -> ParsedNote:
+    """
+    Read and normalize one source file.
+    
+    Runs in a worker process, so it only returns plain data.
+    
+    - Frontmatter supplies the title, created/date, meeting time and attendees
+      when present; the first "# " heading or the file name is the fallback title
+    - Task list entries are removed from the body and returned as tasks
+    - HTML bodies are converted to markdown
+    
+    Args:
+        source: The file to parse
+    
+    Returns:
+        The normalized note, or one with `error` set if it couldn't be read
+    """
+    parsed = ParsedNote(source=source.name)
+    try:
+        if source.archive:
+            text = _read_member(source).decode("utf-8", errors="replace")
+        else:
+            text = Path(source.path).read_text(encoding="utf-8", errors="replace")
+        
+        import frontmatter
+        
+        try:
+            post = frontmatter.loads(text)
+            metadata, content = dict(post.metadata), post.content
+        except Exception:
+            # Malformed frontmatter: import the file as plain markdown
+            metadata, content = {}, text
+        
+        title = str(metadata.get("title") or "").strip()
+        body_lines: List[str] = []
+        for line in content.splitlines():
+            stripped = line.strip()
+            if not title and stripped.startswith("# "):
+                title = stripped[2:].strip()
+                continue
+            task = TASK_PATTERN.match(line)
+            if task:
+                parsed.tasks.append((task.group(2), task.group(1) != " "))
+                continue
+            body_lines.append(line)
+        
+        body = "\n".join(body_lines).strip()
+        if md.is_html_content(body):
+            body = md.html_to_markdown(body)
+        
+        attendees = metadata.get("attendees")
+        if isinstance(attendees, str):
+            attendees = [a.strip() for a in attendees.split(",") if a.strip()]
+        
+        created_at = None
+        for key in ("created_at", "created", "date"):
+            created_at = _to_datetime(metadata.get(key))
+            if created_at:
+                break
+        
+        parsed.title = title or _title_from_name(source.name)
+        parsed.created_at = created_at or datetime.fromtimestamp(source.mtime or time.time())
+        parsed.meeting_start_time = _to_datetime(metadata.get("meeting_start_time"))
+        parsed.attendees = [str(a) for a in attendees] if isinstance(attendees, list) and attendees else None
+        parsed.body = body
+    except Exception as e:
+        parsed.error = f"{type(e).__name__}: {e}"
+    
+    return parsed
+
+
+def collect_sources(source: Path) -> List[ImportSource]:
+    """
+    List the importable files in a directory, .zip or .tar(.gz) archive.
+    
+    Only names and locations are collected; the files (or archive members)
+    are read by whichever process parses them.
+    
+    Raises:
+        ValueError: If the source is neither a directory nor a supported archive
+    """
+    def wanted(name: str) -> bool:
+        base = os.path.basename(name)
+        return name.lower().endswith(IMPORT_EXTENSIONS) and not base.startswith(".")
+    
+    if source.is_dir():
+        return [
+            ImportSource(name=str(path.relative_to(source)), path=str(path), mtime=path.stat().st_mtime)
+            for path in sorted(source.rglob("*"))
+            if path.is_file() and wanted(path.name)
+        ]
+    
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            return [
+                ImportSource(
+                    name=info.filename,
+                    archive=str(source),
+                    mtime=datetime(*info.date_time).timestamp(),
+                )
+                for info in archive.infolist()
+                if not info.is_dir() and wanted(info.filename)
+            ]
+    
+    if source.is_file() and tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            return [
+                ImportSource(
+                    name=member.name,
+                    archive=str(source),
+                    offset=member.offset_data,
+                    size=member.size,
+                    mtime=member.mtime,
+                )
+                for member in archive
+                if member.isfile() and wanted(member.name)
+            ]
+    
+    raise ValueError(f"{source} is not a directory, .zip or .tar archive")
+
+
+def _parse_all(
+    sources: List[ImportSource],
+    workers: int,
+    progress: Optional[ProgressCallback]
+) -> Iterator[ParsedNote]:
+    """
+    Parse sources in a process pool (or inline for small imports), in order.
+    
+    Workers are spawned rather than forked: the server process has live
+    locks and timer threads that a forked child would inherit mid-use.
+    """
+    total = len(sources)
+    if workers <= 1 or total < PROCESS_POOL_THRESHOLD:
+        try:
+            for done, source in enumerate(sources, 1):
+                yield parse_source(source)
+                if progress:
+                    progress("parse", done, total)
+        finally:
+            _close_archives()
+        return
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    chunksize = max(1, min(64, total // (workers * 4)))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for done, parsed in enumerate(pool.map(parse_source, sources, chunksize=chunksize), 1):
+            yield parsed
+            if progress and (done % chunksize == 0 or done == total):
+                progress("parse", done, total)
+
+
+@traced()
+def import_notes(
+    source: Path,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Import a folder or archive of markdown files as notes.
+    
+    Files are parsed in a process pool. Each note then gets an ID and a
+    date-directory path from `file_naming` (suffixed if taken) and is written
+    once; the action items file and the note index are each saved once at
+    the end. If saving the action items fails, the written note files are
+    removed again.
+    
+    Args:
+        source: Directory, .zip or .tar(.gz) archive
+        dry_run: Parse and plan everything but write nothing
+        workers: Worker processes (default: the vault's import_workers, 0 = CPU count)
+        progress: Optional callback receiving (phase, done, total)
+    
+    Returns:
+        Report with counts, the planned or imported notes and per-file errors
+    
+    Raises:
+        ValueError: If the source is neither a directory nor a supported archive
+    """
+    start = time.perf_counter()
+    notes_manager = get_notes_manager()
+    action_items_manager = get_action_items_manager()
+    
+    if workers is None:
+        workers = notes_manager.config.import_workers
+    workers = workers or os.cpu_count() or 1
+    
+    sources = collect_sources(source)
+    taken_ids: Set[str] = set(notes_manager.get_note_ids())
+    taken_paths: Set[Path] = set()
+    archive_store = get_archive_store()
+    
+    planned: List[Tuple[ParsedNote, str, Path, List[ActionItem]]] = []
+    errors: List[Dict[str, str]] = []
+    
+    for parsed in _parse_all(sources, workers, progress):
+        if parsed.error:
+            errors.append({"file": parsed.source, "error": parsed.error})
+            continue
+        
+        note_id = naming.generate_note_id(parsed.title, parsed.created_at)
+        base_id, n = note_id, 1
+        while note_id in taken_ids:
+            n += 1
+            note_id = f"{base_id}-{n}"
+        taken_ids.add(note_id)
+        
+        directory = notes_manager.base_directory / naming.generate_date_directory(parsed.created_at)
+        filename = naming.generate_note_filename(parsed.title, parsed.meeting_start_time)
+        path, n = directory / filename, 1
+        while path in taken_paths or fs.file_exists(path) or archive_store.contains(path):
+            n += 1
+            path = directory / f"{Path(filename).stem}-{n}.md"
+        taken_paths.add(path)
+        
+        items = [
+            ActionItem(
+                id=str(uuid.uuid4()),
+                title=title,
+                note_id=note_id,
+                created_at=parsed.created_at,
+                completed=completed,
+                completed_at=parsed.created_at if completed else None,
+            )
+            for title, completed in parsed.tasks
+        ]
+        planned.append((parsed, note_id, path, items))
+    
+    all_items = [item for _, _, _, items in planned for item in items]
+    report: Dict[str, Any] = {
+        "source": str(source),
+        "dry_run": dry_run,
+        "files": len(sources),
+        "imported": 0 if dry_run else len(planned),
+        "action_items": len(all_items),
+        "errors": errors,
+        "notes": [
+            {"file": parsed.source, "id": note_id, "path": str(path), "action_items": len(items)}
+            for parsed, note_id, path, items in planned
+        ],
+    }
+    
+    if not dry_run and planned:
+        written: Dict[str, Path] = {}
+        try:
+            for done, (parsed, note_id, path, items) in enumerate(planned, 1):
+                fs.write_file(path, md.note_to_markdown(
+                    id=note_id,
+                    title=parsed.title,
+                    content=parsed.body,
+                    created_at=parsed.created_at,
+                    attendees=parsed.attendees,
+                    meeting_start_time=parsed.meeting_start_time,
+                    action_item_ids=[item.id for item in items] or None,
+                ))
+                written[note_id] = path
+                if progress and (done % 100 == 0 or done == len(planned)):
+                    progress("write", done, len(planned))
+            
+            if all_items:
+                action_items_manager.apply_changes(upserts=all_items)
+        except Exception:
+            for path in written.values():
+                fs.delete_file(path)
+            raise
+        
+        notes_manager.add_imported_notes(written)
+        aggregates = get_aggregates()
+        similarity = get_similarity_index()
+        for parsed, note_id, _, _ in planned:
+            aggregates.note_saved(note_id, parsed.created_at, parsed.attendees)
+            similarity.note_saved(note_id, parsed.title, parsed.attendees, parsed.body)
+    
+    report["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
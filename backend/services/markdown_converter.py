@@ -1,14 +1,24 @@
 import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-import frontmatter
-from markdownify import markdownify as md
-import markdown
+
+from .metrics import stage_timer
+from .tracing import traced
+
+# markdown, markdownify (BeautifulSoup) and frontmatter are imported on first
+# use: together they are a large share of the backend's import time.
 
 # Regex to detect HTML tags
 HTML_TAG_PATTERN = re.compile(r'<[a-zA-Z][^>]*>')
 
 
+def preload() -> None:
+    """Import the markdown/HTML conversion libraries ahead of first use."""
+    import frontmatter  # noqa: F401
+    import markdown  # noqa: F401
+    import markdownify  # noqa: F401
+
+
 def is_html_content(content: str) -> bool:
     """
     Check if content appears to be HTML rather than markdown.
@@ -43,8 +53,11 @@ def markdown_to_html(md_content: str) -> str:
     if is_html_content(md_content):
         return md_content
     
+    import markdown
+    
     # Convert markdown to HTML
-    html = markdown.markdown(md_content, extensions=['extra'])
+    with stage_timer("markdown_to_html"):
+        html = markdown.markdown(md_content, extensions=['extra'])
     return html
 
 
@@ -65,16 +78,19 @@ def html_to_markdown(html_content: str) -> str:
     if '<' not in html_content:
         return html_content
     
+    from markdownify import markdownify as md
+    
     # Convert HTML to markdown
     # heading_style="ATX" uses # for headings
     # bullets="-" uses - for unordered lists
     # strip=['a'] would strip anchor tags (keeping text)
-    markdown_content = md(
-        html_content,
-        heading_style="ATX",
-        bullets="-",
-        strip=['script', 'style'],
-    )
+    with stage_timer("html_to_markdown"):
+        markdown_content = md(
+            html_content,
+            heading_style="ATX",
+            bullets="-",
+            strip=['script', 'style'],
+        )
     
     # Clean up extra whitespace
     lines = markdown_content.split('\n')
@@ -92,6 +108,7 @@ def html_to_markdown(html_content: str) -> str:
     return '\n'.join(cleaned_lines).strip()
 
 
+@traced("markdown.note_to_markdown")
 def note_to_markdown(
     id: str,
     title: str,
@@ -101,12 +118,13 @@ def note_to_markdown(
     attendees: Optional[List[str]] = None,
     meeting_start_time: Optional[datetime] = None,
     action_item_ids: Optional[List[str]] = None,
+    version: int = 1,
 ) -> str:
     """
     Convert note data to markdown format with frontmatter.
     
     Structure:
-    - Frontmatter: id, created_at, updated_at, meeting_start_time, action_item_ids
+    - Frontmatter: id, version, created_at, updated_at, meeting_start_time, action_item_ids
     - h1: Title
     - h2 Attendees (optional): List of attendees
     - Content: Note content
@@ -120,6 +138,7 @@ def note_to_markdown(
         attendees: List of attendees (optional)
         meeting_start_time: Meeting start time (optional)
         action_item_ids: List of action item IDs associated with note
+        version: Note version for optimistic concurrency
         
     Returns:
         Markdown string with frontmatter
@@ -127,6 +146,7 @@ def note_to_markdown(
     # Build frontmatter metadata
     metadata: Dict[str, Any] = {
         "id": id,
+        "version": version,
         "created_at": created_at.isoformat(),
     }
     
@@ -161,19 +181,23 @@ def note_to_markdown(
         markdown_body = html_to_markdown(content)
         content_parts.append(markdown_body)
     
+    import frontmatter
+    
     # Create the markdown document
     markdown_content = "\n".join(content_parts)
     post = frontmatter.Post(markdown_content, **metadata)
     
-    return frontmatter.dumps(post)
+    with stage_timer("frontmatter_dump"):
+        return frontmatter.dumps(post)
 
 
+@traced("markdown.markdown_to_note")
 def markdown_to_note(markdown_text: str) -> Dict[str, Any]:
     """
     Parse markdown file content back to note data.
     
     Extracts:
-    - Frontmatter metadata (id, timestamps, meeting_start_time, action_item_ids)
+    - Frontmatter metadata (id, version, timestamps, meeting_start_time, action_item_ids)
     - Title from h1 heading
     - Attendees from optional h2 Attendees section
     - Content (everything after title/attendees)
@@ -184,8 +208,11 @@ def markdown_to_note(markdown_text: str) -> Dict[str, Any]:
     Returns:
         Dictionary with parsed note data
     """
+    import frontmatter
+    
     # Parse frontmatter and content
-    post = frontmatter.loads(markdown_text)
+    with stage_timer("frontmatter_parse"):
+        post = frontmatter.loads(markdown_text)
     
     # Extract metadata
     metadata = dict(post.metadata)
@@ -267,6 +294,7 @@ def markdown_to_note(markdown_text: str) -> Dict[str, Any]:
         "title": title,
         "content": html_content,
         "attendees": attendees if attendees else None,
+        "version": int(metadata.get("version", 1)),
     }
     
     # Parse timestamps
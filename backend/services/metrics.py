@@ -0,0 +1,211 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Latency buckets in seconds, from sub-millisecond file reads to slow list renders
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Coarse grouping of stages for per-request breakdowns
+STAGE_GROUPS = {
+    "fs_read": "disk",
+    "fs_write": "disk",
+    "yaml_load": "parse",
+    "frontmatter_parse": "parse",
+    "model_build": "parse",
+    "markdown_to_html": "render",
+    "html_to_markdown": "render",
+    "frontmatter_dump": "render",
+    "yaml_dump": "serialize",
+    "serialize": "serialize",
+}
+
+# Stage totals for the current request: stage -> [seconds, count]. The dict is
+# shared by every context copied from the request, including worker threads.
+_request_stages: ContextVar[Optional[Dict[str, List]]] = ContextVar(
+    "goodnotes_request_stages", default=None
+)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a label set in Prometheus text format."""
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value (integers without a trailing .0)."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """
+    Thread-safe Prometheus-style histogram with a fixed label set.
+    
+    Each distinct combination of label values gets its own bucket counts,
+    sum and count. Observations cost a bisect and a short lock.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+    
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """
+        Record an observation.
+        
+        Args:
+            value: Observed value (seconds, for latency histograms)
+            *labelvalues: One value per label name, in order
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0]
+                self._series[labelvalues] = series
+            series[0][index] += 1
+            series[1] += value
+    
+    def render(self) -> List[str]:
+        """Render the histogram in Prometheus text exposition format."""
+        with self._lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labelvalues, counts, total in sorted(snapshot):
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+def render_metric(
+    name: str,
+    metric_type: str,
+    help: str,
+    samples: Iterable[Tuple[Dict[str, str], float]]
+) -> List[str]:
+    """
+    Render a gauge or counter computed at scrape time.
+    
+    Args:
+        name: Metric name
+        metric_type: "gauge" or "counter"
+        help: Help text
+        samples: (labels, value) pairs
+    
+    Returns:
+        Lines in Prometheus text exposition format
+    """
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+class MetricsRegistry:
+    """Process-wide set of latency histograms for requests and internal stages."""
+    
+    def __init__(self):
+        self.request_duration = Histogram(
+            "goodnotes_http_request_duration_seconds",
+            "HTTP request latency by method, route and status code",
+            ("method", "route", "status"),
+        )
+        self.stage_duration = Histogram(
+            "goodnotes_stage_duration_seconds",
+            "Latency of internal stages (disk I/O, parsing, rendering, serialization)",
+            ("stage",),
+        )
+    
+    def render(self) -> List[str]:
+        """Render all histograms in Prometheus text exposition format."""
+        return self.request_duration.render() + self.stage_duration.render()
+
+
+# Singleton instance
+_metrics_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the singleton MetricsRegistry instance."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    Time a block of work as a named stage.
+    
+    The time is recorded in the stage histogram and, inside a request, added
+    to that request's stage totals.
+    
+    Args:
+        stage: Stage name, for example "fs_read" or "yaml_dump"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        get_metrics_registry().stage_duration.observe(elapsed, stage)
+        stages = _request_stages.get()
+        if stages is not None:
+            entry = stages.setdefault(stage, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def begin_request_stages() -> Token:
+    """Start collecting stage totals for the current request."""
+    return _request_stages.set({})
+
+
+def end_request_stages(token: Token) -> Dict[str, List]:
+    """
+    Stop collecting stage totals for the current request.
+    
+    Returns:
+        Mapping of stage -> [total seconds, number of times entered]
+    """
+    stages = _request_stages.get() or {}
+    _request_stages.reset(token)
+    return stages
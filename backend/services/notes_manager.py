@@ -1,15 +1,51 @@
-from datetime import datetime
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import yaml
-
-from ..config import get_config
+from ..config import Config, get_config
 from ..models.note import Note, NoteCreate, NoteUpdate
 from ..models.action_item import ActionItem
 from . import file_system as fs
 from . import markdown_converter as md
 from . import file_naming as naming
+from .aggregates import get_aggregates
+from .archive import get_archive_store
+from .concurrency import KeyedLocks, ReadWriteLock, VersionConflictError
+from .change_feed import get_change_feed
+from .coordination import get_coordinator, shared_write
+from .metrics import stage_timer
+from .similarity import get_similarity_index
+from .tracing import traced
+from .vaults import current_vault
+
+
+# Rough in-memory cost of one index entry (ID, path and dict slot)
+INDEX_ENTRY_BYTES = 400
+
+# Seconds before a failed buffered write is retried, doubling per failure
+FLUSH_RETRY_DELAY = 1.0
+FLUSH_RETRY_MAX_DELAY = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    """Latest unflushed state of a note held in the write-behind buffer."""
+    note: Note
+    action_item_ids: List[str]
+    path: Path
+    # File currently on disk for this note (None if never written)
+    disk_path: Optional[Path]
+    # Monotonic time at which the buffered state must be flushed
+    deadline: float
+    # Consecutive failed attempts to write it
+    failures: int = 0
 
 
 class NotesManager:
@@ -23,45 +59,146 @@ class NotesManager:
     
     The note index (ID -> file path mapping) is persisted to a YAML file
     for fast startup without needing to scan all markdown files.
+    
+    Saves go through a write-behind buffer: within the configured window only
+    the latest state of each note is kept in memory, and reads are served from
+    the buffer so they stay consistent. The buffer is flushed on a timer, on
+    shutdown and on explicit request, so a burst of saves costs one write.
+    
+    Date directories older than `archive_after_days` can be packed into
+    monthly archives (see ArchiveStore). Archived notes keep their original
+    paths in the index and are read from the pack transparently; saving one
+    writes it back out as a plain file and drops it from the pack.
+    
+    The index and buffer are guarded by a reader/writer lock so reads never
+    block each other; writes to a single note are serialized by a per-note
+    lock. Every note carries a version, and updates based on a stale version
+    raise VersionConflictError instead of silently overwriting.
+    
+    With several workers (`multi_worker`), saves write through, mutations
+    hold the shared notes lock, and the index is reloaded when another
+    worker's change bumped its shared generation.
     """
     
-    def __init__(self):
-        self.config = get_config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or get_config()
         self.base_directory = self.config.notes_base_directory
         self.index_file = self.config.notes_index_file
         # In-memory index of note ID -> file path for fast lookups
         self._note_index: Dict[str, Path] = {}
         self._index_loaded = False
-        self._index_dirty = False
+        # Bumped on every index change; saves skip snapshots older than the last save
+        self._index_generation = 0
+        self._saved_index_generation = -1
+        # Change tracking for HTTP validators: bumped on every note mutation,
+        # with a per-process epoch so restarts never reuse an old value
+        self._epoch = f"{time.time_ns():x}"
+        self._generation = 0
+        self._last_modified = time.time()
+        # Locking: index/buffer, individual note files, and index file writes
+        self._lock = ReadWriteLock()
+        self._note_locks = KeyedLocks()
+        self._index_save_lock = threading.Lock()
+        # Versions written by this process, so validators tell apart two
+        # writes that land within the filesystem's timestamp resolution
+        self._written_versions: Dict[str, int] = {}
+        # Write-behind buffer of note ID -> latest pending state
+        self.write_buffer_window = self.config.note_write_buffer_window
+        self._pending_writes: Dict[str, _PendingWrite] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._failed_flushes = 0
+        # Packed storage for old date directories
+        self._archive = get_archive_store()
+        # Cross-process coordination and the shared index generation last loaded;
+        # buffered saves would be invisible to the other workers
+        self._coordinator = get_coordinator()
+        self._seen_index_generation = 0
+        self._change_feed = get_change_feed()
+        self._aggregates = get_aggregates()
+        self._similarity = get_similarity_index()
+        if self._coordinator.enabled:
+            self.write_buffer_window = 0
     
     def _ensure_index_loaded(self) -> None:
-        """Load the note index from disk if not already loaded."""
-        if not self._index_loaded:
-            self._load_index()
-            self._index_loaded = True
+        """Load the note index from disk if not loaded or changed by another worker."""
+        if self._index_loaded and not self._coordinator.is_stale("notes_index", self._seen_index_generation):
+            return
+        
+        with self._lock.write():
+            generation = self._coordinator.generation("notes_index")
+            if not self._index_loaded or generation != self._seen_index_generation:
+                reload = self._index_loaded
+                self._seen_index_generation = generation
+                self._load_index()
+                self._index_loaded = True
+                if reload:
+                    self._mark_changed()
+        
+        if self._index_is_dirty():
+            with self._coordinator.exclusive("notes_index"):
+                self._save_index()
+                self._seen_index_generation = self._coordinator.bump("notes_index")
     
+    @contextmanager
+    def _shared_write(self) -> Iterator[None]:
+        """
+        Hold the cross-process notes lock around a mutation.
+        
+        Taken after any note locks. The index is reloaded first if another
+        worker changed it; afterwards the shared notes generation is bumped,
+        and the index generation too if the index was saved.
+        """
+        with self._coordinator.exclusive("notes", "notes_index"):
+            self._ensure_index_loaded()
+            generation = self._generation
+            saved_index_generation = self._saved_index_generation
+            try:
+                yield
+            finally:
+                if self._generation != generation:
+                    self._coordinator.bump("notes")
+                if self._saved_index_generation != saved_index_generation:
+                    self._seen_index_generation = self._coordinator.bump("notes_index")
+    
+    def warm_up(self) -> int:
+        """
+        Load the note index ahead of the first request.
+        
+        Returns:
+            Number of indexed notes
+        """
+        self._ensure_index_loaded()
+        with self._lock.read():
+            return len(self._note_index)
+    
+    @traced()
     def _load_index(self) -> None:
         """
         Load the note index from the YAML file.
         
         If the index file doesn't exist or is invalid, rebuild from markdown files.
+        Must be called with the write lock held.
         """
+        import yaml
+        
         self._note_index.clear()
         
         if fs.file_exists(self.index_file):
             try:
                 content = fs.read_file(self.index_file)
-                data = yaml.safe_load(content)
+                with stage_timer("yaml_load"):
+                    data = yaml.safe_load(content)
                 
                 if isinstance(data, dict) and "notes" in data:
                     for note_id, path_str in data["notes"].items():
                         path = Path(path_str)
-                        # Verify the file still exists
-                        if fs.file_exists(path):
+                        # Verify the file still exists (plain or archived)
+                        if fs.file_exists(path) or self._archive.contains(path):
                             self._note_index[note_id] = path
                     
                     # If we loaded successfully, we're done
                     if self._note_index:
+                        self._saved_index_generation = self._index_generation
                         return
             except Exception:
                 # Fall through to rebuild
@@ -70,8 +207,14 @@ class NotesManager:
         # Index file doesn't exist or is invalid - rebuild from markdown files
         self._rebuild_index()
     
+    @traced()
     def _rebuild_index(self) -> None:
-        """Rebuild the in-memory index by scanning all markdown files."""
+        """
+        Rebuild the in-memory index by scanning all markdown files.
+        
+        Must be called with the write lock held; the caller saves the index
+        after releasing it.
+        """
         self._note_index.clear()
         
         for md_path in fs.list_markdown_files(self.base_directory):
@@ -84,38 +227,165 @@ class NotesManager:
                 # Skip files that can't be parsed
                 continue
         
-        # Save the rebuilt index
-        self._save_index()
+        # Archived notes carry their IDs in the pack table
+        for note_id, path in self._archive.note_paths():
+            self._note_index.setdefault(note_id, path)
+        
+        # Mark the rebuilt index for saving
+        self._mark_index_dirty()
+        self._mark_changed()
     
+    @traced()
     def _save_index(self) -> None:
-        """Save the note index to the YAML file."""
-        # Convert Path objects to strings for YAML serialization
-        data = {
-            "notes": {
-                note_id: str(path) 
-                for note_id, path in self._note_index.items()
-            },
-            "updated_at": datetime.now().isoformat(),
-        }
+        """Save a snapshot of the note index to the YAML file."""
+        import yaml
+        
+        with self._index_save_lock:
+            with self._lock.read():
+                generation = self._index_generation
+                # Convert Path objects to strings for YAML serialization
+                notes = {}
+                for note_id, path in self._note_index.items():
+                    pending = self._pending_writes.get(note_id)
+                    if pending is not None:
+                        # Until the flush lands, point at the file actually on disk
+                        if pending.disk_path is None:
+                            continue
+                        path = pending.disk_path
+                    notes[note_id] = str(path)
         
-        content = yaml.dump(data, default_flow_style=False, allow_unicode=True)
-        fs.write_file(self.index_file, content)
-        self._index_dirty = False
+            # A concurrent save may already have written a newer snapshot
+            if generation <= self._saved_index_generation:
+                return
+            
+            data = {
+                "notes": notes,
+                "updated_at": datetime.now().isoformat(),
+            }
+            
+            with stage_timer("yaml_dump"):
+                content = yaml.dump(data, default_flow_style=False, allow_unicode=True)
+            fs.write_file(self.index_file, content)
+            self._saved_index_generation = generation
     
     def _mark_index_dirty(self) -> None:
-        """Mark the index as needing to be saved."""
-        self._index_dirty = True
-        # Auto-save immediately for data integrity
-        self._save_index()
+        """Record an index change (write lock held); callers save it afterwards."""
+        self._index_generation += 1
+    
+    def _index_is_dirty(self) -> bool:
+        """Whether the in-memory index has changes not yet saved."""
+        return self._index_generation > self._saved_index_generation
+    
+    def _mark_changed(self) -> None:
+        """Record a note mutation (write lock held)."""
+        self._generation += 1
+        self._last_modified = time.time()
+    
+    def get_validator(self) -> Tuple[str, float]:
+        """
+        Get a cheap validator for the notes collection.
+        
+        Returns:
+            Tuple of (change token, last modification time as Unix timestamp)
+        """
+        if self._coordinator.enabled:
+            return self._coordinator.validator("notes")
+        with self._lock.read():
+            return f"{self._epoch}-{self._generation}", self._last_modified
+    
+    def get_note_validator(self, note_id: str) -> Optional[Tuple[str, float]]:
+        """
+        Get a cheap validator for a single note without reading or parsing it.
+        
+        Buffered notes are identified by their version; notes on disk by the
+        file's modification time and size.
+        
+        Args:
+            note_id: The note's unique identifier
+            
+        Returns:
+            Tuple of (change token, last modification time), or None if not found
+        """
+        self._ensure_index_loaded()
+        
+        with self._lock.read():
+            pending = self._pending_writes.get(note_id)
+            file_path = self._note_index.get(note_id)
+            written_version = self._written_versions.get(note_id, 0)
+            if pending:
+                note = pending.note
+                modified = (note.updated_at or note.created_at).timestamp()
+                return f"v{note.version}", modified
+        
+        if not file_path:
+            return None
+        
+        try:
+            mtime_ns, size = fs.get_file_signature(file_path)
+        except FileNotFoundError:
+            signature = self._archive.signature(file_path)
+            if signature is None:
+                return None
+            mtime_ns, size = signature
+        
+        return f"{mtime_ns:x}-{size:x}-{written_version}", mtime_ns / 1e9
+    
+    def get_note_ids(self, date: Optional[datetime] = None) -> List[str]:
+        """
+        Get the IDs of all indexed notes without reading any files.
+        
+        Args:
+            date: Optional creation date to filter by (matched on date directory)
+            
+        Returns:
+            List of note IDs in no particular order
+        """
+        self._ensure_index_loaded()
+        
+        with self._lock.read():
+            if date is None:
+                return list(self._note_index)
+            
+            date_str = naming.generate_date_directory(date)
+            return [
+                note_id
+                for note_id, path in self._note_index.items()
+                if path.parent.name == date_str
+            ]
+    
+    def get_note_paths(self) -> List[Tuple[str, Path]]:
+        """
+        Get a snapshot of (note ID, markdown file) pairs from the index.
+        
+        Buffered changes may not be on disk yet; call `flush_pending_writes`
+        first when the files themselves are needed.
+        """
+        self._ensure_index_loaded()
+        
+        with self._lock.read():
+            return list(self._note_index.items())
     
     def _get_note_path(self, note_id: str) -> Optional[Path]:
         """Get the file path for a note by ID."""
         self._ensure_index_loaded()
-        return self._note_index.get(note_id)
+        with self._lock.read():
+            return self._note_index.get(note_id)
+    
+    @contextmanager
+    def note_lock(self, note_id: str) -> Iterator[None]:
+        """
+        Hold the write lock for a single note.
+        
+        Lets callers make a multi-step change to a note (for example checking
+        its version before touching its action items) without interleaving
+        with other writers of the same note. The lock is reentrant.
+        """
+        with self._note_locks.lock(note_id):
+            yield
     
     def _calculate_note_path(
-        self, 
-        title: str, 
+        self,
+        title: str,
         created_at: datetime,
         meeting_start_time: Optional[datetime] = None
     ) -> Path:
@@ -124,64 +394,361 @@ class NotesManager:
         filename = naming.generate_note_filename(title, meeting_start_time)
         return self.base_directory / date_dir / filename
     
-    def create_note(
-        self, 
+    @traced()
+    def _write_note_file(self, note: Note, action_item_ids: List[str], path: Path) -> None:
+        """Convert a note to markdown and write it to disk."""
+        markdown_content = md.note_to_markdown(
+            id=note.id,
+            title=note.title,
+            content=note.content,
+            created_at=note.created_at,
+            updated_at=note.updated_at,
+            attendees=note.attendees,
+            meeting_start_time=note.meeting_start_time,
+            action_item_ids=action_item_ids if action_item_ids else None,
+            version=note.version,
+        )
+        fs.write_file(path, markdown_content)
+    
+        # Saving an archived note restores it as a plain file
+        if self._archive.contains(path):
+            self._archive.remove(path)
+    
+    def _delete_note_file(self, path: Path) -> bool:
+        """Delete a note's file, whether plain or archived."""
+        deleted = fs.delete_file(path)
+        if self._archive.contains(path):
+            deleted = self._archive.remove(path) or deleted
+        return deleted
+    
+    def _read_note_file(self, path: Path) -> str:
+        """
+        Read a note's markdown, falling back to the archive.
+        
+        Raises:
+            FileNotFoundError: If the note is neither on disk nor archived
+        """
+        try:
+            return fs.read_file(path)
+        except FileNotFoundError:
+            content = self._archive.get(path)
+            if content is None:
+                raise
+            return content.decode("utf-8")
+    
+    def _buffer_write(
+        self,
+        note: Note,
+        action_item_ids: List[str],
+        path: Path,
+        old_path: Optional[Path] = None,
+        write_through: bool = False
+    ) -> None:
+        """
+        Record the latest state of a note, writing it now or on the next flush.
+        
+        Must be called with the note's lock held.
+        
+        Args:
+            note: The note state to persist (action items are not stored)
+            action_item_ids: Action item IDs to record in the frontmatter
+            path: Target file path for the note
+            old_path: Path currently recorded in the index, if any
+            write_through: Write now even if saves are buffered, so write
+                errors reach the caller
+        """
+        note = note.model_copy(update={"action_items": []})
+        path_changed = old_path != path
+        self._written_versions[note.id] = note.version
+        change_op = "created" if old_path is None else "updated"
+        
+        if self.write_buffer_window <= 0 or write_through:
+            with self._shared_write():
+                # Write the new file before repointing the index, then drop the old one
+                self._write_note_file(note, action_item_ids, path)
+                with self._lock.write():
+                    self._mark_changed()
+                    if path_changed:
+                        self._note_index[note.id] = path
+                        self._mark_index_dirty()
+                if path_changed:
+                    if old_path:
+                        self._delete_note_file(old_path)
+                    self._save_index()
+            self._aggregates.note_saved(note.id, note.created_at, note.attendees)
+            self._similarity.note_saved(note.id, note.title, note.attendees, note.content)
+            self._change_feed.record("note", note.id, change_op)
+            return
+        
+        with self._lock.write():
+            self._mark_changed()
+            self._note_index[note.id] = path
+            if path_changed:
+                self._mark_index_dirty()
+            
+            pending = self._pending_writes.get(note.id)
+            if pending:
+                # Keep the original deadline so continuous saves still flush
+                pending.note = note
+                pending.action_item_ids = action_item_ids
+                pending.path = path
+            else:
+                self._pending_writes[note.id] = _PendingWrite(
+                    note=note,
+                    action_item_ids=action_item_ids,
+                    path=path,
+                    disk_path=old_path,
+                    deadline=time.monotonic() + self.write_buffer_window,
+                )
+            
+            self._schedule_flush()
+        
+        self._aggregates.note_saved(note.id, note.created_at, note.attendees)
+        self._similarity.note_saved(note.id, note.title, note.attendees, note.content)
+        self._change_feed.record("note", note.id, change_op)
+    
+    def _schedule_flush(self) -> None:
+        """
+        Start the flush timer for the earliest pending deadline if not running.
+        
+        Must be called with the write lock held.
+        """
+        if self._flush_timer is not None or not self._pending_writes:
+            return
+        
+        next_deadline = min(p.deadline for p in self._pending_writes.values())
+        delay = max(0.0, next_deadline - time.monotonic())
+        self._flush_timer = threading.Timer(delay, self._flush_due)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _flush_due(self) -> None:
+        """Timer callback: flush pending writes whose window has elapsed."""
+        with self._lock.write():
+            self._flush_timer = None
+            now = time.monotonic()
+            due = [
+                note_id
+                for note_id, pending in self._pending_writes.items()
+                if pending.deadline <= now
+            ]
+        
+        try:
+            self._flush_notes(due)
+        finally:
+            # Also picks up entries left behind by failed writes
+            with self._lock.write():
+                self._schedule_flush()
+    
+    @traced()
+    def _flush_notes(self, note_ids: List[str]) -> int:
+        """
+        Write the buffered state of the given notes and save the index if needed.
+        
+        A note that fails to write is logged and stays buffered, due again
+        after a delay that doubles with each failure; the others still flush.
+        """
+        flushed = 0
+        for note_id in note_ids:
+            # The note lock keeps writers out until the entry leaves the buffer;
+            # readers keep seeing the buffered state until then
+            with self._note_locks.lock(note_id):
+                with self._lock.read():
+                    pending = self._pending_writes.get(note_id)
+                if pending is None:
+                    continue
+                
+                try:
+                    self._write_note_file(pending.note, pending.action_item_ids, pending.path)
+                except Exception:
+                    logger.exception("Failed to write buffered note %s to %s", note_id, pending.path)
+                    with self._lock.write():
+                        pending.failures += 1
+                        self._failed_flushes += 1
+                        delay = min(FLUSH_RETRY_MAX_DELAY, FLUSH_RETRY_DELAY * 2 ** (pending.failures - 1))
+                        pending.deadline = time.monotonic() + delay
+                    continue
+                
+                if pending.disk_path and pending.disk_path != pending.path:
+                    self._delete_note_file(pending.disk_path)
+                
+                with self._lock.write():
+                    self._pending_writes.pop(note_id, None)
+                    # Saved indexes held the old path until now
+                    if pending.disk_path != pending.path:
+                        self._mark_index_dirty()
+                flushed += 1
+        
+        if self._index_is_dirty():
+            try:
+                self._save_index()
+            except Exception:
+                # Stays dirty, so the next flush or save retries
+                logger.exception("Failed to save the note index to %s", self.index_file)
+        
+        return flushed
+    
+    def flush_pending_writes(self) -> int:
+        """
+        Write all buffered note changes to disk immediately.
+        
+        Returns:
+            Number of notes written
+        """
+        with self._lock.write():
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            note_ids = list(self._pending_writes)
+        
+        try:
+            return self._flush_notes(note_ids)
+        finally:
+            # Retry whatever failed to write
+            with self._lock.write():
+                self._schedule_flush()
+    
+    def shutdown(self) -> None:
+        """Flush any buffered writes before the process exits."""
+        self.flush_pending_writes()
+    
+    def _note_from_data(self, note_data: Dict[str, Any]) -> Note:
+        """Build a Note from parsed markdown data (without action items)."""
+        with stage_timer("model_build"):
+            return Note(
+                id=note_data["id"],
+                title=note_data["title"],
+                content=note_data["content"],
+                attendees=note_data.get("attendees"),
+                meeting_start_time=note_data.get("meeting_start_time"),
+                created_at=note_data["created_at"],
+                updated_at=note_data.get("updated_at"),
+                version=note_data.get("version", 1),
+                action_items=[],  # Will be populated by API layer
+            )
+    
+    @traced()
+    def _read_note_data(self, note_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read and parse a note's markdown file.
+        
+        Retries once if the file was moved by a concurrent rename between
+        looking up its path and reading it.
+        """
+        for _ in range(2):
+            file_path = self._get_note_path(note_id)
+            if not file_path:
+                return None
+            
+            try:
+                content = self._read_note_file(file_path)
+            except FileNotFoundError:
+                if self._get_note_path(note_id) == file_path:
+                    return None
+                continue
+            
+            return md.markdown_to_note(content)
+        
+        return None
+    
+    def new_note(
+        self,
         note_data: NoteCreate,
         action_items: Optional[List[ActionItem]] = None
     ) -> Note:
         """
-        Create a new note and save it to disk.
+        Build a new note with a generated ID and timestamp without saving it.
         
         Args:
             note_data: Note creation data
-            action_items: Optional list of already-created action items to associate
+            action_items: Optional list of action items to associate
             
         Returns:
-            The created note with generated ID and timestamps
+            The new, unsaved note
         """
-        self._ensure_index_loaded()
         now = datetime.now()
-        
-        # Generate note ID
-        note_id = naming.generate_note_id(note_data.title, now)
-        
-        # Prepare action item IDs for markdown
-        action_item_ids = [ai.id for ai in (action_items or [])]
-        
-        # Convert to markdown
-        markdown_content = md.note_to_markdown(
-            id=note_id,
+        return Note(
+            id=naming.generate_note_id(note_data.title, now),
             title=note_data.title,
             content=note_data.content,
-            created_at=now,
             attendees=note_data.attendees,
             meeting_start_time=note_data.meeting_start_time,
-            action_item_ids=action_item_ids if action_item_ids else None,
+            created_at=now,
+            action_items=action_items or [],
         )
+    
+    @traced()
+    def add_note(self, note: Note, write_through: bool = False) -> Note:
+        """
+        Save a note built by `new_note`, recording its action item IDs.
+        
+        Args:
+            note: The new note
+            write_through: Write the file and index now instead of buffering,
+                so a failed write raises here
+            
+        Returns:
+            The saved note
+        """
+        self._ensure_index_loaded()
         
-        # Calculate file path and write
+        # Calculate file path and write (or buffer) the note and index
         file_path = self._calculate_note_path(
-            note_data.title, 
-            now, 
-            note_data.meeting_start_time
+            note.title,
+            note.created_at,
+            note.meeting_start_time
         )
-        fs.write_file(file_path, markdown_content)
+        action_item_ids = [ai.id for ai in note.action_items]
+        with self._note_locks.lock(note.id):
+            self._buffer_write(note, action_item_ids, file_path, write_through=write_through)
         
-        # Update and save index
-        self._note_index[note_id] = file_path
-        self._mark_index_dirty()
+        return note
+    
+    @traced()
+    def create_note(
+        self,
+        note_data: NoteCreate,
+        action_items: Optional[List[ActionItem]] = None
+    ) -> Note:
+        """
+        Create a new note and save it to disk.
         
-        # Return the created note
-        return Note(
-            id=note_id,
-            title=note_data.title,
-            content=note_data.content,
-            attendees=note_data.attendees,
-            meeting_start_time=note_data.meeting_start_time,
-            created_at=now,
-            action_items=action_items or [],
-        )
+        Args:
+            note_data: Note creation data
+            action_items: Optional list of already-created action items to associate
+            
+        Returns:
+            The created note with generated ID and timestamps
+        """
+        return self.add_note(self.new_note(note_data, action_items))
+    
+    @traced()
+    @shared_write
+    def add_imported_notes(self, note_paths: Dict[str, Path]) -> None:
+        """
+        Register note files written directly to disk, saving the index once.
+        
+        Used by bulk import, which writes the files itself instead of going
+        through `add_note` one note (and one index save) at a time.
+        
+        Args:
+            note_paths: Mapping of note ID -> written markdown file
+        """
+        if not note_paths:
+            return
+        
+        self._ensure_index_loaded()
+        with self._lock.write():
+            self._note_index.update(note_paths)
+            self._mark_index_dirty()
+            self._mark_changed()
+        
+        self._save_index()
+        feed = self._change_feed
+        for note_id in note_paths:
+            feed.record("note", note_id, "created")
     
+    @traced()
     def get_note(self, note_id: str) -> Optional[Note]:
         """
         Get a note by ID.
@@ -192,28 +759,25 @@ class NotesManager:
         Returns:
             The note if found, None otherwise
         """
-        file_path = self._get_note_path(note_id)
-        if not file_path or not fs.file_exists(file_path):
-            return None
+        self._ensure_index_loaded()
+        
+        # Serve unflushed changes from the write-behind buffer
+        with self._lock.read():
+            pending = self._pending_writes.get(note_id)
+            if pending:
+                return pending.note.model_copy()
         
         try:
-            content = fs.read_file(file_path)
-            note_data = md.markdown_to_note(content)
+            note_data = self._read_note_data(note_id)
+            if note_data is None:
+                return None
             
             # Note: Action items will be fetched separately and injected by the API layer
-            return Note(
-                id=note_data["id"],
-                title=note_data["title"],
-                content=note_data["content"],
-                attendees=note_data.get("attendees"),
-                meeting_start_time=note_data.get("meeting_start_time"),
-                created_at=note_data["created_at"],
-                updated_at=note_data.get("updated_at"),
-                action_items=[],  # Will be populated by API layer
-            )
+            return self._note_from_data(note_data)
         except Exception:
             return None
     
+    @traced()
     def get_all_notes(self) -> List[Note]:
         """
         Get all notes.
@@ -222,9 +786,11 @@ class NotesManager:
             List of all notes, sorted by created_at descending
         """
         self._ensure_index_loaded()
-        notes: List[Note] = []
+        with self._lock.read():
+            note_ids = list(self._note_index)
         
-        for note_id in self._note_index:
+        notes: List[Note] = []
+        for note_id in note_ids:
             note = self.get_note(note_id)
             if note:
                 notes.append(note)
@@ -233,6 +799,7 @@ class NotesManager:
         notes.sort(key=lambda n: n.created_at, reverse=True)
         return notes
     
+    @traced()
     def get_notes_by_date(self, date: datetime) -> List[Note]:
         """
         Get all notes for a specific date.
@@ -246,34 +813,39 @@ class NotesManager:
         date_str = naming.generate_date_directory(date)
         date_dir = self.base_directory / date_str
         
-        if not fs.directory_exists(date_dir):
-            return []
+        # Buffered notes for this date take precedence over their files
+        with self._lock.read():
+            pending_notes: Dict[str, Note] = {
+                note_id: pending.note.model_copy()
+                for note_id, pending in self._pending_writes.items()
+                if naming.generate_date_directory(pending.note.created_at) == date_str
+            }
         
-        notes: List[Note] = []
-        for md_path in fs.list_markdown_files(date_dir, recursive=False):
+        paths: List[Path] = []
+        if fs.directory_exists(date_dir):
+            paths.extend(fs.list_markdown_files(date_dir, recursive=False))
+        paths.extend(path for _, path in self._archive.note_paths(date_str))
+        
+        notes: Dict[str, Note] = {}
+        for md_path in paths:
             try:
-                content = fs.read_file(md_path)
+                content = self._read_note_file(md_path)
                 note_data = md.markdown_to_note(content)
-                note = Note(
-                    id=note_data["id"],
-                    title=note_data["title"],
-                    content=note_data["content"],
-                    attendees=note_data.get("attendees"),
-                    meeting_start_time=note_data.get("meeting_start_time"),
-                    created_at=note_data["created_at"],
-                    updated_at=note_data.get("updated_at"),
-                    action_items=[],
-                )
-                notes.append(note)
+                if note_data["id"] not in pending_notes:
+                    notes[note_data["id"]] = self._note_from_data(note_data)
             except Exception:
                 continue
         
-        notes.sort(key=lambda n: n.created_at, reverse=True)
-        return notes
+        notes.update(pending_notes)
+        
+        result = list(notes.values())
+        result.sort(key=lambda n: n.created_at, reverse=True)
+        return result
     
+    @traced()
     def update_note(
-        self, 
-        note_id: str, 
+        self,
+        note_id: str,
         update_data: NoteUpdate,
         action_items: Optional[List[ActionItem]] = None
     ) -> Optional[Note]:
@@ -287,68 +859,59 @@ class NotesManager:
             
         Returns:
             The updated note if found, None otherwise
-        """
-        existing_note = self.get_note(note_id)
-        if not existing_note:
-            return None
         
-        old_path = self._get_note_path(note_id)
-        now = datetime.now()
+        Raises:
+            VersionConflictError: If update_data.version is set and stale
+        """
+        with self._note_locks.lock(note_id):
+            existing_note = self.get_note(note_id)
+            if not existing_note:
+                return None
         
-        # Merge updates with existing data
-        title = update_data.title if update_data.title is not None else existing_note.title
-        content = update_data.content if update_data.content is not None else existing_note.content
-        attendees = update_data.attendees if update_data.attendees is not None else existing_note.attendees
-        meeting_start_time = (
-            update_data.meeting_start_time 
-            if update_data.meeting_start_time is not None 
-            else existing_note.meeting_start_time
-        )
+            if update_data.version is not None and update_data.version != existing_note.version:
+                raise VersionConflictError("Note", note_id, update_data.version, existing_note.version)
         
-        # Prepare action item IDs
-        action_item_ids = [ai.id for ai in (action_items or [])]
+            old_path = self._get_note_path(note_id)
+            now = datetime.now()
         
-        # Convert to markdown
-        markdown_content = md.note_to_markdown(
-            id=note_id,
-            title=title,
-            content=content,
-            created_at=existing_note.created_at,
-            updated_at=now,
-            attendees=attendees,
-            meeting_start_time=meeting_start_time,
-            action_item_ids=action_item_ids if action_item_ids else None,
-        )
+            # Merge updates with existing data
+            title = update_data.title if update_data.title is not None else existing_note.title
+            content = update_data.content if update_data.content is not None else existing_note.content
+            attendees = update_data.attendees if update_data.attendees is not None else existing_note.attendees
+            meeting_start_time = (
+                update_data.meeting_start_time
+                if update_data.meeting_start_time is not None
+                else existing_note.meeting_start_time
+            )
         
-        # Calculate new path (might change if title changed)
-        new_path = self._calculate_note_path(
-            title,
-            existing_note.created_at,
-            meeting_start_time
-        )
+            # Prepare action item IDs
+            action_item_ids = [ai.id for ai in (action_items or [])]
         
-        # If path changed, delete old file
-        if old_path and old_path != new_path:
-            fs.delete_file(old_path)
+            note = Note(
+                id=note_id,
+                title=title,
+                content=content,
+                attendees=attendees,
+                meeting_start_time=meeting_start_time,
+                created_at=existing_note.created_at,
+                updated_at=now,
+                version=existing_note.version + 1,
+                action_items=action_items or [],
+            )
         
-        # Write updated file
-        fs.write_file(new_path, markdown_content)
+            # Calculate new path (might change if title changed)
+            new_path = self._calculate_note_path(
+                title,
+                existing_note.created_at,
+                meeting_start_time
+            )
         
-        # Update and save index
-        self._note_index[note_id] = new_path
-        self._mark_index_dirty()
+            # Write (or buffer) the note; the old file is removed if the path changed
+            self._buffer_write(note, action_item_ids, new_path, old_path)
         
-        return Note(
-            id=note_id,
-            title=title,
-            content=content,
-            attendees=attendees,
-            meeting_start_time=meeting_start_time,
-            created_at=existing_note.created_at,
-            updated_at=now,
-            action_items=action_items or [],
-        )
+        return note
     
+    @traced()
     def delete_note(self, note_id: str) -> bool:
         """
         Delete a note.
@@ -359,17 +922,132 @@ class NotesManager:
         Returns:
             True if note was deleted, False if not found
         """
-        file_path = self._get_note_path(note_id)
-        if not file_path:
-            return False
+        self._ensure_index_loaded()
         
-        deleted = fs.delete_file(file_path)
-        if deleted:
-            del self._note_index[note_id]
-            self._mark_index_dirty()
+        with self._note_locks.lock(note_id), self._shared_write():
+            with self._lock.write():
+                file_path = self._note_index.get(note_id)
+                if not file_path:
+                    return False
         
-        return deleted
+                # Drop any buffered state; the file on disk may be at an older path
+                pending = self._pending_writes.pop(note_id, None)
+                if pending:
+                    file_path = pending.disk_path
+            
+            deleted = self._delete_note_file(file_path) if file_path else False
+            if not (deleted or pending):
+                return False
+            
+            with self._lock.write():
+                self._note_index.pop(note_id, None)
+                self._written_versions.pop(note_id, None)
+                self._mark_index_dirty()
+                self._mark_changed()
+        
+            self._save_index()
+        
+        self._aggregates.note_deleted(note_id)
+        self._similarity.note_deleted(note_id)
+        self._change_feed.record("note", note_id, "deleted")
+        return True
+    
+    @traced()
+    def archive_old_notes(self, older_than_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Pack date directories older than a given age into monthly archives.
+        
+        Pending writes are flushed first. Each month's notes are locked while
+        they are packed, so a concurrent save either lands before (and is
+        packed) or after (and unpacks the note again). Emptied date
+        directories are removed.
+        
+        Args:
+            older_than_days: Minimum age of a date directory (default: config.archive_after_days)
+            
+        Returns:
+            Number of notes archived and of date directories emptied
+        """
+        days = self.config.archive_after_days if older_than_days is None else older_than_days
+        if days <= 0:
+            return {"notes": 0, "directories": 0}
+        
+        self._ensure_index_loaded()
+        self.flush_pending_writes()
+        cutoff = naming.generate_date_directory(datetime.now() - timedelta(days=days))
+        
+        # Plain files in old date directories, grouped by month
+        by_month: Dict[str, List[Tuple[str, Path]]] = {}
+        with self._lock.read():
+            for note_id, path in self._note_index.items():
+                date_dir = path.parent.name
+                if (
+                    len(date_dir) == 8 and date_dir.isdigit() and date_dir < cutoff
+                    and path.parent.parent == self.base_directory
+                ):
+                    by_month.setdefault(date_dir[:6], []).append((note_id, path))
+        
+        archived = 0
+        directories = set()
+        for month, candidates in sorted(by_month.items()):
+            with ExitStack() as stack:
+                for note_id, _ in sorted(candidates):
+                    stack.enter_context(self._note_locks.lock(note_id))
+                
+                # Skip notes saved or moved since the snapshot
+                with self._lock.read():
+                    files = [
+                        (note_id, path)
+                        for note_id, path in candidates
+                        if note_id not in self._pending_writes
+                        and self._note_index.get(note_id) == path
+                        and fs.file_exists(path)
+                    ]
+                
+                archived += self._archive.add(files)
+                for _, path in files:
+                    if self._archive.contains(path):
+                        fs.delete_file(path)
+                        directories.add(path.parent)
+        
+        emptied = 0
+        for directory in directories:
+            try:
+                directory.rmdir()
+                emptied += 1
+            except OSError:
+                # Not empty (e.g. files that aren't indexed notes)
+                pass
+        
+        return {"notes": archived, "directories": emptied}
+    
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by the index and write buffer (loads nothing)."""
+        with self._lock.read():
+            buffered = sum(len(p.note.content) for p in self._pending_writes.values())
+            entries = len(self._note_index) + len(self._pending_writes)
+        return entries * INDEX_ENTRY_BYTES + buffered
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index, write-buffer and archive sizes.
+        
+        Returns:
+            Number of indexed notes, of notes waiting to be flushed, of failed
+            buffered writes (retried) and of archived notes
+        """
+        self._ensure_index_loaded()
+        
+        with self._lock.read():
+            stats = {
+                "indexed_notes": len(self._note_index),
+                "pending_writes": len(self._pending_writes),
+                "failed_flushes": self._failed_flushes,
+            }
+        stats["archived_notes"] = self._archive.stats()["files"]
+        return stats
     
+    @traced()
     def get_action_item_ids(self, note_id: str) -> List[str]:
         """
         Get the action item IDs associated with a note.
@@ -380,17 +1058,22 @@ class NotesManager:
         Returns:
             List of action item IDs
         """
-        file_path = self._get_note_path(note_id)
-        if not file_path or not fs.file_exists(file_path):
-            return []
+        self._ensure_index_loaded()
+        
+        with self._lock.read():
+            pending = self._pending_writes.get(note_id)
+            if pending:
+                return list(pending.action_item_ids)
         
         try:
-            content = fs.read_file(file_path)
-            note_data = md.markdown_to_note(content)
+            note_data = self._read_note_data(note_id)
+            if note_data is None:
+                return []
             return note_data.get("action_item_ids", [])
         except Exception:
             return []
     
+    @traced()
     def rebuild_index_from_files(self) -> int:
         """
         Force rebuild the index by scanning all markdown files.
@@ -400,18 +1083,19 @@ class NotesManager:
         Returns:
             Number of notes indexed
         """
-        self._rebuild_index()
-        self._index_loaded = True
-        return len(self._note_index)
-
-
-# Singleton instance
-_notes_manager: Optional[NotesManager] = None
+        self.flush_pending_writes()
+        with self._shared_write():
+            with self._lock.write():
+                self._rebuild_index()
+                self._index_loaded = True
+                count = len(self._note_index)
+        
+            self._save_index()
+        self._aggregates.invalidate()
+        self._similarity.invalidate()
+        return count
 
 
 def get_notes_manager() -> NotesManager:
-    """Get the singleton NotesManager instance."""
-    global _notes_manager
-    if _notes_manager is None:
-        _notes_manager = NotesManager()
-    return _notes_manager
+    """Get the NotesManager of the current vault."""
+    return current_vault().service("notes_manager", NotesManager)
@@ -0,0 +1,85 @@
+import cProfile
+import pstats
+import threading
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Callable, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class RequestProfile:
+    """
+    cProfile data for a single request.
+    
+    The blocking work of a request runs on worker threads, and cProfile only
+    sees the thread it is enabled on. Each worker call made for the request is
+    therefore profiled separately and the results are merged when dumped.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: List[cProfile.Profile] = []
+    
+    def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a callable under cProfile, keeping its profile for this request."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active; run without profiling
+            return func(*args, **kwargs)
+        
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._profiles.append(profiler)
+    
+    def dump(self, path: Path) -> bool:
+        """
+        Write the merged profile in pstats format (viewable with snakeviz etc.).
+        
+        Args:
+            path: Destination file
+        
+        Returns:
+            True if anything was profiled and written
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pstats.Stats(*profiles).dump_stats(str(path))
+        return True
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "goodnotes_request_profile", default=None
+)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Get the profile of the request being handled, if it is being profiled."""
+    return _current_profile.get()
+
+
+def start_profile() -> Token:
+    """Start profiling the current request."""
+    return _current_profile.set(RequestProfile())
+
+
+def stop_profile(token: Token) -> Optional[RequestProfile]:
+    """
+    Stop profiling the current request.
+    
+    Returns:
+        The collected profile
+    """
+    profile = _current_profile.get()
+    _current_profile.reset(token)
+    return profile
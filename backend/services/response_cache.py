@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .vaults import current_vault
+
+
+class ResponseCache:
+    """
+    LRU cache of pre-encoded response bodies.
+    
+    Entries are keyed by the identity of a representation (for example a note
+    ID or a list query) and tagged with the validator (ETag) they were built
+    for. A lookup only hits if the caller's current validator matches, so a
+    changed record replaces its entry instead of leaving stale copies behind.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        # Encoded bytes held, for the vault memory budget
+        self._bytes = 0
+    
+    @staticmethod
+    def _size(value: Any) -> int:
+        """Encoded size of a cached value (bytes, or a tuple holding bytes)."""
+        if isinstance(value, (bytes, str)):
+            return len(value)
+        if isinstance(value, tuple):
+            return sum(len(part) for part in value if isinstance(part, (bytes, str)))
+        return 0
+    
+    def get(self, key: str, etag: str) -> Optional[Any]:
+        """
+        Get a cached value if it was built for the given validator.
+        
+        Args:
+            key: Representation identity
+            etag: Current validator of the representation
+            
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self._misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+    
+    def put(self, key: str, etag: str, value: Any) -> None:
+        """
+        Store a value built for the given validator.
+        
+        Args:
+            key: Representation identity
+            etag: Validator the value was built for
+            value: Cached value (typically encoded bytes)
+        """
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old[1])
+            self._entries[key] = (etag, value)
+            self._bytes += self._size(value)
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= self._size(entry[1])
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def memory_estimate(self) -> int:
+        """Bytes of encoded responses held."""
+        with self._lock:
+            return self._bytes
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache size and hit counters.
+        
+        Returns:
+            Entry count, capacity, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the ResponseCache of the current vault."""
+    return current_vault().service(
+        "response_cache",
+        lambda config: ResponseCache(config.response_cache_entries)
+    )
@@ -1,11 +1,15 @@
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-import yaml
+from typing import Any, Dict, Iterator, Optional
 
 from ..config import get_config
 from ..models.settings import Settings, SettingsUpdate
 from . import file_system as fs
+from .concurrency import ReadWriteLock
+from .coordination import Coordinator, shared_write
+from .metrics import stage_timer
+from .tracing import traced
+from .vaults import get_vault_registry
 
 
 class SettingsManager:
@@ -18,15 +22,43 @@ class SettingsManager:
         self.storage_file = self.config.settings_file
         self._settings: Optional[Dict[str, Any]] = None
         self._loaded = False
+        self._lock = ReadWriteLock()
+        # Cross-process coordination (settings are shared by all vaults)
+        # and the shared generation last loaded
+        self._coordinator = Coordinator(self.config.coordination_directory, self.config.multi_worker)
+        self._seen_generation = 0
     
     def _ensure_loaded(self) -> None:
-        """Load settings from disk if not already loaded."""
-        if not self._loaded:
-            self._load_from_disk()
-            self._loaded = True
+        """Load settings from disk if not loaded or changed by another worker."""
+        if self._loaded and not self._coordinator.is_stale("settings", self._seen_generation):
+            return
+        
+        with self._lock.write():
+            generation = self._coordinator.generation("settings")
+            if not self._loaded or generation != self._seen_generation:
+                self._seen_generation = generation
+                self._load_from_disk()
+                self._loaded = True
+    
+    @contextmanager
+    def _shared_write(self) -> Iterator[None]:
+        """Hold the cross-process settings lock around an update and publish it."""
+        with self._coordinator.exclusive("settings"):
+            self._ensure_loaded()
+            try:
+                yield
+            finally:
+                self._seen_generation = self._coordinator.bump("settings")
+    
+    def warm_up(self) -> None:
+        """Load settings ahead of the first request."""
+        self._ensure_loaded()
     
+    @traced()
     def _load_from_disk(self) -> None:
         """Load settings from the YAML file."""
+        import yaml
+        
         if not fs.file_exists(self.storage_file):
             # Initialize with defaults
             self._settings = {
@@ -39,7 +71,8 @@ class SettingsManager:
         
         try:
             content = fs.read_file(self.storage_file)
-            self._settings = yaml.safe_load(content)
+            with stage_timer("yaml_load"):
+                self._settings = yaml.safe_load(content)
         except Exception:
             # Use defaults if file can't be read
             self._settings = {
@@ -48,8 +81,11 @@ class SettingsManager:
                 "elasticsearch_enabled": self.config.elasticsearch_enabled,
             }
     
+    @traced()
     def _save_to_disk(self) -> None:
         """Save settings to the YAML file."""
+        import yaml
+        
         if self._settings is None:
             return
         
@@ -58,9 +94,11 @@ class SettingsManager:
             "updated_at": datetime.now().isoformat(),
         }
         
-        content = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        with stage_timer("yaml_dump"):
+            content = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
         fs.write_file(self.storage_file, content)
     
+    @traced()
     def get_settings(self) -> Settings:
         """
         Get current application settings.
@@ -70,12 +108,15 @@ class SettingsManager:
         """
         self._ensure_loaded()
         
-        return Settings(
-            notes_directory=self._settings.get("notes_directory"),
-            elasticsearch_url=self._settings.get("elasticsearch_url"),
-            elasticsearch_enabled=self._settings.get("elasticsearch_enabled", False),
-        )
+        with self._lock.read():
+            return Settings(
+                notes_directory=self._settings.get("notes_directory"),
+                elasticsearch_url=self._settings.get("elasticsearch_url"),
+                elasticsearch_enabled=self._settings.get("elasticsearch_enabled", False),
+            )
     
+    @traced()
+    @shared_write
     def update_settings(self, update_data: SettingsUpdate) -> Settings:
         """
         Update application settings.
@@ -88,17 +129,25 @@ class SettingsManager:
         """
         self._ensure_loaded()
         
-        if update_data.notes_directory is not None:
-            self._settings["notes_directory"] = update_data.notes_directory
+        with self._lock.write():
+            notes_directory = self._settings.get("notes_directory")
+            if update_data.notes_directory is not None:
+                self._settings["notes_directory"] = update_data.notes_directory
+        
+            if update_data.elasticsearch_url is not None:
+                self._settings["elasticsearch_url"] = update_data.elasticsearch_url
         
-        if update_data.elasticsearch_url is not None:
-            self._settings["elasticsearch_url"] = update_data.elasticsearch_url
+            if update_data.elasticsearch_enabled is not None:
+                self._settings["elasticsearch_enabled"] = update_data.elasticsearch_enabled
+        
+            self._save_to_disk()
+            settings = self.get_settings()
         
-        if update_data.elasticsearch_enabled is not None:
-            self._settings["elasticsearch_enabled"] = update_data.elasticsearch_enabled
+        if settings.notes_directory != notes_directory:
+            # The default vault is rebuilt on the new directory
+            get_vault_registry().reset_default()
         
-        self._save_to_disk()
-        return self.get_settings()
+        return settings
 
 
 # Singleton instance
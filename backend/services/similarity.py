@@ -0,0 +1,482 @@
+import html
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from ..config import Config
+from .derived_state import DerivedState
+from .metrics import stage_timer
+from .vaults import current_vault
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Words of two or more letters or digits, once markup is stripped
+TOKEN_PATTERN = re.compile(r"[^\W_]{2,}")
+MARKUP_PATTERN = re.compile(r"<[^>]*>")
+
+STOP_WORDS = frozenset("""
+    a about an and are as at be been but by can do for from had has have he
+    her his how if in into is it its me my no not of on or our she so that
+    the their them then there these they this to up us was we were what when
+    which who will with you your
+""".split())
+
+# A title word counts as much as three body words, an attendee as two
+TITLE_WEIGHT = 3.0
+ATTENDEE_WEIGHT = 2.0
+
+# Attendee terms are whole names, kept apart from words
+ATTENDEE_PREFIX = "@"
+
+# Rough in-memory cost of one stored term (vector and postings entries)
+TERM_BYTES = 40
+
+# Postings are rebuilt in the background once this many notes changed
+# since the last build (or this fraction of all notes, if more)
+COMPACT_MIN_CHANGES = 256
+COMPACT_FRACTION = 0.02
+
+
+def note_terms(
+    title: str,
+    attendees: Optional[Iterable[str]],
+    content: str
+) -> Dict[str, float]:
+    """
+    Weighted term frequencies of a note's title, attendees and body.
+    
+    Counts are scaled sublinearly (1 + log count), so a word repeated
+    throughout a long note doesn't outweigh everything else.
+    """
+    counts: Counter = Counter()
+    text = html.unescape(MARKUP_PATTERN.sub(" ", content or "")).lower()
+    for word in TOKEN_PATTERN.findall(text):
+        if word not in STOP_WORDS:
+            counts[word] += 1
+    for word in TOKEN_PATTERN.findall((title or "").lower()):
+        if word not in STOP_WORDS:
+            counts[word] += TITLE_WEIGHT
+    for name in attendees or ():
+        name = " ".join(name.lower().split())
+        if name:
+            counts[ATTENDEE_PREFIX + name] += ATTENDEE_WEIGHT
+    return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+
+def _idf(document_frequency: "np.ndarray", documents: int) -> "np.ndarray":
+    """Smoothed inverse document frequency of every column."""
+    import numpy as np
+    
+    return np.log((1 + documents) / (1 + document_frequency)) + 1
+
+
+@dataclass(frozen=True)
+class _Postings:
+    """
+    Note vectors in column-major (inverted) form, as built at one point.
+    
+    Postings of column c are `rows[indptr[c]:indptr[c + 1]]` with the
+    matching raw term weights. Row norms use the IDF at build time.
+    """
+    indptr: "np.ndarray"
+    rows: "np.ndarray"
+    weights: "np.ndarray"
+    norms: "np.ndarray"
+    
+    @classmethod
+    def build(
+        cls,
+        vectors: List[Optional[Tuple["np.ndarray", "np.ndarray"]]],
+        document_frequency: "np.ndarray",
+        documents: int
+    ) -> "_Postings":
+        import numpy as np
+        
+        live = [(row, vector) for row, vector in enumerate(vectors) if vector is not None]
+        if not live:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(np.zeros(len(document_frequency) + 1, dtype=np.int64), empty, empty.astype(np.float64), empty.astype(np.float64))
+        
+        lengths = np.fromiter((len(columns) for _, (columns, _) in live), dtype=np.int64, count=len(live))
+        rows = np.repeat(np.fromiter((row for row, _ in live), dtype=np.int64, count=len(live)), lengths)
+        columns = np.concatenate([columns for _, (columns, _) in live])
+        weights = np.concatenate([weights for _, (_, weights) in live])
+        
+        idf = _idf(document_frequency, documents)
+        values = weights * idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(vectors)))
+        
+        # Stable, so each column's rows stay ascending and scoring scatters in order
+        order = np.argsort(columns, kind="stable")
+        indptr = np.zeros(len(document_frequency) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(document_frequency)), out=indptr[1:])
+        return cls(indptr, rows[order], weights[order], norms)
+
+
+class SimilarityIndex(DerivedState):
+    """
+    Sparse TF-IDF vectors of a vault's notes, for related-note lookups.
+    
+    Each note is a vector of weighted term frequencies over its title,
+    attendees and body. Note saves and deletes replace or drop just that
+    note's vector and adjust the document frequencies, so writes never
+    re-scan the vault.
+    
+    Lookups score notes against one note in a batch: the vectors are kept
+    in inverted (column-major) form, so only the postings of the note's own
+    terms are gathered and summed per note with NumPy (`bincount`), and the
+    cost grows with how common its terms are rather than with the vault.
+    Notes changed since the postings were built are scored from their
+    current vectors instead; once enough have changed, the postings are
+    rebuilt in the background. Document norms are refreshed with them.
+    
+    Saved to `similarity.npz` (see DerivedState).
+    """
+    
+    storage_name = "similarity.npz"
+    
+    def __init__(self, config: Config):
+        super().__init__(config)
+        # Term -> column, and each column's document frequency (None until the
+        # first term, so constructing the index doesn't load NumPy)
+        self._vocabulary: Dict[str, int] = {}
+        self._document_frequency: Optional["np.ndarray"] = None
+        # Row of each note, its (columns, weights) vector and the rows freed by deletes
+        self._rows: Dict[str, int] = {}
+        self._row_notes: List[Optional[str]] = []
+        self._vectors: List[Optional[Tuple["np.ndarray", "np.ndarray"]]] = []
+        self._free_rows: List[int] = []
+        # Terms across all vectors, for memory estimates without a scan
+        self._stored_terms = 0
+        # Inverted vectors (None until first needed) and the rows changed
+        # since they were built, with the change sequence of each
+        self._postings: Optional[_Postings] = None
+        self._changed_rows: Dict[int, int] = {}
+        self._sequence = 0
+        # Bumped whenever the vectors are replaced wholesale, so a
+        # background build of the old ones is discarded
+        self._epoch = 0
+        self._compacting = False
+    
+    def _clear(self) -> None:
+        self._vocabulary = {}
+        self._document_frequency = None
+        self._rows = {}
+        self._row_notes = []
+        self._vectors = []
+        self._free_rows = []
+        self._stored_terms = 0
+        self._postings = None
+        self._changed_rows = {}
+        self._epoch += 1
+    
+    def _columns(self, terms: Iterable[str]) -> "np.ndarray":
+        """Columns of terms, adding new ones to the vocabulary (lock held)."""
+        import numpy as np
+        
+        vocabulary = self._vocabulary
+        columns = np.fromiter(
+            (vocabulary.setdefault(term, len(vocabulary)) for term in terms),
+            dtype=np.int64,
+        )
+        size = 0 if self._document_frequency is None else len(self._document_frequency)
+        if len(vocabulary) > size:
+            grown = np.zeros(max(len(vocabulary), 2 * size), dtype=np.int64)
+            if size:
+                grown[:size] = self._document_frequency
+            self._document_frequency = grown
+        return columns
+    
+    def _row_changed(self, row: int) -> None:
+        self._sequence += 1
+        self._changed_rows[row] = self._sequence
+    
+    def _set_vector(self, note_id: str, terms: Dict[str, float]) -> None:
+        """Replace a note's vector (lock held)."""
+        import numpy as np
+        
+        self._drop_vector(note_id)
+        columns = self._columns(terms)
+        weights = np.fromiter(terms.values(), dtype=np.float64, count=len(terms))
+        self._document_frequency[columns] += 1
+        
+        row = self._free_rows.pop() if self._free_rows else len(self._vectors)
+        if row == len(self._vectors):
+            self._vectors.append(None)
+            self._row_notes.append(None)
+        self._vectors[row] = (columns, weights)
+        self._stored_terms += len(columns)
+        self._row_notes[row] = note_id
+        self._rows[note_id] = row
+        self._row_changed(row)
+    
+    def _drop_vector(self, note_id: str) -> bool:
+        """Remove a note's vector (lock held)."""
+        row = self._rows.pop(note_id, None)
+        if row is None:
+            return False
+        columns, _ = self._vectors[row]
+        self._document_frequency[columns] -= 1
+        self._stored_terms -= len(columns)
+        self._vectors[row] = None
+        self._row_notes[row] = None
+        self._free_rows.append(row)
+        self._row_changed(row)
+        return True
+    
+    def note_saved(
+        self,
+        note_id: str,
+        title: str,
+        attendees: Optional[Iterable[str]],
+        content: str
+    ) -> None:
+        """
+        Index a created or updated note.
+        
+        Args:
+            note_id: The note's unique identifier
+            title: The note's title
+            attendees: The note's attendees
+            content: The note's body
+        """
+        terms = note_terms(title, attendees, content)
+        with self._lock:
+            self._ensure_loaded()
+            if not self._stale:
+                self._set_vector(note_id, terms)
+            self._mark_changed()
+    
+    def note_deleted(self, note_id: str) -> None:
+        """Drop a deleted note from the index."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._stale or self._drop_vector(note_id):
+                self._mark_changed()
+    
+    def _ensure_postings(self) -> _Postings:
+        """
+        Get the postings, building them now if there are none (lock held).
+        
+        Starts a background rebuild when too many rows changed since the build.
+        """
+        if self._postings is None:
+            with stage_timer("similarity_postings"):
+                self._postings = _Postings.build(self._vectors, self._document_frequency, len(self._rows))
+            self._changed_rows = {}
+        elif not self._compacting and len(self._changed_rows) > max(
+            COMPACT_MIN_CHANGES, COMPACT_FRACTION * len(self._rows)
+        ):
+            self._compacting = True
+            threading.Thread(target=self._compact, args=(self._epoch,), daemon=True).start()
+        return self._postings
+    
+    def _compact(self, epoch: int) -> None:
+        """Rebuild the postings from a snapshot of the vectors (background thread)."""
+        try:
+            with self._lock:
+                if epoch != self._epoch:
+                    return
+                sequence = self._sequence
+                vectors = list(self._vectors)
+                document_frequency = self._document_frequency.copy()
+                documents = len(self._rows)
+            
+            # Vectors are replaced, never modified, so the snapshot stays valid
+            postings = _Postings.build(vectors, document_frequency, documents)
+            
+            with self._lock:
+                if epoch == self._epoch:
+                    self._postings = postings
+                    self._changed_rows = {
+                        row: changed
+                        for row, changed in self._changed_rows.items()
+                        if changed > sequence
+                    }
+        finally:
+            with self._lock:
+                self._compacting = False
+    
+    def related(
+        self,
+        note_id: str,
+        k: int = 5,
+        previous_only: bool = False
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Find the notes most similar to a note (blocking).
+        
+        Args:
+            note_id: The note's unique identifier
+            k: Maximum number of notes to return
+            previous_only: Only notes created before this one
+        
+        Returns:
+            Up to k (note ID, cosine similarity) pairs, most similar first and
+            all above zero, or None if the note isn't indexed
+        """
+        import numpy as np
+        
+        self.refresh()
+        
+        with self._lock:
+            row = self._rows.get(note_id)
+            if row is None:
+                return None
+            postings = self._ensure_postings()
+            query_columns, query_weights = self._vectors[row]
+            idf = _idf(self._document_frequency, len(self._rows))
+            changed = [(changed_row, self._vectors[changed_row]) for changed_row in self._changed_rows]
+            row_notes = list(self._row_notes)
+        
+        # Postings and vectors are replaced, never modified, so scoring needs no lock
+        with stage_timer("similarity_score"):
+            query = query_weights * idf[query_columns]
+            norm = np.sqrt(np.dot(query, query))
+            if not norm:
+                return []
+            query /= norm
+            
+            # Gather the postings of the query's terms known to the postings
+            known = query_columns < len(postings.indptr) - 1
+            starts = postings.indptr[query_columns[known]]
+            lengths = postings.indptr[query_columns[known] + 1] - starts
+            positions = (
+                np.arange(lengths.sum())
+                - np.repeat(np.cumsum(lengths) - lengths, lengths)
+                + np.repeat(starts, lengths)
+            )
+            term_weights = np.repeat(query[known] * idf[query_columns[known]], lengths)
+            
+            scores = np.zeros(len(row_notes))
+            hits = np.bincount(
+                postings.rows[positions],
+                weights=postings.weights[positions] * term_weights,
+                minlength=len(postings.norms),
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores[:len(hits)] = np.where(postings.norms > 0, hits / postings.norms, 0)
+            
+            # Rows changed since the build are scored from their current vectors
+            if changed:
+                scores[[changed_row for changed_row, _ in changed]] = 0
+                live = [(changed_row, vector) for changed_row, vector in changed if vector is not None]
+                if live:
+                    dense = np.zeros(len(idf))
+                    dense[query_columns] = query
+                    lengths = np.fromiter((len(columns) for _, (columns, _) in live), dtype=np.int64, count=len(live))
+                    owners = np.repeat(np.arange(len(live)), lengths)
+                    columns = np.concatenate([columns for _, (columns, _) in live])
+                    values = np.concatenate([weights for _, (_, weights) in live]) * idf[columns]
+                    norms = np.sqrt(np.bincount(owners, weights=values * values, minlength=len(live)))
+                    dots = np.bincount(owners, weights=values * dense[columns], minlength=len(live))
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        scores[[changed_row for changed_row, _ in live]] = np.where(norms > 0, dots / norms, 0)
+            
+            scores[row] = 0
+            candidates = np.flatnonzero(scores > 1e-9)
+            if previous_only:
+                # IDs start with the creation timestamp, so they sort chronologically
+                candidates = candidates[[row_notes[i] < note_id for i in candidates.tolist()]]
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        
+        return [(row_notes[i], round(float(scores[i]), 4)) for i in candidates]
+    
+    def _load(self, path: Path) -> bool:
+        import numpy as np
+        
+        with np.load(path, allow_pickle=False) as data:
+            note_ids = data["note_ids"].tolist()
+            offsets = data["offsets"]
+            columns = data["columns"].astype(np.int64)
+            weights = data["weights"].astype(np.float64)
+            terms = data["terms"].tolist()
+        
+        self._clear()
+        self._vocabulary = {term: column for column, term in enumerate(terms)}
+        self._document_frequency = np.bincount(columns, minlength=len(terms)).astype(np.int64)
+        for row, note_id in enumerate(note_ids):
+            start, end = offsets[row], offsets[row + 1]
+            self._vectors.append((columns[start:end], weights[start:end]))
+            self._row_notes.append(note_id)
+            self._rows[note_id] = row
+        self._stored_terms = len(columns)
+        return True
+    
+    def _save_payload(self) -> Dict[str, "np.ndarray"]:
+        import numpy as np
+        
+        live = [(self._row_notes[row], vector) for row, vector in enumerate(self._vectors) if vector is not None]
+        lengths = [len(columns) for _, (columns, _) in live]
+        terms = sorted(self._vocabulary, key=self._vocabulary.__getitem__)
+        return {
+            "note_ids": np.array([note_id for note_id, _ in live], dtype=str),
+            "offsets": np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            "columns": np.concatenate([columns for _, (columns, _) in live] or [np.zeros(0, dtype=np.int64)]).astype(np.int32),
+            "weights": np.concatenate([weights for _, (_, weights) in live] or [np.zeros(0)]).astype(np.float32),
+            "terms": np.array(terms, dtype=str),
+        }
+    
+    def _write(self, path: Path, payload: Dict[str, "np.ndarray"]) -> None:
+        import numpy as np
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **payload)
+        os.replace(tmp_path, path)
+    
+    def _collect(self) -> Dict[str, Dict[str, float]]:
+        from .notes_manager import get_notes_manager
+        
+        notes_manager = get_notes_manager()
+        vectors: Dict[str, Dict[str, float]] = {}
+        for note_id in notes_manager.get_note_ids():
+            note = notes_manager.get_note(note_id)
+            if note is not None:
+                vectors[note_id] = note_terms(note.title, note.attendees, note.content)
+        return vectors
+    
+    def _install(self, state: Dict[str, Dict[str, float]]) -> None:
+        self._clear()
+        for note_id, terms in state.items():
+            self._set_vector(note_id, terms)
+        # Postings are built from scratch on first use
+        self._changed_rows = {}
+    
+    def warm_up(self) -> int:
+        """
+        Load the saved vectors, or index every note if there are none.
+        
+        Returns:
+            Number of indexed notes
+        """
+        self.refresh()
+        with self._lock:
+            build = self._postings is None and bool(self._rows) and not self._compacting
+            if build:
+                self._compacting = True
+            epoch, count = self._epoch, len(self._rows)
+        if build:
+            # Built outside the lock, so writes during startup don't wait for it
+            self._compact(epoch)
+        return count
+    
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by the vectors (loads nothing)."""
+        with self._lock:
+            return self._stored_terms * TERM_BYTES
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Get the SimilarityIndex of the current vault."""
+    return current_vault().service("similarity_index", SimilarityIndex)
@@ -0,0 +1,236 @@
+import functools
+import json
+import random
+import threading
+import time
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from ..config import get_config
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """A timed operation within a trace."""
+    
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "start_time",
+        "duration_ms", "attributes", "error", "thread", "_start",
+    )
+    
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.thread = threading.current_thread().name
+        self._start = time.perf_counter()
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+    
+    def finish(self) -> None:
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span for export."""
+        data = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "thread": self.thread,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class Trace:
+    """Spans collected for one sampled request, across threads."""
+    
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = _new_id(128)
+        self.root = Span(self.trace_id, None, name, attributes)
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+    
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+    
+    def spans(self) -> List[Span]:
+        """All finished spans, root first."""
+        with self._lock:
+            return [self.root] + list(self._spans)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("goodnotes_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("goodnotes_span", default=None)
+
+
+class _SpanScope:
+    """Context manager behind `span`; a no-op outside a sampled trace."""
+    
+    __slots__ = ("name", "attributes", "_span", "_token")
+    
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self._span: Optional[Span] = None
+        self._token: Optional[Token] = None
+    
+    def __enter__(self) -> Optional[Span]:
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+        parent = _current_span.get() or trace.root
+        self._span = Span(trace.trace_id, parent.span_id, self.name, self.attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._span is None:
+            return False
+        self._span.finish()
+        if exc is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(self._span)
+        return False
+
+
+def span(name: str, **attributes: Any) -> _SpanScope:
+    """
+    Record a block of work as a child of the current span.
+    
+    Outside a sampled trace this costs one context variable lookup, so
+    instrumentation can stay in place when tracing is off.
+    
+    Example:
+        with span("fs.write_file", path=str(path)):
+            ...
+    
+    Args:
+        name: Span name
+        **attributes: Span attributes
+    """
+    return _SpanScope(name, **attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator recording each call of a function as a span.
+    
+    Args:
+        name: Span name (defaults to the function's qualified name)
+    """
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        
+        return wrapper  # type: ignore[return-value]
+    
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost active span, if the current request is traced."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    return _current_span.get() or trace.root
+
+
+class JsonLinesExporter:
+    """Appends finished spans, one JSON object per line, to a local file."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, spans: List[Span]) -> None:
+        """Write spans to the file (blocking)."""
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+class Tracer:
+    """Starts sampled traces and hands finished ones to the exporter."""
+    
+    def __init__(self, sample_rate: float, exporter: JsonLinesExporter):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+    
+    def start_trace(self, name: str, **attributes: Any) -> Optional[Token]:
+        """
+        Start a trace for the current context if it is sampled.
+        
+        Args:
+            name: Root span name
+            **attributes: Root span attributes
+        
+        Returns:
+            Token for `end_trace`, or None if this request isn't sampled
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        return _current_trace.set(Trace(name, attributes))
+    
+    def end_trace(self, token: Token) -> Trace:
+        """
+        Finish the current trace and detach it from the context.
+        
+        Returns:
+            The finished trace, ready to export
+        """
+        trace = _current_trace.get()
+        trace.root.finish()
+        _current_trace.reset(token)
+        return trace
+    
+    def export(self, trace: Trace) -> None:
+        """Export a finished trace (blocking)."""
+        spans = trace.spans()
+        trace.root.set_attribute("span_count", len(spans))
+        self.exporter.export(spans)
+
+
+# Singleton instance
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the singleton Tracer instance."""
+    global _tracer
+    if _tracer is None:
+        config = get_config()
+        _tracer = Tracer(config.trace_sample_rate, JsonLinesExporter(config.trace_file))
+    return _tracer
@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+from ..models.note import Note, NoteCreate
+from ..models.action_item import ActionItem
+from .notes_manager import NotesManager, get_notes_manager
+from .action_items_manager import ActionItemsManager, get_action_items_manager
+from .tracing import traced
+
+
+class NoteUnitOfWork:
+    """
+    Stages changes to notes and their action items and persists them together.
+    
+    IDs are allocated when a change is staged, so each note is written once,
+    already carrying its action item IDs, and the action items file is
+    rewritten once per commit. Nothing touches disk until `commit`; if any
+    part of the commit fails, the parts already saved are undone.
+    
+    Example:
+        uow = NoteUnitOfWork()
+        note = uow.create_note(note_data)
+        uow.commit()
+    """
+    
+    def __init__(
+        self,
+        notes_manager: Optional[NotesManager] = None,
+        action_items_manager: Optional[ActionItemsManager] = None
+    ):
+        self.notes_manager = notes_manager or get_notes_manager()
+        self.action_items_manager = action_items_manager or get_action_items_manager()
+        self._new_notes: List[Note] = []
+    
+    def create_note(self, note_data: NoteCreate) -> Note:
+        """
+        Stage a new note together with the action items in `note_data`.
+        
+        Args:
+            note_data: Note creation data
+        
+        Returns:
+            The note, with its ID and action items allocated but not yet saved
+        """
+        note = self.notes_manager.new_note(note_data)
+        if note_data.action_items:
+            action_items = self.action_items_manager.new_action_items(
+                note_data.action_items,
+                note_id=note.id
+            )
+            note = note.model_copy(update={"action_items": action_items})
+        
+        self._new_notes.append(note)
+        return note
+    
+    @traced("NoteUnitOfWork.commit")
+    def commit(self) -> None:
+        """
+        Persist all staged changes.
+        
+        Action items are saved first (one write) and then each note (its
+        markdown file plus the index), bypassing the write-behind buffer so
+        a failed write surfaces here rather than in a later flush. If a note
+        fails to save, the notes already saved (and any partial write of the
+        failed one) and the action items are removed again before the error
+        is re-raised.
+        """
+        new_notes, self._new_notes = self._new_notes, []
+        action_items: List[ActionItem] = [
+            item for note in new_notes for item in note.action_items
+        ]
+        
+        if action_items:
+            self.action_items_manager.apply_changes(upserts=action_items)
+        
+        attempted: List[Note] = []
+        try:
+            for note in new_notes:
+                # Before the write: a failure may leave the file or index entry behind
+                attempted.append(note)
+                self.notes_manager.add_note(note, write_through=True)
+        except Exception:
+            self._undo(attempted, action_items)
+            raise
+    
+    def _undo(self, notes: List[Note], action_items: List[ActionItem]) -> None:
+        """Best-effort removal of partially committed notes and action items."""
+        # Each step on its own, so one failure doesn't leave the rest behind;
+        # the original error is kept and an index rebuild repairs what's left
+        for note in notes:
+            try:
+                self.notes_manager.delete_note(note.id)
+            except Exception:
+                pass
+        if action_items:
+            try:
+                self.action_items_manager.apply_changes(deletes=[item.id for item in action_items])
+            except Exception:
+                pass
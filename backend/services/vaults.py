@@ -0,0 +1,392 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from ..config import Config, get_config
+
+
+T = TypeVar("T")
+
+DEFAULT_VAULT = "default"
+
+# Vault names double as directory names under vaults_directory
+VAULT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+# Seconds between memory-budget checks triggered by requests (the loaded
+# vault count is checked on every request; estimates cost O(notes))
+UNLOAD_CHECK_INTERVAL = 10.0
+
+
+class VaultNotFoundError(Exception):
+    """Raised when a request selects a vault that doesn't exist."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Vault '{name}' not found")
+
+
+class VaultClosingError(Exception):
+    """Raised by a non-waiting acquire while the vault is being unloaded."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Vault '{name}' is being unloaded")
+
+
+def vault_config(base: Config, notes_directory: Path, data_directory: Path) -> Config:
+    """
+    Copy the app configuration with a vault's storage locations.
+    
+    Args:
+        base: Application configuration
+        notes_directory: Directory holding the vault's markdown files
+        data_directory: Directory for the vault's index, action items and archive
+    """
+    return base.model_copy(update={
+        "notes_base_directory": notes_directory,
+        "notes_index_file": data_directory / "notes_index.yaml",
+        "action_items_file": data_directory / "action_items.yaml",
+        "archive_directory": data_directory / "archive",
+        "coordination_directory": data_directory / ".coordination",
+    })
+
+
+class Vault:
+    """
+    One vault's configuration and its services.
+    
+    Services (notes and action items managers, archive, change feed, response
+    cache, coordinator) are created on first use, inside the vault's context,
+    so the services they depend on come from the same vault.
+    """
+    
+    def __init__(self, name: str, config: Config):
+        self.name = name
+        self.config = config
+        self.last_used = time.monotonic()
+        # Requests currently using the vault; it isn't unloaded while > 0
+        self.active = 0
+        # Set while unloading: it stays registered until its saves are written,
+        # so nobody loads a second copy from disk in the meantime
+        self.closing = False
+        self._closed = threading.Event()
+        self._services: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+    
+    def service(self, name: str, factory: Callable[[Config], T]) -> T:
+        """
+        Get one of the vault's services, creating it on first use.
+        
+        Args:
+            name: Service name
+            factory: Builds the service from the vault's configuration
+        """
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    with use_vault(self):
+                        service = factory(self.config)
+                    self._services[name] = service
+        return service
+    
+    def estimated_memory(self) -> int:
+        """Approximate bytes held by the vault's loaded services."""
+        with self._lock:
+            services = list(self._services.values())
+        return sum(
+            service.memory_estimate()
+            for service in services
+            if hasattr(service, "memory_estimate")
+        )
+    
+    def close(self) -> None:
+        """Write out buffered note saves and derived state before the vault is dropped."""
+        notes_manager = self._services.get("notes_manager")
+        if notes_manager is not None:
+            notes_manager.shutdown()
+        for name in ("aggregates", "similarity_index"):
+            service = self._services.get(name)
+            if service is not None:
+                service.flush()
+    
+    def wait_closed(self) -> None:
+        """Wait until an unload started by the registry has finished."""
+        self._closed.wait()
+    
+    def mark_closed(self) -> None:
+        """Wake requests waiting in `wait_closed` (called by the registry)."""
+        self._closed.set()
+
+
+_current_vault: ContextVar[Optional[Vault]] = ContextVar("goodnotes_vault", default=None)
+
+
+@contextmanager
+def use_vault(vault: Vault) -> Iterator[Vault]:
+    """Make a vault current for the enclosed code (and threads it hands work to)."""
+    token = _current_vault.set(vault)
+    try:
+        yield vault
+    finally:
+        _current_vault.reset(token)
+
+
+def current_vault() -> Vault:
+    """Get the vault selected for the current request, or the default vault."""
+    vault = _current_vault.get()
+    if vault is None:
+        vault = get_vault_registry().default
+    return vault
+
+
+class VaultRegistry:
+    """
+    Loaded vaults, least recently used first.
+    
+    The default vault is the notes directory chosen in settings (the
+    configured one unless changed). Named vaults live under
+    `vaults_directory/<name>/`: markdown files in `notes/`, with the index,
+    action items and archive beside it.
+    
+    At most `max_loaded_vaults` named vaults stay loaded, and fewer if their
+    estimated memory exceeds `vault_memory_budget_mb`; vaults idle for
+    `vault_idle_seconds` are unloaded too. Unloading writes out buffered
+    saves and drops the in-memory state, and the next request reloads the
+    vault from its persisted index (waiting for the unload to finish first).
+    Vaults serving a request are never unloaded.
+    """
+    
+    def __init__(self, config: Config):
+        self.config = config
+        self.directory = config.vaults_directory
+        self._default: Optional[Vault] = None
+        self._vaults: "OrderedDict[str, Vault]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unloaded = 0
+        self._last_unload_check = time.monotonic()
+    
+    @property
+    def default(self) -> Vault:
+        """The default vault, built from the notes directory in settings."""
+        vault = self._default
+        if vault is None:
+            config = self._default_config()
+            with self._lock:
+                if self._default is None:
+                    self._default = Vault(DEFAULT_VAULT, config)
+                vault = self._default
+        return vault
+    
+    def _default_config(self) -> Config:
+        """Configuration of the default vault."""
+        from .settings_manager import get_settings_manager
+        
+        notes_directory = get_settings_manager().get_settings().notes_directory
+        if not notes_directory:
+            return self.config
+        
+        path = Path(notes_directory).expanduser()
+        if path == self.config.notes_base_directory:
+            return self.config
+        # Another directory keeps its index and action items inside it
+        return vault_config(self.config, path, path / ".goodnotes")
+    
+    def reset_default(self) -> None:
+        """Drop the default vault so the next request rebuilds it from settings."""
+        with self._lock:
+            vault, self._default = self._default, None
+        if vault is not None:
+            vault.close()
+    
+    def _vault_directory(self, name: str) -> Path:
+        if not VAULT_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid vault name '{name}'")
+        return self.directory / name
+    
+    def create(self, name: str) -> None:
+        """
+        Create an empty named vault.
+        
+        Raises:
+            ValueError: If the name is invalid or already taken
+        """
+        directory = self._vault_directory(name)
+        if name == DEFAULT_VAULT or directory.exists():
+            raise ValueError(f"Vault '{name}' already exists")
+        (directory / "notes").mkdir(parents=True)
+    
+    def acquire(self, name: Optional[str], wait: bool = True) -> Vault:
+        """
+        Get a vault for a request, loading it if needed; pair with `release`.
+        
+        Args:
+            name: Vault name (None or "default" for the default vault)
+            wait: Wait for an unload of the vault in progress to finish
+                (blocking) instead of raising VaultClosingError
+        
+        Raises:
+            ValueError: If the name is invalid
+            VaultNotFoundError: If the vault doesn't exist
+            VaultClosingError: If not waiting and the vault is being unloaded
+        """
+        if name is None or name == DEFAULT_VAULT:
+            vault = self.default
+            with self._lock:
+                vault.active += 1
+            return vault
+        
+        directory = self._vault_directory(name)
+        while True:
+            # Look up and mark in use together, so it can't be unloaded in between
+            with self._lock:
+                vault = self._vaults.get(name)
+                if vault is None and directory.is_dir():
+                    config = vault_config(self.config, directory / "notes", directory)
+                    vault = self._vaults[name] = Vault(name, config)
+                if vault is not None and not vault.closing:
+                    self._vaults.move_to_end(name)
+                    vault.active += 1
+                    vault.last_used = time.monotonic()
+            
+            if vault is None:
+                raise VaultNotFoundError(name)
+            if not vault.closing:
+                return vault
+            if not wait:
+                raise VaultClosingError(name)
+            # Reload only once its buffered saves are on disk
+            vault.wait_closed()
+    
+    def release(self, vault: Vault) -> None:
+        """Mark a request's use of a vault as finished."""
+        with self._lock:
+            vault.active -= 1
+            vault.last_used = time.monotonic()
+    
+    def needs_unload_check(self) -> bool:
+        """
+        Whether a request should run `unload_excess`: more vaults are loaded
+        than allowed, or the memory budget hasn't been checked for a while.
+        """
+        with self._lock:
+            loaded = sum(1 for vault in self._vaults.values() if not vault.closing)
+            last_check = self._last_unload_check
+        return (
+            loaded > self.config.max_loaded_vaults
+            or time.monotonic() - last_check >= UNLOAD_CHECK_INTERVAL
+        )
+    
+    def unload_excess(self) -> int:
+        """
+        Unload idle vaults and least recently used ones over the limits (blocking).
+        
+        Returns:
+            Number of vaults unloaded
+        """
+        idle_before = time.monotonic() - self.config.vault_idle_seconds
+        budget = self.config.vault_memory_budget_mb * 1024 * 1024
+        
+        with self._lock:
+            self._last_unload_check = time.monotonic()
+            vaults = [vault for vault in self._vaults.values() if not vault.closing]
+        sizes = {vault.name: vault.estimated_memory() for vault in vaults}
+        loaded, total = len(vaults), sum(sizes.values())
+        
+        evicted: List[Vault] = []
+        with self._lock:
+            for vault in list(self._vaults.values()):
+                over_limit = loaded > self.config.max_loaded_vaults or total > budget
+                if vault.active or vault.closing or not (over_limit or vault.last_used < idle_before):
+                    continue
+                # Stays registered (and acquire waits) until its saves are written
+                vault.closing = True
+                evicted.append(vault)
+                loaded -= 1
+                total -= sizes.get(vault.name, 0)
+            self._unloaded += len(evicted)
+        
+        for vault in evicted:
+            try:
+                vault.close()
+            finally:
+                with self._lock:
+                    if self._vaults.get(vault.name) is vault:
+                        del self._vaults[vault.name]
+                vault.mark_closed()
+        return len(evicted)
+    
+    def close_all(self) -> None:
+        """Write out buffered saves of every loaded vault (on shutdown)."""
+        with self._lock:
+            vaults = list(self._vaults.values())
+            if self._default is not None:
+                vaults.append(self._default)
+        for vault in vaults:
+            vault.close()
+    
+    def list_vaults(self) -> List[Dict[str, Any]]:
+        """
+        List the default vault and every named vault.
+        
+        Returns:
+            Name, notes directory, whether it is loaded and its estimated memory
+        """
+        with self._lock:
+            loaded = dict(self._vaults)
+        
+        names = sorted(
+            path.name for path in self.directory.glob("*")
+            if path.is_dir() and VAULT_NAME_PATTERN.match(path.name)
+        ) if self.directory.exists() else []
+        
+        default = self.default
+        vaults = [{
+            "name": DEFAULT_VAULT,
+            "notes_directory": str(default.config.notes_base_directory),
+            "loaded": True,
+            "estimated_memory": default.estimated_memory(),
+        }]
+        for name in names:
+            vault = loaded.get(name)
+            vaults.append({
+                "name": name,
+                "notes_directory": str(self.directory / name / "notes"),
+                "loaded": vault is not None,
+                "estimated_memory": vault.estimated_memory() if vault else 0,
+            })
+        return vaults
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get loaded named vault count, their estimated memory and unload count.
+        """
+        with self._lock:
+            vaults = [vault for vault in self._vaults.values() if not vault.closing]
+            unloaded = self._unloaded
+        return {
+            "loaded": len(vaults),
+            "estimated_memory": sum(vault.estimated_memory() for vault in vaults),
+            "unloaded": unloaded,
+        }
+
+
+# Singleton instance
+_vault_registry: Optional[VaultRegistry] = None
+_vault_registry_lock = threading.Lock()
+
+
+def get_vault_registry() -> VaultRegistry:
+    """Get the singleton VaultRegistry instance."""
+    global _vault_registry
+    if _vault_registry is None:
+        with _vault_registry_lock:
+            if _vault_registry is None:
+                _vault_registry = VaultRegistry(get_config())
+    return _vault_registry
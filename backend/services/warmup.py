@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .executor import run_blocking
+
+
+class WarmupTracker:
+    """
+    Runs startup warm-up steps in the background and records their state.
+    
+    Each step is a blocking callable run on the worker pool. Steps run
+    concurrently unless they list other steps they depend on. A step that
+    fails is recorded but does not stop the others; the managers still load
+    lazily, so the app keeps working, it is just slower on first use.
+    """
+    
+    def __init__(self):
+        self._steps: Dict[str, Callable[[], Any]] = {}
+        self._depends_on: Dict[str, List[str]] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+    
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        depends_on: Sequence[str] = ()
+    ) -> None:
+        """
+        Register a warm-up step.
+        
+        Args:
+            name: Component name reported by the readiness endpoint
+            func: Blocking callable; an int result is reported as `items`
+            depends_on: Names of steps that must finish before this one starts
+        """
+        self._steps[name] = func
+        self._depends_on[name] = list(depends_on)
+        self._state[name] = {"status": "pending"}
+    
+    async def run(self) -> None:
+        """Run all registered steps, respecting dependencies."""
+        self._started_at = time.perf_counter()
+        done = {name: asyncio.Event() for name in self._steps}
+        
+        async def run_step(name: str) -> None:
+            try:
+                for dependency in self._depends_on[name]:
+                    await done[dependency].wait()
+                await self._run_step(name)
+            finally:
+                done[name].set()
+        
+        try:
+            await asyncio.gather(*(run_step(name) for name in self._steps))
+        finally:
+            self._finished_at = time.perf_counter()
+    
+    async def _run_step(self, name: str) -> None:
+        """Run a single step and record its outcome and duration."""
+        state = self._state[name]
+        state["status"] = "warming"
+        start = time.perf_counter()
+        try:
+            result = await run_blocking(self._steps[name])
+        except Exception as e:
+            state["status"] = "failed"
+            state["error"] = str(e)
+        else:
+            state["status"] = "ready"
+            if isinstance(result, int) and not isinstance(result, bool):
+                state["items"] = result
+        finally:
+            state["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    
+    @property
+    def ready(self) -> bool:
+        """Whether every step has finished (successfully or not)."""
+        return all(
+            state["status"] in ("ready", "failed")
+            for state in self._state.values()
+        )
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the current warm-up state.
+        
+        Returns:
+            Overall readiness, total duration and per-component state/timings
+        """
+        total_ms = None
+        if self._started_at is not None:
+            end = self._finished_at if self._finished_at is not None else time.perf_counter()
+            total_ms = round((end - self._started_at) * 1000, 2)
+        
+        return {
+            "ready": self.ready,
+            "duration_ms": total_ms,
+            "components": {name: dict(state) for name, state in self._state.items()},
+        }
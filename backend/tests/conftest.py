@@ -0,0 +1,40 @@
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+from ..config import get_config
+from ..services.vaults import Vault, use_vault, vault_config
+
+
+@pytest.fixture
+def make_vault(tmp_path) -> Iterator[Callable[..., Vault]]:
+    """
+    Build vaults in temporary directories and make the last one current.
+    
+    Keyword arguments override configuration settings, e.g.
+    `make_vault(note_write_buffer_window=0)`.
+    """
+    vaults: List[Vault] = []
+    contexts: List[Any] = []
+    
+    def build(**overrides: Any) -> Vault:
+        directory = tmp_path / f"vault{len(vaults)}"
+        config = vault_config(get_config(), directory / "notes", directory)
+        vault = Vault(f"test{len(vaults)}", config.model_copy(update=overrides))
+        context = use_vault(vault)
+        context.__enter__()
+        vaults.append(vault)
+        contexts.append(context)
+        return vault
+    
+    yield build
+    
+    for vault, context in reversed(list(zip(vaults, contexts))):
+        vault.close()
+        context.__exit__(None, None, None)
+
+
+@pytest.fixture
+def vault(make_vault) -> Vault:
+    """A current vault in a temporary directory, with default settings."""
+    return make_vault()
@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime
+
+import pytest
+import yaml
+
+from ..models.action_item import ActionItem
+from ..services.action_items_manager import HOT_SHARD, ActionItemsManager, get_action_items_manager
+
+
+def _item(created_at: datetime, completed: bool, note_id=None) -> ActionItem:
+    return ActionItem(
+        id=str(uuid.uuid4()),
+        title=f"Task from {created_at:%Y-%m}",
+        note_id=note_id,
+        created_at=created_at,
+        completed=completed,
+        completed_at=created_at if completed else None,
+    )
+
+
+def test_items_are_sharded_by_state_and_month(vault):
+    manager = get_action_items_manager()
+    old = _item(datetime(2024, 1, 5), completed=True)
+    recent = _item(datetime(2024, 6, 1), completed=True)
+    open_item = _item(datetime(2024, 1, 9), completed=False)
+    manager.apply_changes(upserts=[old, recent, open_item])
+    
+    names = sorted(path.name for path in manager.get_storage_files())
+    assert names == ["202401.yaml", "202406.yaml", f"{HOT_SHARD}.yaml", "manifest.yaml"]
+    
+    # Completing moves the item out of the hot shard into its creation month
+    manager.complete_action_item(open_item.id)
+    fresh = ActionItemsManager(vault.config)
+    assert fresh.stats()["incomplete"] == 0
+    assert fresh.stats()["completed"] == 3
+
+
+def test_old_shards_load_only_when_needed(vault):
+    manager = get_action_items_manager()
+    old = _item(datetime(2023, 3, 1), completed=True)
+    manager.apply_changes(upserts=[old, _item(datetime(2024, 6, 1), completed=False)])
+    
+    fresh = ActionItemsManager(vault.config)
+    stats = fresh.stats()
+    assert stats == {"total": 2, "completed": 1, "incomplete": 1, "shards": 2, "shards_loaded": 1}
+    
+    assert fresh.get_incomplete_action_items()[0].title == "Task from 2024-06"
+    assert fresh.stats()["shards_loaded"] == 1
+    assert fresh.get_action_item(old.id).title == "Task from 2023-03"
+    assert fresh.stats()["shards_loaded"] == 2
+
+
+def test_note_lookup_skips_shards_older_than_the_note(vault):
+    manager = get_action_items_manager()
+    note_id = "20240601-100000-review"
+    manager.apply_changes(upserts=[
+        _item(datetime(2023, 1, 1), completed=True),
+        _item(datetime(2024, 6, 1), completed=True, note_id=note_id),
+    ])
+    
+    fresh = ActionItemsManager(vault.config)
+    assert [item.note_id for item in fresh.get_action_items_by_note(note_id)] == [note_id]
+    assert fresh.stats()["shards_loaded"] == 2
+
+
+def test_failed_save_restores_items(vault, monkeypatch):
+    manager = get_action_items_manager()
+    kept = _item(datetime(2024, 1, 1), completed=False)
+    manager.apply_changes(upserts=[kept])
+    
+    def fail():
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(manager, "_save_to_disk", fail)
+    with pytest.raises(OSError):
+        manager.apply_changes(upserts=[_item(datetime(2024, 2, 1), completed=True)], deletes=[kept.id])
+    
+    assert [item.id for item in manager.get_all_action_items()] == [kept.id]
+
+
+def test_legacy_file_is_migrated_once(vault):
+    legacy = vault.config.action_items_file
+    items = [_item(datetime(2024, 1, 5), completed=True), _item(datetime(2024, 2, 5), completed=False)]
+    legacy.parent.mkdir(parents=True, exist_ok=True)
+    legacy.write_text(yaml.safe_dump({
+        "items": [item.model_dump(mode="json") for item in items],
+    }))
+    
+    manager = get_action_items_manager()
+    assert {item.id for item in manager.get_all_action_items()} == {item.id for item in items}
+    assert not legacy.exists()
+    assert legacy.with_suffix(".yaml.migrated").exists()
+    
+    fresh = ActionItemsManager(vault.config)
+    assert fresh.stats()["total"] == 2
@@ -0,0 +1,66 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+
+from ..api import changes
+from ..services.change_feed import get_change_feed
+
+
+async def _first_body(app: FastAPI, query: bytes, headers: list) -> bytes:
+    """Send a GET through the ASGI app and return the first non-empty body chunk."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/changes/stream",
+        "raw_path": b"/changes/stream",
+        "root_path": "",
+        "query_string": query,
+        "headers": headers,
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    body = asyncio.get_running_loop().create_future()
+    disconnected = asyncio.Event()
+    requested = False
+    
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body") and not body.done():
+            body.set_result(message["body"])
+    
+    task = asyncio.create_task(app(scope, receive, send))
+    try:
+        return await asyncio.wait_for(body, timeout=5)
+    finally:
+        disconnected.set()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_event_stream_is_not_held_back_by_gzip(vault):
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1)
+    app.include_router(changes.router)
+    
+    feed = get_change_feed()
+    since = feed.seq
+    feed.record("note", "missing", "deleted")
+    
+    chunk = asyncio.run(_first_body(
+        app,
+        f"since={since}".encode(),
+        [(b"accept-encoding", b"gzip"), (b"accept", b"text/event-stream")],
+    ))
+    assert chunk.startswith(b"id: ")
+    assert b"event: change" in chunk
@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ..models.action_item import ActionItemCreate, ActionItemUpdate
+from ..models.note import NoteCreate, NoteUpdate
+from ..services.action_items_manager import get_action_items_manager
+from ..services.concurrency import KeyedLocks, ReadWriteLock, VersionConflictError
+from ..services.notes_manager import get_notes_manager
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=5)
+    
+    def reader():
+        with lock.read():
+            # All three must be inside at once to pass the barrier
+            inside.wait()
+    
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not inside.broken
+
+
+def test_writer_excludes_readers_and_is_preferred():
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+    
+    def writer():
+        with lock.write():
+            events.append("write")
+    
+    def late_reader():
+        with lock.read():
+            events.append("read")
+    
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    time.sleep(0.05)
+    # Queued behind the waiting writer, not let in alongside the held read
+    reader_thread = threading.Thread(target=late_reader)
+    reader_thread.start()
+    time.sleep(0.05)
+    assert events == []
+    
+    lock.release_read()
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert events == ["write", "read"]
+
+
+def test_lock_is_reentrant_but_not_upgradable():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write(), lock.read():
+            pass
+    with lock.read():
+        with lock.read():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+
+
+def test_keyed_locks_serialize_one_key_and_clean_up():
+    locks = KeyedLocks()
+    active, peak = [0], [0]
+    
+    def work():
+        with locks.lock("note"):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            active[0] -= 1
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: work(), range(8)))
+    assert peak[0] == 1
+    assert locks._locks == {}
+
+
+def test_concurrent_note_updates_from_one_version_conflict(vault):
+    notes_manager = get_notes_manager()
+    note = notes_manager.create_note(NoteCreate(title="Shared", content="v1"))
+    
+    def update(n):
+        try:
+            notes_manager.update_note(note.id, NoteUpdate(content=f"edit {n}", version=note.version))
+            return "saved"
+        except VersionConflictError:
+            return "conflict"
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(update, range(4)))
+    
+    assert sorted(results) == ["conflict"] * 3 + ["saved"]
+    assert notes_manager.get_note(note.id).version == note.version + 1
+
+
+def test_concurrent_action_item_updates_from_one_version_conflict(vault):
+    action_items_manager = get_action_items_manager()
+    item = action_items_manager.create_action_item(ActionItemCreate(title="Shared"))
+    
+    def update(n):
+        try:
+            action_items_manager.update_action_item(item.id, ActionItemUpdate(title=f"edit {n}", version=item.version))
+            return "saved"
+        except VersionConflictError:
+            return "conflict"
+    
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(update, range(4)))
+    
+    assert sorted(results) == ["conflict"] * 3 + ["saved"]
+
+
+def test_concurrent_creates_are_all_indexed(vault):
+    notes_manager = get_notes_manager()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        notes = list(pool.map(lambda n: notes_manager.create_note(NoteCreate(title=f"Note {n}")), range(40)))
+    notes_manager.flush_pending_writes()
+    
+    assert sorted(notes_manager.get_note_ids()) == sorted(note.id for note in notes)
@@ -0,0 +1,58 @@
+import asyncio
+
+from ..api import notes as notes_api
+from ..api.notes import _note_validators
+from ..models.action_item import ActionItemCreate, ActionItemUpdate
+from ..models.note import NoteCreate
+from ..services.action_items_manager import get_action_items_manager
+from ..services.unit_of_work import NoteUnitOfWork
+
+
+def _create(title: str):
+    uow = NoteUnitOfWork()
+    note = uow.create_note(NoteCreate(title=title, action_items=[ActionItemCreate(title=f"{title} task")]))
+    uow.commit()
+    return note
+
+
+def test_note_etag_ignores_other_notes_action_items(vault):
+    first, second = _create("First"), _create("Second")
+    action_items_manager = get_action_items_manager()
+    etag, _ = _note_validators(first.id)
+    
+    action_items_manager.complete_action_item(second.action_items[0].id)
+    action_items_manager.create_action_item(ActionItemCreate(title="Loose end"))
+    assert _note_validators(first.id)[0] == etag
+    
+    action_items_manager.update_action_item(first.action_items[0].id, ActionItemUpdate(title="Renamed"))
+    changed, _ = _note_validators(first.id)
+    assert changed != etag
+    
+    action_items_manager.delete_action_item(first.action_items[0].id)
+    assert _note_validators(first.id)[0] not in (etag, changed)
+
+
+def test_note_etag_changes_when_items_are_reloaded(vault):
+    note = _create("Reloaded")
+    action_items_manager = get_action_items_manager()
+    etag, _ = _note_validators(note.id)
+    
+    # A reload (as after another worker's change) can't tell what changed
+    action_items_manager._loaded = False
+    assert _note_validators(note.id)[0] != etag
+
+
+def test_note_created_between_validation_and_render(vault, monkeypatch):
+    note = _create("Late")
+    calls = []
+    
+    def late_validators(note_id):
+        # The first check runs before the note exists
+        calls.append(note_id)
+        return None if len(calls) == 1 else _note_validators(note_id)
+    
+    monkeypatch.setattr(notes_api, "_note_validators", late_validators)
+    response = asyncio.run(notes_api.get_note(note.id, None))
+    
+    assert response.status_code == 200
+    assert response.headers["ETag"] == _note_validators(note.id)[0]
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+from ..models.action_item import ActionItemCreate
+from ..models.note import NoteCreate
+from ..services.action_items_manager import get_action_items_manager
+from ..services.aggregates import Aggregates, get_aggregates
+from ..services.derived_state import DerivedState
+from ..services.notes_manager import get_notes_manager
+
+
+def test_subclass_missing_a_hook_fails_on_construction(vault):
+    class Incomplete(DerivedState):
+        storage_name = "incomplete.yaml"
+        
+        def _load(self, path):
+            return False
+    
+    with pytest.raises(TypeError):
+        Incomplete(vault.config)
+
+
+def test_incremental_aggregates_match_a_rebuild(vault):
+    notes_manager = get_notes_manager()
+    action_items_manager = get_action_items_manager()
+    first = notes_manager.create_note(NoteCreate(title="Kickoff", attendees=["Ana", "Bo"]))
+    second = notes_manager.create_note(NoteCreate(title="Review", attendees=["Ana"]))
+    item = action_items_manager.create_action_item(ActionItemCreate(title="Ship", note_id=first.id))
+    action_items_manager.create_action_item(ActionItemCreate(title="Test", note_id=second.id))
+    action_items_manager.complete_action_item(item.id)
+    notes_manager.delete_note(second.id)
+    
+    incremental = get_aggregates().snapshot()
+    rebuilt = Aggregates(vault.config)
+    rebuilt.rebuild()
+    
+    assert rebuilt.snapshot() == incremental
+    assert incremental["notes"] == 1
+    assert incremental["top_attendees"] == [{"name": "Ana", "notes": 1}, {"name": "Bo", "notes": 1}]
+    assert incremental["action_items"]["completed"] == 1
+    assert incremental["notes_per_day"][-1] == {"date": datetime.now().date().isoformat(), "count": 1}
@@ -0,0 +1,86 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from ..services import importer
+from ..services.action_items_manager import get_action_items_manager
+from ..services.importer import collect_sources, import_notes
+from ..services.notes_manager import get_notes_manager
+
+
+def _files(count: int):
+    return {
+        f"export/note-{n:03d}.md": (
+            f"---\ntitle: Meeting {n}\ncreated: 2024-03-{n % 28 + 1:02d}T10:00:00\n---\n"
+            f"Discussed item {n}.\n- [ ] Follow up {n}\n- [x] Done {n}\n"
+        )
+        for n in range(count)
+    }
+
+
+def _write_zip(path, files):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+
+
+def _write_tar(path, files):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize("writer,suffix", [(_write_zip, ".zip"), (_write_tar, ".tar.gz")])
+def test_archive_members_are_read_by_the_parser(tmp_path, writer, suffix):
+    archive = tmp_path / f"export{suffix}"
+    writer(archive, _files(3))
+    
+    sources = collect_sources(archive)
+    # Only locations are collected; nothing is read into memory up front
+    assert [source.name for source in sources] == sorted(_files(3))
+    assert all(source.archive == str(archive) for source in sources)
+    
+    parsed = [importer.parse_source(source) for source in sources]
+    importer._close_archives()
+    assert [note.title for note in parsed] == ["Meeting 0", "Meeting 1", "Meeting 2"]
+    assert parsed[1].tasks == [("Follow up 1", False), ("Done 1", True)]
+
+
+@pytest.mark.parametrize("writer,suffix", [(_write_zip, ".zip"), (_write_tar, ".tar.gz")])
+def test_import_from_archive_with_worker_processes(vault, tmp_path, writer, suffix):
+    count = importer.PROCESS_POOL_THRESHOLD + 6
+    archive = tmp_path / f"export{suffix}"
+    writer(archive, _files(count))
+    
+    report = import_notes(archive, workers=2)
+    
+    assert report["errors"] == []
+    assert report["imported"] == count
+    notes_manager = get_notes_manager()
+    assert len(notes_manager.get_note_ids()) == count
+    assert len(get_action_items_manager().get_all_action_items()) == 2 * count
+    titles = {notes_manager.get_note(note["id"]).title for note in report["notes"]}
+    assert titles == {f"Meeting {n}" for n in range(count)}
+
+
+def test_import_uses_the_vaults_worker_setting(make_vault, tmp_path, monkeypatch):
+    make_vault(import_workers=3)
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "a.md").write_text("# Alpha\nbody")
+    seen = []
+    parse_all = importer._parse_all
+    
+    def recording_parse_all(sources, workers, progress):
+        seen.append(workers)
+        return parse_all(sources, workers, progress)
+    
+    monkeypatch.setattr(importer, "_parse_all", recording_parse_all)
+    report = import_notes(tmp_path / "notes", dry_run=True)
+    
+    assert seen == [3]
+    assert report["notes"][0]["file"] == "a.md"
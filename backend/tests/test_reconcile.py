@@ -0,0 +1,60 @@
+from ..models.action_item import ActionItemCreate, NoteActionItem
+from ..models.note import NoteCreate
+from ..services.action_items_manager import get_action_items_manager
+from ..services.change_feed import ChangeFeed, get_change_feed
+from ..services.unit_of_work import NoteUnitOfWork
+
+
+def _note_with_items(*titles: str):
+    uow = NoteUnitOfWork()
+    note = uow.create_note(NoteCreate(title="Sync", action_items=[ActionItemCreate(title=t) for t in titles]))
+    uow.commit()
+    return note
+
+
+def test_reconcile_keeps_matched_items_and_diffs_the_rest(vault):
+    note = _note_with_items("Keep", "Rename me", "Drop")
+    keep, rename, drop = note.action_items
+    manager = get_action_items_manager()
+    manager.complete_action_item(keep.id)
+    since = get_change_feed().seq
+    
+    result = manager.reconcile_note_action_items(note.id, [
+        NoteActionItem(title="Keep"),
+        NoteActionItem(id=rename.id, title="Renamed"),
+        NoteActionItem(title="New"),
+    ])
+    
+    assert [item.title for item in result] == ["Keep", "Renamed", "New"]
+    # Matched by title and by ID: same items, completion kept
+    assert result[0].id == keep.id and result[0].completed
+    assert result[1].id == rename.id and result[1].version == rename.version + 1
+    assert manager.get_action_item(drop.id) is None
+    
+    changes = {(event["id"], event["op"]) for event in get_change_feed().changes_since(since)}
+    assert changes == {(rename.id, "updated"), (result[2].id, "created"), (drop.id, "deleted")}
+
+
+def test_reconcile_without_changes_writes_nothing(vault, monkeypatch):
+    note = _note_with_items("One", "Two")
+    manager = get_action_items_manager()
+    saves = []
+    monkeypatch.setattr(manager, "_save_to_disk", lambda: saves.append(1))
+    
+    result = manager.reconcile_note_action_items(note.id, [NoteActionItem(title="One"), NoteActionItem(title="Two")])
+    
+    assert [item.id for item in result] == [item.id for item in note.action_items]
+    assert saves == []
+
+
+def test_change_feed_reports_gaps():
+    feed = ChangeFeed(max_entries=3)
+    start = feed.seq
+    for n in range(5):
+        feed.record("note", f"n{n}", "created")
+    
+    assert [event["id"] for event in feed.changes_since(start + 2)] == ["n2", "n3", "n4"]
+    assert feed.changes_since(feed.seq) == []
+    # Too old (dropped from the log) or from the future: refetch everything
+    assert feed.changes_since(start) is None
+    assert feed.changes_since(feed.seq + 1) is None
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+# Importing backend.main (cumulative, best of RUNS) must stay under this.
+# The default leaves room for slow shared machines (a typical run is ~600 ms);
+# set GOODNOTES_IMPORT_BUDGET_MS to tighten it where timings are stable.
+# Known heavy packages are caught regardless by the lazy-import check below.
+IMPORT_BUDGET_MS = float(os.environ.get("GOODNOTES_IMPORT_BUDGET_MS", "1500"))
+RUNS = 3
+
+# Imported at first use, never by importing the app
+LAZY_MODULES = ("markdown", "markdownify", "bs4", "frontmatter", "slugify", "yaml", "numpy")
+
+
+def _import_time_ms() -> float:
+    """Cumulative `-X importtime` of backend.main in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.main"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.rstrip().endswith("| backend.main"):
+            return int(line[len("import time:"):].split("|")[1]) / 1000
+    raise AssertionError("backend.main missing from the import time report")
+
+
+def test_import_time_within_budget():
+    best = min(_import_time_ms() for _ in range(RUNS))
+    assert best <= IMPORT_BUDGET_MS, (
+        f"Importing backend.main took {best:.1f} ms, over the {IMPORT_BUDGET_MS:.0f} ms budget "
+        "(see python backend/run.py --profile-startup)"
+    )
+
+
+def test_heavy_modules_imported_lazily():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, backend.main; "
+            f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+        ],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = result.stdout.split()
+    assert not loaded, f"Imported when the app is imported: {', '.join(loaded)}"
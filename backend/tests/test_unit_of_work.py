@@ -0,0 +1,68 @@
+import pytest
+
+from ..models.action_item import ActionItemCreate
+from ..models.note import NoteCreate
+from ..services.action_items_manager import get_action_items_manager
+from ..services.notes_manager import get_notes_manager
+from ..services.unit_of_work import NoteUnitOfWork
+
+
+def _note_data(title: str) -> NoteCreate:
+    return NoteCreate(
+        title=title,
+        content="Agenda",
+        action_items=[ActionItemCreate(title="Send recap"), ActionItemCreate(title="Book room")],
+    )
+
+
+def test_commit_writes_note_and_action_items(vault):
+    uow = NoteUnitOfWork()
+    note = uow.create_note(_note_data("Planning"))
+    uow.commit()
+    
+    notes_manager = get_notes_manager()
+    # Written through the buffer, so the file is on disk before commit returns
+    assert notes_manager.stats()["pending_writes"] == 0
+    assert notes_manager.get_note_paths()[0][1].exists()
+    assert notes_manager.get_action_item_ids(note.id) == [item.id for item in note.action_items]
+    assert len(get_action_items_manager().get_action_items_by_note(note.id)) == 2
+
+
+def test_failed_note_write_rolls_back(vault, monkeypatch):
+    notes_manager = get_notes_manager()
+    
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(notes_manager, "_write_note_file", fail)
+    
+    uow = NoteUnitOfWork()
+    note = uow.create_note(_note_data("Planning"))
+    with pytest.raises(OSError):
+        uow.commit()
+    
+    assert notes_manager.get_note(note.id) is None
+    assert notes_manager.get_note_ids() == []
+    assert get_action_items_manager().get_action_items_by_note(note.id) == []
+
+
+def test_failure_undoes_notes_already_saved(vault, monkeypatch):
+    notes_manager = get_notes_manager()
+    write_note_file = notes_manager._write_note_file
+    
+    def fail_second(note, *args, **kwargs):
+        if note.title == "Second":
+            raise OSError("disk full")
+        write_note_file(note, *args, **kwargs)
+    
+    monkeypatch.setattr(notes_manager, "_write_note_file", fail_second)
+    
+    uow = NoteUnitOfWork()
+    first = uow.create_note(_note_data("First"))
+    uow.create_note(_note_data("Second"))
+    with pytest.raises(OSError):
+        uow.commit()
+    
+    assert notes_manager.get_note(first.id) is None
+    assert not any(notes_manager.base_directory.rglob("*.md"))
+    assert get_action_items_manager().get_all_action_items() == []
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from ..config import get_config
+from ..models.note import NoteCreate
+from ..services.notes_manager import get_notes_manager
+from ..services.vaults import VaultClosingError, VaultRegistry, use_vault
+
+
+@pytest.fixture
+def registry(tmp_path):
+    config = get_config().model_copy(update={
+        "vaults_directory": tmp_path / "vaults",
+        "note_write_buffer_window": 60,
+        "vault_idle_seconds": 0,
+    })
+    registry = VaultRegistry(config)
+    registry.create("work")
+    yield registry
+    registry.close_all()
+
+
+def test_reload_waits_for_unload_to_write_buffered_notes(registry, monkeypatch):
+    vault = registry.acquire("work")
+    with use_vault(vault):
+        notes_manager = get_notes_manager()
+        note = notes_manager.create_note(NoteCreate(title="Buffered", content="not on disk yet"))
+    registry.release(vault)
+    assert notes_manager.stats()["pending_writes"] == 1
+    
+    # Slow down the unload's flush so the reload arrives in the middle of it
+    flushing = threading.Event()
+    write_note_file = notes_manager._write_note_file
+    
+    def slow_write(*args, **kwargs):
+        flushing.set()
+        time.sleep(0.3)
+        write_note_file(*args, **kwargs)
+    
+    monkeypatch.setattr(notes_manager, "_write_note_file", slow_write)
+    
+    unloader = threading.Thread(target=registry.unload_excess)
+    unloader.start()
+    assert flushing.wait(5)
+    
+    with pytest.raises(VaultClosingError):
+        registry.acquire("work", wait=False)
+    
+    reloaded = registry.acquire("work")
+    try:
+        assert reloaded is not vault
+        with use_vault(reloaded):
+            assert "not on disk yet" in get_notes_manager().get_note(note.id).content
+    finally:
+        registry.release(reloaded)
+        unloader.join()
+    assert registry.stats()["unloaded"] == 1
+
+
+def test_vaults_in_use_are_not_unloaded(registry):
+    vault = registry.acquire("work")
+    try:
+        assert registry.unload_excess() == 0
+        assert registry.acquire("work", wait=False) is vault
+        registry.release(vault)
+    finally:
+        registry.release(vault)
+    assert registry.unload_excess() == 1
+
+
+def test_unload_check_is_rate_limited(registry):
+    registry.unload_excess()
+    assert not registry.needs_unload_check()
+    
+    registry.config = registry.config.model_copy(update={"max_loaded_vaults": 0})
+    registry.release(registry.acquire("work"))
+    assert registry.needs_unload_check()
@@ -0,0 +1,104 @@
+import time
+
+from ..models.note import NoteCreate, NoteUpdate
+from ..services import notes_manager as notes_module
+from ..services.notes_manager import get_notes_manager
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_rapid_saves_coalesce_into_one_write(make_vault, monkeypatch):
+    make_vault(note_write_buffer_window=0.2)
+    notes_manager = get_notes_manager()
+    writes = []
+    write_note_file = notes_manager._write_note_file
+    
+    def counting_write(note, *args, **kwargs):
+        writes.append(note.content)
+        write_note_file(note, *args, **kwargs)
+    
+    monkeypatch.setattr(notes_manager, "_write_note_file", counting_write)
+    
+    note = notes_manager.create_note(NoteCreate(title="Standup", content="v1"))
+    for version in range(2, 6):
+        note = notes_manager.update_note(note.id, NoteUpdate(content=f"v{version}"))
+    
+    # Reads see the buffered state before it reaches disk
+    assert notes_manager.get_note(note.id).content == "v5"
+    assert _wait_for(lambda: notes_manager.stats()["pending_writes"] == 0)
+    assert writes == ["v5"]
+    assert "v5" in notes_manager.get_note_paths()[0][1].read_text()
+
+
+def test_failed_flush_keeps_other_notes_and_retries(make_vault, monkeypatch):
+    make_vault(note_write_buffer_window=0.05)
+    monkeypatch.setattr(notes_module, "FLUSH_RETRY_DELAY", 0.05)
+    notes_manager = get_notes_manager()
+    write_note_file = notes_manager._write_note_file
+    failures = {"Broken": 2}
+    
+    def flaky_write(note, *args, **kwargs):
+        if failures.get(note.title):
+            failures[note.title] -= 1
+            raise OSError("disk full")
+        write_note_file(note, *args, **kwargs)
+    
+    monkeypatch.setattr(notes_manager, "_write_note_file", flaky_write)
+    
+    broken = notes_manager.create_note(NoteCreate(title="Broken", content="a"))
+    healthy = notes_manager.create_note(NoteCreate(title="Healthy", content="b"))
+    
+    # The healthy note and the index are written despite the failure...
+    assert _wait_for(lambda: notes_manager.stats()["failed_flushes"] >= 1)
+    assert _wait_for(lambda: notes_manager._get_note_path(healthy.id).exists())
+    assert notes_manager.index_file.exists()
+    # ...and the failed one stays readable and is retried until it succeeds
+    assert notes_manager.get_note(broken.id).content == "a"
+    assert _wait_for(lambda: notes_manager.stats()["pending_writes"] == 0)
+    assert notes_manager.stats()["failed_flushes"] == 2
+    assert notes_manager._get_note_path(broken.id).exists()
+
+
+def test_flush_pending_writes_writes_everything(make_vault):
+    make_vault(note_write_buffer_window=60)
+    notes_manager = get_notes_manager()
+    notes_manager.create_note(NoteCreate(title="One"))
+    notes_manager.create_note(NoteCreate(title="Two"))
+    assert notes_manager.stats()["pending_writes"] == 2
+    
+    assert notes_manager.flush_pending_writes() == 2
+    assert all(path.exists() for _, path in notes_manager.get_note_paths())
+
+
+def test_index_saved_mid_window_keeps_the_file_on_disk(make_vault):
+    vault = make_vault(note_write_buffer_window=60)
+    notes_manager = get_notes_manager()
+    renamed = notes_manager.create_note(NoteCreate(title="Draft"))
+    # With other entries still on disk, a reload won't fall back to a rebuild
+    notes_manager.create_note(NoteCreate(title="Settled"))
+    notes_manager.flush_pending_writes()
+    old_path = notes_manager._get_note_path(renamed.id)
+    
+    # Rename in the buffer, then save the index (as another note's write would)
+    notes_manager.update_note(renamed.id, NoteUpdate(title="Final"))
+    created = notes_manager.create_note(NoteCreate(title="Unsaved"))
+    notes_manager._save_index()
+    
+    # A crash now loses the buffered writes but must not lose the note
+    reloaded = notes_module.NotesManager(vault.config)
+    assert reloaded._get_note_path(renamed.id) == old_path
+    assert reloaded.get_note(renamed.id).title == "Draft"
+    assert reloaded.get_note(created.id) is None
+    
+    # Once flushed, the saved index follows the new path
+    notes_manager.flush_pending_writes()
+    reloaded = notes_module.NotesManager(vault.config)
+    assert reloaded.get_note(renamed.id).title == "Final"
+    assert not old_path.exists()
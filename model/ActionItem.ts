@@ -6,4 +6,5 @@ export interface ActionItem {
 	completedAt?: Date | null;
 	noteId?: string;
 	completed?: boolean;
+	version?: number;
 }
\ No newline at end of file
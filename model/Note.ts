@@ -8,5 +8,6 @@ export interface Note {
 	content: string;
 	createdAt: Date;
 	updatedAt?: Date;
+	version?: number;
 	actionItems: ActionItem[];
 }
\ No newline at end of file